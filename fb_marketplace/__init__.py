@@ -0,0 +1,6 @@
+"""Scraper de facebook marketplace y limpieza de la data extraída.
+
+Los módulos con dependencias pesadas (seleniumwire, selenium, pandas, openpyxl) no se importan
+aquí: cada subcomando de la interfaz de línea de comandos (fb_marketplace.cli) importa solo
+el módulo que necesita.
+"""
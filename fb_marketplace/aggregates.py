@@ -0,0 +1,402 @@
+from datetime import datetime
+from json import dump, load
+from logging import INFO, log
+from math import log as logaritmo
+from os import makedirs, path, replace
+
+from numpy import (
+    arange,
+    bincount,
+    ceil,
+    cumsum,
+    floor,
+    int32,
+    int64,
+    log as log_arreglo,
+    searchsorted,
+    where,
+)
+from pandas import (
+    concat,
+    DataFrame,
+    read_feather,
+    Series,
+    Timestamp,
+    to_datetime,
+    to_numeric,
+)
+from pandas.api.types import is_datetime64_any_dtype
+
+from .preprocessing import CACHE_FOLDER, read_dataset, SCHEMA_FACEBOOK
+
+# Error relativo máximo de los percentiles del precio
+PRECISION = 0.01
+# Cubeta de los precios iguales a cero, que no tienen logaritmo
+CUBETA_CERO = -(2**31)
+# Columna de las publicaciones por la que se agrupa cada dimensión
+DIMENSIONES = {"vendedor": "id_vendedor", "locacion": "locacion_id"}
+# Columnas de los conteos que se suman al combinar archivos
+CAMPOS = ["cantidad", "vendidos", "disponibles", "con_precio", "suma_precio"]
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+# Tipo de dato de cada columna de los conteos y de las cubetas
+TIPOS_GRUPO = {
+    "archivo": "int64",
+    "dimension": "object",
+    "clave": "object",
+    "dia": "datetime64[ns]",
+    "tipo_moneda": "object",
+}
+TIPOS_CONTEOS = dict(
+    TIPOS_GRUPO, **dict.fromkeys(CAMPOS[:-1], "int64"), suma_precio="float64"
+)
+TIPOS_CUBETAS = dict(TIPOS_GRUPO, cubeta="int32", conteo="int64")
+
+
+class AgregadosMercado:
+    """Representa a un almacén de agregados por vendedor y por locación de cada día
+
+    Por cada archivo del scraper se guardan los conteos de cada vendedor y locación por día y
+    tipo de moneda, y un boceto de sus precios: un histograma con cubetas logarítmicas cuyo ancho
+    relativo es la precisión, de modo que cualquier percentil se estima con un error relativo
+    menor a la precisión. Los conteos y los bocetos se combinan sumándolos, así que una consulta
+    solo suma las filas de los agregados sin volver a leer los archivos del scraper, y un archivo
+    modificado se reemplaza quitando sus filas.
+
+    Attributes:
+        folder (str): Carpeta donde se guardan los agregados
+        precision (float): Error relativo máximo de los percentiles del precio
+        archivos (dict): Número y fecha de modificación de cada archivo agregado
+        conteos (pandas.core.frame.DataFrame): Cantidad de publicaciones, vendidas, disponibles, con precio y suma del precio de cada grupo
+        cubetas (pandas.core.frame.DataFrame): Cantidad de precios de cada cubeta del boceto de cada grupo
+    """
+
+    def __init__(self, folder, precision=PRECISION):
+        """Genera todos los atributos para una instancia de la clase AgregadosMercado
+
+        Args:
+            folder (str): Carpeta donde se guardan los agregados
+            precision (float, optional): Error relativo máximo de los percentiles de un almacén nuevo. Defaults to PRECISION.
+        """
+        self._folder = folder
+        self._manifiesto = path.join(folder, "manifiesto.json")
+        self._precision = precision
+        self._archivos = {}
+        # Las tablas vacías necesitan sus tipos para que las consultas sumen sus columnas
+        self._conteos = DataFrame(
+            {columna: Series(dtype=tipo) for columna, tipo in TIPOS_CONTEOS.items()}
+        )
+        self._cubetas = DataFrame(
+            {columna: Series(dtype=tipo) for columna, tipo in TIPOS_CUBETAS.items()}
+        )
+        if path.isfile(self._manifiesto):
+            with open(self._manifiesto, encoding="utf-8") as file:
+                estado = load(file)
+            self._precision = estado["precision"]
+            self._archivos = estado["archivos"]
+            self._conteos = read_feather(path.join(folder, "conteos.feather"))
+            self._cubetas = read_feather(path.join(folder, "cubetas.feather"))
+        # Razón entre los límites de cada cubeta
+        self._gamma = (1 + self._precision) / (1 - self._precision)
+
+    @property
+    def folder(self):
+        """Retorna el valor actual del atributo folder"""
+        return self._folder
+
+    @property
+    def precision(self):
+        """Retorna el valor actual del atributo precision"""
+        return self._precision
+
+    @property
+    def archivos(self):
+        """Retorna el valor actual del atributo archivos"""
+        return self._archivos
+
+    @property
+    def conteos(self):
+        """Retorna el valor actual del atributo conteos"""
+        return self._conteos
+
+    @property
+    def cubetas(self):
+        """Retorna el valor actual del atributo cubetas"""
+        return self._cubetas
+
+    def cubeta(self, precio):
+        """Retorna la cubeta del boceto de cada precio
+
+        Args:
+            precio (numpy.ndarray): Precios mayores o iguales a cero
+
+        Returns:
+            numpy.ndarray: Número de la cubeta de cada precio
+        """
+        positivo = precio > 0
+        indice = ceil(log_arreglo(where(positivo, precio, 1)) / logaritmo(self._gamma))
+        return where(positivo, indice, CUBETA_CERO).astype(int32)
+
+    def valor(self, cubeta):
+        """Retorna el precio representativo de cada cubeta, a menos de la precisión de todos sus precios
+
+        Args:
+            cubeta (numpy.ndarray): Número de cada cubeta
+
+        Returns:
+            numpy.ndarray: Precio representativo de cada cubeta
+        """
+        cero = cubeta == CUBETA_CERO
+        exponente = where(cero, 0, cubeta).astype(int64)
+        return where(cero, 0.0, 2 * self._gamma**exponente / (self._gamma + 1)).round(2)
+
+    def resumir(self, df_data, archivo=0):
+        """Calcula los conteos y los bocetos de los precios de las publicaciones de un DataFrame (pandas.core.frame.DataFrame)
+
+        Args:
+            df_data (pandas.core.frame.DataFrame): Publicaciones extraídas por el scraper
+            archivo (int, optional): Número del archivo del que provienen las publicaciones. Defaults to 0.
+
+        Returns:
+            tuple: Conteos y cubetas de cada grupo del archivo
+        """
+        # El día de cada publicación es el de la carpeta donde el scraper la guardó
+        dia = df_data["Fecha Extraccion"]
+        if not is_datetime64_any_dtype(dia):
+            dia = to_datetime(dia, format="%d/%m/%Y", errors="coerce")
+        precio = to_numeric(df_data["precio"], errors="coerce")
+        base = DataFrame(
+            {
+                "dia": dia,
+                "tipo_moneda": df_data["tipo_moneda"].astype("string").fillna(""),
+                "vendido": df_data["vendido"].fillna(False).astype(int64),
+                "disponible": df_data["disponible"].fillna(False).astype(int64),
+                "con_precio": precio.notna().astype(int64),
+                "precio": precio.fillna(0.0),
+            }
+        )
+        grupo = ["dimension", "clave", "dia", "tipo_moneda"]
+        conteos, cubetas = [], []
+        for dimension, columna in DIMENSIONES.items():
+            validas = df_data[columna].notna() & dia.notna()
+            filas = base[validas.to_numpy()].assign(
+                dimension=dimension, clave=df_data.loc[validas, columna].astype(str)
+            )
+            conteos.append(
+                filas.groupby(grupo, sort=False)
+                .agg(
+                    cantidad=("vendido", "size"),
+                    vendidos=("vendido", "sum"),
+                    disponibles=("disponible", "sum"),
+                    con_precio=("con_precio", "sum"),
+                    suma_precio=("precio", "sum"),
+                )
+                .reset_index()
+            )
+            con_precio = filas[filas["con_precio"] == 1]
+            cubetas.append(
+                con_precio.assign(
+                    cubeta=self.cubeta(con_precio["precio"].clip(lower=0).to_numpy())
+                )
+                .groupby(grupo + ["cubeta"], sort=False)
+                .size()
+                .rename("conteo")
+                .reset_index()
+            )
+        conteos = concat(conteos, ignore_index=True)
+        cubetas = concat(cubetas, ignore_index=True)
+        conteos.insert(0, "archivo", archivo)
+        cubetas.insert(0, "archivo", archivo)
+        return conteos, cubetas
+
+    def agregar_archivo(self, filename, df_data=None, cache_folder=CACHE_FOLDER):
+        """Agrega las publicaciones de un archivo del scraper. Si el archivo ya estaba agregado se reemplaza
+
+        Args:
+            filename (str): Ruta del archivo del scraper
+            df_data (pandas.core.frame.DataFrame, optional): Publicaciones del archivo. Si es None se lee el archivo. Defaults to None.
+            cache_folder (str, optional): Carpeta de la caché de lectura. Defaults to CACHE_FOLDER.
+
+        Returns:
+            int: Cantidad de publicaciones agregadas
+        """
+        if df_data is None:
+            df_data = read_dataset(
+                filename, schema=SCHEMA_FACEBOOK, cache_folder=cache_folder
+            )
+        registro = self._archivos.get(filename)
+        if registro:
+            archivo = registro[0]
+            self.quitar(archivo)
+        else:
+            archivo = max((num for num, _ in self._archivos.values()), default=-1)
+            archivo += 1
+        conteos, cubetas = self.resumir(df_data, archivo)
+        self._conteos = concat(
+            [frame for frame in (self._conteos, conteos) if len(frame)],
+            ignore_index=True,
+        )
+        self._cubetas = concat(
+            [frame for frame in (self._cubetas, cubetas) if len(frame)],
+            ignore_index=True,
+        )
+        self._archivos[filename] = [archivo, path.getmtime(filename)]
+        log(INFO, f"Archivo {filename} agregado")
+        return len(df_data)
+
+    def quitar(self, archivo):
+        """Quita los conteos y los bocetos de un archivo
+
+        Args:
+            archivo (int): Número del archivo
+        """
+        self._conteos = self._conteos[self._conteos["archivo"] != archivo]
+        self._cubetas = self._cubetas[self._cubetas["archivo"] != archivo]
+
+    def eliminar_archivo(self, filename):
+        """Elimina de los agregados las publicaciones de un archivo del scraper
+
+        Args:
+            filename (str): Ruta del archivo del scraper
+        """
+        self.quitar(self._archivos.pop(filename)[0])
+
+    def actualizar(self, filenames, cache_folder=CACHE_FOLDER):
+        """Agrega los archivos nuevos o modificados del scraper y quita los que ya no existen
+
+        Args:
+            filenames (list): Lista de rutas de todos los archivos del scraper
+            cache_folder (str, optional): Carpeta de la caché de lectura. Defaults to CACHE_FOLDER.
+
+        Returns:
+            int: Cantidad de archivos agregados, modificados o quitados
+        """
+        cantidad = 0
+        vigentes = set(filenames)
+        for filename in [nombre for nombre in self._archivos if nombre not in vigentes]:
+            # El demonio y el relleno reemplazan el archivo del día por uno con otro nombre
+            self.eliminar_archivo(filename)
+            cantidad += 1
+            log(INFO, f"Archivo {filename} quitado de los agregados")
+        for filename in filenames:
+            registro = self._archivos.get(filename)
+            if registro and registro[1] == path.getmtime(filename):
+                continue
+            self.agregar_archivo(filename, cache_folder=cache_folder)
+            cantidad += 1
+        return cantidad
+
+    def filtrar(
+        self, tabla, dimension, claves=None, desde=None, hasta=None, moneda=None
+    ):
+        """Retorna las filas de una tabla de agregados que cumplen los filtros
+
+        Args:
+            tabla (pandas.core.frame.DataFrame): Conteos o cubetas
+            dimension (str): Dimensión de los agregados, vendedor o locacion
+            claves (list, optional): Ids de los vendedores o de las locaciones. Defaults to None.
+            desde (str, optional): Día mínimo en formato %d/%m/%Y. Defaults to None.
+            hasta (str, optional): Día máximo en formato %d/%m/%Y. Defaults to None.
+            moneda (str, optional): Tipo de moneda, por ejemplo PEN. Defaults to None.
+
+        Returns:
+            pandas.core.frame.DataFrame
+        """
+        filtro = tabla["dimension"] == dimension
+        if claves:
+            filtro &= tabla["clave"].isin([str(clave) for clave in claves])
+        if desde:
+            filtro &= tabla["dia"] >= Timestamp(datetime.strptime(desde, "%d/%m/%Y"))
+        if hasta:
+            filtro &= tabla["dia"] <= Timestamp(datetime.strptime(hasta, "%d/%m/%Y"))
+        if moneda:
+            filtro &= tabla["tipo_moneda"] == moneda.upper()
+        return tabla[filtro]
+
+    def consultar(
+        self,
+        dimension="vendedor",
+        claves=None,
+        desde=None,
+        hasta=None,
+        moneda=None,
+        por_dia=False,
+        percentiles=PERCENTILES,
+    ):
+        """Retorna el resumen de las publicaciones de cada vendedor o locación combinando sus agregados
+
+        Args:
+            dimension (str, optional): Dimensión de los agregados, vendedor o locacion. Defaults to "vendedor".
+            claves (list, optional): Ids de los vendedores o de las locaciones. Si es None se incluyen todos. Defaults to None.
+            desde (str, optional): Día mínimo en formato %d/%m/%Y. Defaults to None.
+            hasta (str, optional): Día máximo en formato %d/%m/%Y. Defaults to None.
+            moneda (str, optional): Tipo de moneda, por ejemplo PEN. Defaults to None.
+            por_dia (bool, optional): Indica si se resume cada día por separado. Defaults to False.
+            percentiles (tuple, optional): Percentiles del precio entre 0 y 1. Defaults to PERCENTILES.
+
+        Returns:
+            pandas.core.frame.DataFrame: Cantidad de publicaciones, proporción de vendidas y disponibles, precio promedio, mínimo, máximo y percentiles de cada grupo
+        """
+        grupo = ["clave"] + (["dia"] if por_dia else []) + ["tipo_moneda"]
+        filtros = (dimension, claves, desde, hasta, moneda)
+        resumen = (
+            self.filtrar(self._conteos, *filtros)
+            .groupby(grupo)[CAMPOS]
+            .sum(numeric_only=True)
+            .reset_index()
+        )
+        resumen["proporcion_vendidos"] = (
+            resumen["vendidos"] / resumen["cantidad"]
+        ).round(4)
+        resumen["proporcion_disponibles"] = (
+            resumen["disponibles"] / resumen["cantidad"]
+        ).round(4)
+        resumen["precio_promedio"] = (
+            resumen.pop("suma_precio")
+            / resumen["con_precio"].where(resumen["con_precio"] > 0)
+        ).round(2)
+
+        # Los bocetos de cada grupo se combinan sumando sus cubetas
+        cubetas = (
+            self.filtrar(self._cubetas, *filtros)
+            .groupby(grupo + ["cubeta"])["conteo"]
+            .sum()
+            .reset_index()
+        )
+        columnas = ["precio_min", "precio_max"] + [
+            f"p{round(percentil * 100):02d}" for percentil in percentiles
+        ]
+        if len(cubetas) == 0:
+            # Sin precios los grupos no tienen mínimo, máximo ni percentiles
+            return resumen.assign(**dict.fromkeys(columnas, float("nan")))
+        # Las cubetas quedan ordenadas por grupo y por precio, el percentil q de un grupo es la
+        # primera cubeta cuyo conteo acumulado supera q veces la cantidad de precios del grupo
+        numero = cubetas.groupby(grupo, sort=False).ngroup().to_numpy()
+        conteo = cubetas["conteo"].to_numpy(int64)
+        acumulado = cumsum(conteo)
+        inicio = searchsorted(numero, arange(numero[-1] + 1))
+        total = bincount(numero, weights=conteo).astype(int64)
+        previo = acumulado[inicio] - conteo[inicio]
+        valores = self.valor(cubetas["cubeta"].to_numpy())
+        precios = cubetas.iloc[inicio][grupo].reset_index(drop=True)
+        precios[columnas[0]] = valores[inicio]
+        precios[columnas[1]] = valores[inicio + bincount(numero) - 1]
+        for columna, percentil in zip(columnas[2:], percentiles):
+            posicion = searchsorted(
+                acumulado, previo + floor(percentil * (total - 1)), side="right"
+            )
+            precios[columna] = valores[posicion]
+        return resumen.merge(precios, on=grupo, how="left")
+
+    def guardar(self):
+        """Guarda los agregados en archivos feather y la lista de archivos agregados en un archivo json"""
+        if not path.exists(self._folder):
+            makedirs(self._folder)
+        # Se escribe en archivos temporales para no dejar los agregados a medias
+        for nombre, tabla in (("conteos", self._conteos), ("cubetas", self._cubetas)):
+            filename = path.join(self._folder, nombre + ".feather")
+            tabla.reset_index(drop=True).to_feather(filename + ".tmp")
+            replace(filename + ".tmp", filename)
+        with open(self._manifiesto + ".tmp", "w", encoding="utf-8") as file:
+            dump({"precision": self._precision, "archivos": self._archivos}, file)
+        replace(self._manifiesto + ".tmp", self._manifiesto)
+        log(INFO, f"Agregados guardados de {len(self._archivos)} archivos")
@@ -0,0 +1,352 @@
+from datetime import datetime
+from json import dump, load
+from logging import ERROR, INFO, log
+from os import listdir, makedirs, path
+from threading import Lock
+
+from numpy import array, dtype, fromfile
+from zstandard import (
+    get_frame_parameters,
+    train_dictionary,
+    ZstdCompressionDict,
+    ZstdCompressor,
+    ZstdDecompressor,
+    ZstdError,
+)
+
+from .jsonbackend import obtener_backend
+
+# Cantidad de payloads que se juntan para entrenar el diccionario
+MUESTRAS_DICCIONARIO = 200
+# Tamaño máximo en bytes del diccionario, el valor por defecto de zstd
+TAMANO_DICCIONARIO = 112640
+NIVEL_COMPRESION = 10
+# Cada registro del índice indica el id de la publicación y la posición de su frame en el archivo del día
+REGISTRO_INDICE = dtype([("id", "<i8"), ("inicio", "<i8"), ("longitud", "<i8")])
+FORMATO_DIA = "%d-%m-%Y"
+
+
+class AlmacenPayloads:
+    """Representa a un archivo de los payloads de las publicaciones comprimidos con zstd
+
+    Cada payload se guarda como un frame de zstd independiente en el archivo del día
+    (payloads.zst) y su posición se agrega al índice del día (payloads.idx), de modo que
+    una publicación se puede leer sin descomprimir el resto del archivo. Los frames se
+    comprimen con un diccionario entrenado con los primeros payloads, porque cada payload por
+    separado es muy pequeño para que zstd aproveche las partes que se repiten entre ellos.
+    Los diccionarios se conservan por su id, que viene en cada frame.
+
+    Attributes:
+        folder (str): Carpeta del archivo
+        nivel (int): Nivel de compresión de zstd
+    """
+
+    def __init__(
+        self,
+        folder,
+        nivel=NIVEL_COMPRESION,
+        muestras=MUESTRAS_DICCIONARIO,
+        json_backend=None,
+    ):
+        """Genera todos los atributos para una instancia de la clase AlmacenPayloads
+
+        Args:
+            folder (str): Carpeta del archivo
+            nivel (int, optional): Nivel de compresión de zstd. Defaults to NIVEL_COMPRESION.
+            muestras (int, optional): Cantidad de payloads para entrenar el diccionario. Defaults to MUESTRAS_DICCIONARIO.
+            json_backend (str, optional): Librería para escribir y leer los payloads, json u orjson. Si es None se usa la más rápida instalada. Defaults to None.
+        """
+        self._folder = folder
+        self._json = obtener_backend(json_backend)
+        self._nivel = nivel
+        self._muestras = muestras
+        self._pendientes = []
+        self._lock = Lock()
+        self._diccionarios = {}
+        self._descompresores = {}
+        self._manifiesto = path.join(folder, "manifiesto.json")
+        self._diccionario = None
+        if path.isfile(self._manifiesto):
+            with open(self._manifiesto, encoding="utf-8") as file:
+                id_diccionario = load(file).get("diccionario")
+            if id_diccionario:
+                self._diccionario = self.diccionario(id_diccionario)
+        self._compresor = self.crear_compresor()
+
+    @property
+    def folder(self):
+        """Retorna el valor actual del atributo folder"""
+        return self._folder
+
+    @property
+    def nivel(self):
+        """Retorna el valor actual del atributo nivel"""
+        return self._nivel
+
+    def crear_compresor(self):
+        """Retorna un compresor con el diccionario actual"""
+        if self._diccionario is None:
+            return ZstdCompressor(level=self._nivel)
+        return ZstdCompressor(level=self._nivel, dict_data=self._diccionario)
+
+    def diccionario(self, id_diccionario):
+        """Retorna un diccionario guardado en el archivo
+
+        Args:
+            id_diccionario (int): Id del diccionario
+
+        Returns:
+            zstandard.ZstdCompressionDict: Diccionario
+        """
+        if id_diccionario not in self._diccionarios:
+            filename = path.join(
+                self._folder, "diccionarios", f"{id_diccionario}.zdict"
+            )
+            with open(filename, "rb") as file:
+                self._diccionarios[id_diccionario] = ZstdCompressionDict(file.read())
+        return self._diccionarios[id_diccionario]
+
+    def descompresor(self, id_diccionario):
+        """Retorna un descompresor para los frames comprimidos con un diccionario
+
+        Args:
+            id_diccionario (int): Id del diccionario o 0 si el frame no usa diccionario
+
+        Returns:
+            zstandard.ZstdDecompressor: Descompresor
+        """
+        if id_diccionario not in self._descompresores:
+            if id_diccionario:
+                self._descompresores[id_diccionario] = ZstdDecompressor(
+                    dict_data=self.diccionario(id_diccionario)
+                )
+            else:
+                self._descompresores[id_diccionario] = ZstdDecompressor()
+        return self._descompresores[id_diccionario]
+
+    def entrenar(self, muestras):
+        """Entrena un nuevo diccionario con payloads de muestra y lo usa para los siguientes payloads
+
+        Args:
+            muestras (list): Lista de payloads en bytes
+
+        Returns:
+            int: Id del nuevo diccionario o None si no se pudo entrenar
+        """
+        try:
+            diccionario = train_dictionary(TAMANO_DICCIONARIO, muestras)
+        except ZstdError as error:
+            log(ERROR, f"No se pudo entrenar el diccionario: {error}")
+            return None
+        id_diccionario = diccionario.dict_id()
+        carpeta = path.join(self._folder, "diccionarios")
+        if not path.exists(carpeta):
+            makedirs(carpeta)
+        with open(path.join(carpeta, f"{id_diccionario}.zdict"), "wb") as file:
+            file.write(diccionario.as_bytes())
+        with open(self._manifiesto, "w", encoding="utf-8") as file:
+            dump({"diccionario": id_diccionario}, file)
+        self._diccionarios[id_diccionario] = diccionario
+        self._diccionario = diccionario
+        self._compresor = self.crear_compresor()
+        log(
+            INFO, f"Diccionario {id_diccionario} entrenado con {len(muestras)} payloads"
+        )
+        return id_diccionario
+
+    def rutas(self, dia):
+        """Retorna las rutas del archivo de payloads y del índice de un día
+
+        Args:
+            dia (str): Día en formato dd-mm-aaaa
+
+        Returns:
+            tuple: Ruta del archivo de payloads y ruta del índice
+        """
+        carpeta = path.join(self._folder, dia)
+        return path.join(carpeta, "payloads.zst"), path.join(carpeta, "payloads.idx")
+
+    def agregar(self, id_publicacion, enlace, fecha_extraccion, dato):
+        """Comprime y agrega el payload de una publicación al archivo del día de extracción
+
+        Args:
+            id_publicacion (str): Id de la publicación
+            enlace (str): Enlace de la publicación
+            fecha_extraccion (str): Fecha de extracción en formato dd/mm/aaaa
+            dato (dict): Información de la publicación en el json de graphql
+        """
+        payload = self._json.dumps(
+            {"enlace": enlace, "fecha_extraccion": fecha_extraccion, "dato": dato}
+        )
+        dia = datetime.strptime(fecha_extraccion, "%d/%m/%Y").strftime(FORMATO_DIA)
+        filename, index_filename = self.rutas(dia)
+        with self._lock:
+            if self._diccionario is None:
+                self._pendientes.append(payload)
+                if len(self._pendientes) >= self._muestras:
+                    self.entrenar(self._pendientes)
+                    self._pendientes = []
+            frame = self._compresor.compress(payload)
+            if not path.exists(path.dirname(filename)):
+                makedirs(path.dirname(filename))
+            with open(filename, "ab") as file:
+                inicio = file.tell()
+                file.write(frame)
+            with open(index_filename, "ab") as file:
+                array(
+                    [(int(id_publicacion), inicio, len(frame))], REGISTRO_INDICE
+                ).tofile(file)
+
+    def dias(self, desde=None, hasta=None):
+        """Retorna los días guardados en el archivo, en orden
+
+        Args:
+            desde (str, optional): Día mínimo en formato dd/mm/aaaa. Defaults to None.
+            hasta (str, optional): Día máximo en formato dd/mm/aaaa. Defaults to None.
+
+        Returns:
+            list: Lista de días en formato dd-mm-aaaa
+        """
+        if not path.isdir(self._folder):
+            return []
+        fechas = []
+        for carpeta in listdir(self._folder):
+            try:
+                fechas.append(datetime.strptime(carpeta, FORMATO_DIA))
+            except ValueError:
+                continue
+        if desde:
+            fechas = [f for f in fechas if f >= datetime.strptime(desde, "%d/%m/%Y")]
+        if hasta:
+            fechas = [f for f in fechas if f <= datetime.strptime(hasta, "%d/%m/%Y")]
+        return [fecha.strftime(FORMATO_DIA) for fecha in sorted(fechas)]
+
+    def indice(self, dia):
+        """Retorna el índice de un día
+
+        Args:
+            dia (str): Día en formato dd-mm-aaaa
+
+        Returns:
+            numpy.ndarray: Registros del índice con el id, el inicio y la longitud de cada frame
+        """
+        _, index_filename = self.rutas(dia)
+        if not path.isfile(index_filename):
+            return array([], REGISTRO_INDICE)
+        return fromfile(index_filename, REGISTRO_INDICE)
+
+    def descomprimir(self, frame):
+        """Descomprime un frame con el diccionario con el que fue comprimido
+
+        Args:
+            frame (bytes): Frame de zstd
+
+        Returns:
+            dict: Payload de la publicación
+        """
+        id_diccionario = get_frame_parameters(frame).dict_id
+        return self._json.loads(self.descompresor(id_diccionario).decompress(frame))
+
+    def obtener(self, id_publicacion, dia=None):
+        """Retorna el último payload guardado de una publicación
+
+        Args:
+            id_publicacion (str): Id de la publicación
+            dia (str, optional): Día en formato dd/mm/aaaa. Si es None se busca en todos los días. Defaults to None.
+
+        Returns:
+            dict: Payload de la publicación o None si no se encuentra
+        """
+        dias = self.dias(dia, dia) if dia else self.dias()
+        for dia in reversed(dias):
+            registros = self.indice(dia)
+            posiciones = (registros["id"] == int(id_publicacion)).nonzero()[0]
+            if len(posiciones):
+                registro = registros[posiciones[-1]]
+                filename, _ = self.rutas(dia)
+                with open(filename, "rb") as file:
+                    file.seek(int(registro["inicio"]))
+                    return self.descomprimir(file.read(int(registro["longitud"])))
+        return None
+
+    def leer(self, desde=None, hasta=None):
+        """Lee en orden todos los payloads guardados entre dos días
+
+        Los frames de cada día se descomprimen en bloque, agrupados por diccionario y en
+        varios hilos.
+
+        Args:
+            desde (str, optional): Día mínimo en formato dd/mm/aaaa. Defaults to None.
+            hasta (str, optional): Día máximo en formato dd/mm/aaaa. Defaults to None.
+
+        Yields:
+            dict: Payload de una publicación
+        """
+        for dia in self.dias(desde, hasta):
+            filename, _ = self.rutas(dia)
+            registros = self.indice(dia)
+            if not len(registros):
+                continue
+            with open(filename, "rb") as file:
+                contenido = file.read()
+            frames = [
+                contenido[inicio : inicio + longitud]
+                for inicio, longitud in zip(
+                    registros["inicio"].tolist(), registros["longitud"].tolist()
+                )
+            ]
+            grupos = {}
+            for numero, frame in enumerate(frames):
+                grupos.setdefault(get_frame_parameters(frame).dict_id, []).append(
+                    numero
+                )
+            payloads = [None] * len(frames)
+            for id_diccionario, numeros in grupos.items():
+                resultado = self.descompresor(
+                    id_diccionario
+                ).multi_decompress_to_buffer([frames[n] for n in numeros], threads=-1)
+                for numero, segmento in zip(numeros, resultado):
+                    payloads[numero] = segmento.tobytes()
+            for payload in payloads:
+                yield self._json.loads(payload)
+
+    def reprocesar(self, dataset, desde=None, hasta=None):
+        """Agrega a un Dataset los payloads guardados entre dos días
+
+        Args:
+            dataset (Dataset): Objeto de la clase Dataset donde se agregan las publicaciones
+            desde (str, optional): Día mínimo en formato dd/mm/aaaa. Defaults to None.
+            hasta (str, optional): Día máximo en formato dd/mm/aaaa. Defaults to None.
+
+        Returns:
+            int: Cantidad de publicaciones agregadas
+        """
+        cantidad = 0
+        for payload in self.leer(desde, hasta):
+            dataset.agregar_data(
+                payload["dato"], payload["fecha_extraccion"], payload["enlace"]
+            )
+            cantidad += 1
+        return cantidad
+
+    def muestrear(self, cantidad=MUESTRAS_DICCIONARIO):
+        """Retorna payloads repartidos entre todos los días guardados para entrenar un diccionario
+
+        Args:
+            cantidad (int, optional): Cantidad máxima de payloads. Defaults to MUESTRAS_DICCIONARIO.
+
+        Returns:
+            list: Lista de payloads en bytes
+        """
+        indices = {dia: self.indice(dia) for dia in self.dias()}
+        paso = max(1, sum(len(registros) for registros in indices.values()) // cantidad)
+        muestras = []
+        for dia, registros in indices.items():
+            filename, _ = self.rutas(dia)
+            with open(filename, "rb") as file:
+                for registro in registros[::paso]:
+                    file.seek(int(registro["inicio"]))
+                    frame = file.read(int(registro["longitud"]))
+                    id_diccionario = get_frame_parameters(frame).dict_id
+                    muestras.append(self.descompresor(id_diccionario).decompress(frame))
+        return muestras[:cantidad]
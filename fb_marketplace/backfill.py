@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta
+from json import dump, load
+from logging import INFO, log
+from math import ceil
+from os import makedirs, path, remove, replace
+from time import strftime, time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Valores del parámetro daysSinceListed que acepta el feed de facebook marketplace
+DIAS_PUBLICADO = (1, 7, 30)
+
+
+def dividir_ventanas(desde, hasta, horas=24):
+    """Función que divide un rango de días en ventanas de tiempo que no cruzan la medianoche
+
+    Args:
+        desde (str): Primer día del rango en formato %d/%m/%Y
+        hasta (str): Último día del rango en formato %d/%m/%Y, se incluye en el rango
+        horas (int, optional): Duración en horas de cada ventana, entre 1 y 24. Defaults to 24.
+
+    Returns:
+        list: Lista con el inicio y el fin en segundos de cada ventana hasta el momento actual
+    """
+    horas = min(max(int(horas), 1), 24)
+    dia = datetime.strptime(desde, "%d/%m/%Y")
+    ultimo = datetime.strptime(hasta, "%d/%m/%Y")
+    ahora = datetime.now()
+    ventanas = []
+    while dia <= ultimo:
+        siguiente = dia + timedelta(days=1)
+        inicio = dia
+        # Cada ventana pertenece a un solo día para mantener una carpeta por fecha
+        while inicio < siguiente and inicio < ahora:
+            fin = min(inicio + timedelta(hours=horas), siguiente)
+            ventanas.append((int(inicio.timestamp()), int(fin.timestamp())))
+            inicio = fin
+        dia = siguiente
+    return ventanas
+
+
+def url_ventana(url, inicio):
+    """Función que agrega a la url de una categoría los parámetros del feed para una ventana de tiempo
+
+    El feed se ordena por fecha de creación y, si la ventana es reciente, se limita a las
+    publicaciones de los últimos días para no recorrer todo el feed.
+
+    Args:
+        url (str): Link de la página de una categoría en facebook marketplace
+        inicio (int): Inicio de la ventana en segundos
+
+    Returns:
+        str: Link de la categoría con los parámetros del feed
+    """
+    partes = urlparse(url)
+    parametros = dict(parse_qsl(partes.query))
+    parametros["sortBy"] = "creation_time_descend"
+    dias = ceil((time() - inicio) / 86400)
+    limite = next((valor for valor in DIAS_PUBLICADO if valor >= dias), None)
+    if limite:
+        parametros["daysSinceListed"] = str(limite)
+    else:
+        parametros.pop("daysSinceListed", None)
+    return urlunparse(partes._replace(query=urlencode(parametros)))
+
+
+class Relleno:
+    """Representa a la extracción de las publicaciones de días anteriores dividida en ventanas de tiempo
+
+    Cada ventana de cada categoría se extrae como una categoría independiente del Planificador,
+    con su propio archivo en la carpeta de su día. El avance se guarda en un archivo json después
+    de guardar cada ventana, de modo que al volver a ejecutar el relleno solo se extraen las
+    ventanas que no terminaron.
+
+    Attributes:
+        filename (str): Ruta del archivo json con el avance de las ventanas
+        desde (str): Primer día del rango en formato %d/%m/%Y
+        hasta (str): Último día del rango en formato %d/%m/%Y
+        horas (int): Duración en horas de cada ventana
+        estado (dict): Estado, cantidad de publicaciones y archivos generados de cada ventana
+    """
+
+    def __init__(self, filename, desde, hasta, horas=24):
+        """Genera todos los atributos para una instancia de la clase Relleno
+
+        Args:
+            filename (str): Ruta del archivo json con el avance de las ventanas
+            desde (str): Primer día del rango en formato %d/%m/%Y
+            hasta (str): Último día del rango en formato %d/%m/%Y
+            horas (int, optional): Duración en horas de cada ventana, entre 1 y 24. Defaults to 24.
+        """
+        self._filename = filename
+        self._desde = desde
+        self._hasta = hasta
+        self._horas = min(max(int(horas), 1), 24)
+        self._estado = {}
+        if path.exists(filename):
+            with open(filename, encoding="utf-8") as file:
+                self._estado = load(file)
+            log(INFO, f"Avance del relleno cargado de {filename}")
+
+    @property
+    def filename(self):
+        """Retorna el valor actual del atributo filename"""
+        return self._filename
+
+    @property
+    def desde(self):
+        """Retorna el valor actual del atributo desde"""
+        return self._desde
+
+    @property
+    def hasta(self):
+        """Retorna el valor actual del atributo hasta"""
+        return self._hasta
+
+    @property
+    def horas(self):
+        """Retorna el valor actual del atributo horas"""
+        return self._horas
+
+    @property
+    def estado(self):
+        """Retorna el valor actual del atributo estado"""
+        return self._estado
+
+    @staticmethod
+    def clave(nombre, inicio):
+        """Retorna el identificador de la ventana de una categoría en el archivo de avance
+
+        Args:
+            nombre (str): Nombre de la categoría de la ventana
+            inicio (int): Inicio de la ventana en segundos
+
+        Returns:
+            str: Identificador de la ventana
+        """
+        return f"{nombre}_{datetime.fromtimestamp(inicio).strftime('%d%m%Y')}"
+
+    def ventanas(self, categorias):
+        """Retorna los parámetros de la clase Categoria de las ventanas que faltan extraer
+
+        Args:
+            categorias (list): Lista de diccionarios con los parámetros de cada categoría
+
+        Returns:
+            list: Lista de diccionarios con los parámetros de cada ventana de cada categoría
+        """
+        pendientes = []
+        completas = 0
+        for inicio, fin in dividir_ventanas(self._desde, self._hasta, self._horas):
+            for categoria in categorias:
+                nombre = categoria["nombre"]
+                if self._horas < 24:
+                    # Varias ventanas del mismo día se distinguen por su hora de inicio
+                    nombre += "_" + datetime.fromtimestamp(inicio).strftime("%H%M")
+                if (
+                    self._estado.get(self.clave(nombre, inicio), {}).get("estado")
+                    == "completa"
+                ):
+                    completas += 1
+                    continue
+                pendientes.append(
+                    dict(
+                        categoria,
+                        nombre=nombre,
+                        url=url_ventana(categoria["url"], inicio),
+                        inicio=inicio,
+                        fin=fin,
+                    )
+                )
+        log(
+            INFO,
+            f"Relleno del {self._desde} al {self._hasta}: {len(pendientes)} ventanas pendientes y {completas} completas",
+        )
+        return pendientes
+
+    def archivos(self, categoria):
+        """Retorna los archivos guardados en una ejecución anterior de la ventana de una categoría
+
+        Args:
+            categoria (Categoria): Categoría de la ventana
+
+        Returns:
+            list: Rutas de los archivos guardados
+        """
+        clave = self.clave(categoria.nombre, categoria.inicio)
+        return self._estado.get(clave, {}).get("archivos", [])
+
+    def registrar(self, categoria, archivos):
+        """Guarda el avance de la ventana de una categoría y elimina los archivos que reemplaza
+
+        La ventana queda completa si la categoría terminó al llegar al inicio de la ventana o a
+        alguno de sus límites. Si el navegador falló queda parcial y se vuelve a extraer.
+
+        Args:
+            categoria (Categoria): Categoría de la ventana con su información guardada
+            archivos (list): Rutas de los archivos guardados de la ventana
+        """
+        archivos = [archivo for archivo in archivos if archivo]
+        for anterior in self.archivos(categoria):
+            # Los archivos de una ejecución parcial se reemplazan por los nuevos
+            if anterior not in archivos and path.exists(anterior):
+                remove(anterior)
+        estado = "completa" if categoria.terminada and categoria.fin_feed else "parcial"
+        self._estado[self.clave(categoria.nombre, categoria.inicio)] = {
+            "estado": estado,
+            "inicio": categoria.inicio,
+            "fin": categoria.fin,
+            "cantidad": categoria.tiempo.cantidad,
+            "errores": categoria.num_error,
+            "archivos": archivos,
+            "actualizado": strftime("%d/%m/%Y %H:%M:%S"),
+        }
+        self.guardar()
+        log(INFO, f"Ventana {categoria.nombre} del {categoria.tiempo.fecha} {estado}")
+
+    def guardar(self):
+        """Guarda el avance de las ventanas en el archivo json"""
+        carpeta = path.dirname(self._filename)
+        if carpeta:
+            makedirs(carpeta, exist_ok=True)
+        # Se escribe en un archivo temporal para no dejar el avance a medias si el programa se detiene
+        temporal = self._filename + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as file:
+            dump(self._estado, file, ensure_ascii=False, indent=2)
+        replace(temporal, self._filename)
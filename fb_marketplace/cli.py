@@ -0,0 +1,688 @@
+"""Interfaz de línea de comandos del proyecto.
+
+Los módulos de cada subcomando se importan dentro de la función que lo ejecuta, de modo que
+--help y los subcomandos livianos no cargan seleniumwire, selenium ni pandas.
+"""
+
+from argparse import ArgumentParser
+from logging import basicConfig, INFO, log, StreamHandler
+from os import getenv, path
+
+# Páginas que se pueden limpiar y la opción que les corresponde en preprocessing.main
+SITES = {"despegar": "1", "booking": "2", "pedidos-ya": "3", "facebook": "4"}
+
+
+def scrape(args):
+    """Ejecuta el scraper de facebook marketplace
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from .scraper import main
+
+    if args.backfill:
+        main(None, *args.backfill, args.window_hours)
+    else:
+        main(args.daemon)
+
+
+def preprocess(args):
+    """Limpia la data de una página
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from .preprocessing import main
+
+    main(SITES.get(args.site), args.input, args.folder, args.prefix)
+
+
+def export_metrics(args):
+    """Exporta las mediciones de ejecución del scraper a un archivo csv
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from dotenv import load_dotenv
+
+    from .metrics import exportar_tiempos
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    exportar_tiempos(
+        args.filename or getenv("FILENAME_TIEMPOS") or "Tiempos.xlsx",
+        args.sheet or getenv("SHEET_TIEMPOS") or "Ropa",
+        args.output,
+    )
+
+
+def spatial(args):
+    """Actualiza el índice espacial con los archivos nuevos del scraper y lo consulta
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from dotenv import load_dotenv
+
+    from .preprocessing import get_facebook_filenames
+    from .spatial import cargar_indice
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    indice = cargar_indice(args.index)
+    filenames = get_facebook_filenames(
+        args.folder or getenv("DATA_FOLDER") or "Data//datos_obtenidos",
+        args.prefix or getenv("DATA_FILENAME") or "fb_ropa",
+    )
+    if indice.actualizar(filenames):
+        indice.guardar(args.index)
+
+    if args.radius:
+        filas, distancias = indice.buscar_radio(*args.radius)
+    elif args.bbox:
+        filas, distancias = indice.buscar_rectangulo(*args.bbox), None
+    else:
+        return
+    if args.cells:
+        resultado = indice.agregados_celdas(filas)
+    else:
+        resultado = indice.publicaciones(filas, distancias)
+    resultado.to_csv(args.output, sep=";", index=False, encoding="utf-8-sig")
+    log(INFO, f"{len(resultado)} filas guardadas en {args.output}")
+
+
+def search(args):
+    """Actualiza el índice de búsqueda con los archivos nuevos del scraper y lo consulta
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from dotenv import load_dotenv
+
+    from .preprocessing import get_facebook_filenames
+    from .search import IndiceTexto
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    indice = IndiceTexto(args.index or getenv("SEARCH_INDEX") or "Index//texto")
+    indice.actualizar(
+        get_facebook_filenames(
+            args.folder or getenv("DATA_FOLDER") or "Data//datos_obtenidos",
+            args.prefix or getenv("DATA_FILENAME") or "fb_ropa",
+        )
+    )
+    if not args.query:
+        return
+    resultado = indice.buscar(
+        args.query,
+        args.min_price,
+        args.max_price,
+        args.since,
+        args.until,
+        args.currency,
+    )
+    resultado.to_csv(args.output, sep=";", index=False, encoding="utf-8-sig")
+    log(INFO, f"{len(resultado)} publicaciones guardadas en {args.output}")
+
+
+def duplicates(args):
+    """Actualiza el detector de publicaciones repetidas con los archivos nuevos del scraper
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from dotenv import load_dotenv
+
+    from .duplicates import DetectorDuplicados
+    from .preprocessing import get_facebook_filenames
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    detector = DetectorDuplicados(
+        args.index or getenv("DUPLICATES_INDEX") or "Index//duplicados"
+    )
+    filenames = get_facebook_filenames(
+        args.folder or getenv("DATA_FOLDER") or "Data//datos_obtenidos",
+        args.prefix or getenv("DATA_FILENAME") or "fb_ropa",
+    )
+    if detector.actualizar(filenames):
+        detector.guardar()
+    resultado = detector.clusters(args.min_size)
+    resultado.to_csv(args.output, sep=";", index=False, encoding="utf-8-sig")
+    log(INFO, f"{len(resultado)} publicaciones repetidas guardadas en {args.output}")
+
+
+def aggregates(args):
+    """Actualiza los agregados por vendedor y locación con los archivos nuevos del scraper y los consulta
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from dotenv import load_dotenv
+
+    from .aggregates import AgregadosMercado
+    from .preprocessing import get_facebook_filenames
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    agregados = AgregadosMercado(
+        args.store or getenv("AGGREGATES_STORE") or "Index//agregados"
+    )
+    if agregados.actualizar(
+        get_facebook_filenames(
+            args.folder or getenv("DATA_FOLDER") or "Data//datos_obtenidos",
+            args.prefix or getenv("DATA_FILENAME") or "fb_ropa",
+        )
+    ):
+        agregados.guardar()
+    resultado = agregados.consultar(
+        args.by, args.key, args.since, args.until, args.currency, args.daily
+    )
+    resultado.to_csv(args.output, sep=";", index=False, encoding="utf-8-sig")
+    log(INFO, f"{len(resultado)} grupos guardados en {args.output}")
+
+
+def report(args):
+    """Genera el reporte de salud de las ejecuciones con los errores y los tiempos del scraper
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from dotenv import load_dotenv
+
+    from .preprocessing import report_runs
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    report_runs(
+        args.folder or getenv("ERROR_FOLDER") or "Error",
+        args.prefix or getenv("ERROR_FILENAME") or "fb_error",
+        args.timings or getenv("FILENAME_TIEMPOS") or "Tiempos.xlsx",
+        args.output,
+        args.freq,
+        args.window,
+    )
+
+
+def archive(args):
+    """Consulta el archivo de payloads o vuelve a extraer los datos de sus publicaciones
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from json import dump
+
+    from dotenv import load_dotenv
+    from pandas import DataFrame
+
+    from .archive import AlmacenPayloads
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    almacen = AlmacenPayloads(
+        args.archive or getenv("PAYLOAD_ARCHIVE") or "Archive//payloads"
+    )
+    if args.train:
+        almacen.entrenar(almacen.muestrear())
+    if args.listing:
+        payload = almacen.obtener(args.listing)
+        if not payload:
+            log(INFO, f"La publicación {args.listing} no está en el archivo")
+            return
+        with open(args.output or f"{args.listing}.json", "w", encoding="utf-8") as file:
+            dump(payload, file, ensure_ascii=False, indent=2)
+        log(INFO, f"Payload de la publicación {args.listing} guardado")
+    elif args.replay:
+        from .scraper import Dataset
+
+        dataset = Dataset()
+        cantidad = almacen.reprocesar(dataset, args.since, args.until)
+        output = args.output or "Reproceso.xlsx"
+        DataFrame(dataset.dataset).to_excel(output, index=False)
+        log(INFO, f"{cantidad} publicaciones guardadas en {output}")
+
+
+def mock(args):
+    """Inicia el servidor de prueba de facebook marketplace hasta que se interrumpa
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from time import sleep
+
+    from .mock import MockMarketplace
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    servidor = MockMarketplace(
+        args.feed_size, args.latency, args.jitter, args.error_rate, args.rate_limit
+    )
+    servidor.iniciar(args.port)
+    try:
+        while True:
+            sleep(1)
+    except KeyboardInterrupt:
+        servidor.detener()
+
+
+def loadtest(args):
+    """Ejecuta el scraper contra el servidor de prueba y muestra su rendimiento
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from json import dumps
+
+    from .loadtest import ejecutar_prueba, guardar_resultado
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    resultado = ejecutar_prueba(
+        args.feed_size,
+        args.latency,
+        args.jitter,
+        args.error_rate,
+        args.rate_limit,
+        args.navigation,
+        args.min_pause,
+        args.max_pause,
+        args.driver_path or getenv("CHROMEDRIVER_PATH"),
+        not args.show,
+    )
+    print(dumps(resultado, ensure_ascii=False, indent=2))
+    if args.output:
+        guardar_resultado(resultado, args.output)
+
+
+def bench_json(args):
+    """Compara la velocidad de las librerías de json al leer respuestas de graphql grabadas
+
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando
+    """
+    from itertools import islice
+
+    from dotenv import load_dotenv
+
+    from .jsonbackend import dumps_json, medir_backends
+
+    basicConfig(
+        format="%(asctime)s %(message)s", level=INFO, handlers=[StreamHandler()]
+    )
+    load_dotenv()
+    folder = args.archive or getenv("PAYLOAD_ARCHIVE") or "Archive//payloads"
+    datos = []
+    if path.isdir(folder):
+        from .archive import AlmacenPayloads
+
+        datos = [
+            payload["dato"]
+            for payload in islice(AlmacenPayloads(folder).leer(), args.limit)
+        ]
+    if not datos:
+        from .mock import MockMarketplace
+
+        log(INFO, f"No hay payloads en {folder}, se usan los del servidor de prueba")
+        mock = MockMarketplace(args.limit)
+        datos = [mock.payload(numero) for numero in range(args.limit)]
+
+    # Se reconstruye la respuesta de graphql tal como la recibe el scraper
+    respuestas = [
+        dumps_json(
+            {"data": {"viewer": {"marketplace_product_details_page": {"target": dato}}}}
+        )
+        for dato in datos
+    ]
+    log(INFO, f"Midiendo {len(respuestas)} respuestas")
+    resultados = medir_backends(respuestas, args.repeat)
+    print(f"{'camino':<8}{'librería':<10}{'respuestas/s':>14}{'MB/s':>10}")
+    for resultado in resultados:
+        print(
+            f"{resultado['camino']:<8}{resultado['backend']:<10}"
+            f"{resultado['respuestas_por_seg']:>14}{resultado['mb_por_seg']:>10}"
+        )
+
+
+def crear_parser():
+    """Genera el parser de la interfaz de línea de comandos
+
+    Returns:
+        argparse.ArgumentParser: Parser con todos los subcomandos
+    """
+    parser = ArgumentParser(
+        prog="fb_marketplace",
+        description="Scraper de facebook marketplace y limpieza de la data extraída",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_scrape = subparsers.add_parser(
+        "scrape", help="Extrae las publicaciones del día usando las variables del .env"
+    )
+    modo = parser_scrape.add_mutually_exclusive_group()
+    modo.add_argument(
+        "--daemon",
+        type=float,
+        metavar="MINUTES",
+        help="Mantiene el navegador abierto y scrapea las publicaciones nuevas cada MINUTES minutos",
+    )
+    modo.add_argument(
+        "--backfill",
+        nargs=2,
+        metavar=("SINCE", "UNTIL"),
+        help="Extrae las publicaciones creadas entre dos días (dd/mm/aaaa) en ventanas de tiempo paralelas, continúa donde quedó la ejecución anterior",
+    )
+    parser_scrape.add_argument(
+        "--window-hours",
+        type=int,
+        help="Duración en horas de cada ventana del relleno. Si no se indica se usa BACKFILL_WINDOW_HOURS o 24",
+    )
+    parser_scrape.set_defaults(func=scrape)
+
+    parser_preprocess = subparsers.add_parser(
+        "preprocess", help="Limpia la data de una página"
+    )
+    parser_preprocess.add_argument(
+        "--site",
+        choices=list(SITES),
+        help="Página a limpiar. Si no se indica se pregunta al usuario",
+    )
+    parser_preprocess.add_argument(
+        "--input", help="Archivo csv de despegar, booking o pedidos ya"
+    )
+    parser_preprocess.add_argument(
+        "--folder", help="Carpeta donde el scraper guarda la data de facebook"
+    )
+    parser_preprocess.add_argument(
+        "--prefix", help="Nombre con el que inician los archivos del scraper"
+    )
+    parser_preprocess.set_defaults(func=preprocess)
+
+    parser_metrics = subparsers.add_parser(
+        "export-metrics", help="Exporta las mediciones de ejecución a un archivo csv"
+    )
+    parser_metrics.add_argument("--filename", help="Archivo excel de tiempos")
+    parser_metrics.add_argument("--sheet", help="Hoja de cálculo de tiempos")
+    parser_metrics.add_argument(
+        "--output", default="Tiempos.csv", help="Archivo csv a generar"
+    )
+    parser_metrics.set_defaults(func=export_metrics)
+
+    parser_spatial = subparsers.add_parser(
+        "spatial",
+        help="Actualiza el índice espacial de las publicaciones y lo consulta",
+    )
+    parser_spatial.add_argument(
+        "--index", default="Index//espacial", help="Ruta del índice sin extensión"
+    )
+    parser_spatial.add_argument(
+        "--folder", help="Carpeta donde el scraper guarda la data de facebook"
+    )
+    parser_spatial.add_argument(
+        "--prefix", help="Nombre con el que inician los archivos del scraper"
+    )
+    consulta = parser_spatial.add_mutually_exclusive_group()
+    consulta.add_argument(
+        "--radius",
+        nargs=3,
+        type=float,
+        metavar=("LAT", "LON", "KM"),
+        help="Publicaciones a menos de KM kilómetros de las coordenadas",
+    )
+    consulta.add_argument(
+        "--bbox",
+        nargs=4,
+        type=float,
+        metavar=("LAT_MIN", "LON_MIN", "LAT_MAX", "LON_MAX"),
+        help="Publicaciones dentro del rectángulo",
+    )
+    parser_spatial.add_argument(
+        "--cells",
+        action="store_true",
+        help="Retorna la cantidad y los precios agregados por celda",
+    )
+    parser_spatial.add_argument(
+        "--output", default="Espacial.csv", help="Archivo csv a generar"
+    )
+    parser_spatial.set_defaults(func=spatial)
+
+    parser_search = subparsers.add_parser(
+        "search",
+        help="Actualiza el índice de búsqueda de títulos y descripciones y lo consulta",
+    )
+    parser_search.add_argument(
+        "query",
+        nargs="?",
+        help='Consulta booleana, por ejemplo "polo* algodon -nino OR camisa"',
+    )
+    parser_search.add_argument("--index", help="Carpeta del índice de búsqueda")
+    parser_search.add_argument(
+        "--folder", help="Carpeta donde el scraper guarda la data de facebook"
+    )
+    parser_search.add_argument(
+        "--prefix", help="Nombre con el que inician los archivos del scraper"
+    )
+    parser_search.add_argument("--min-price", type=float, help="Precio mínimo")
+    parser_search.add_argument("--max-price", type=float, help="Precio máximo")
+    parser_search.add_argument("--since", help="Fecha de creación mínima (dd/mm/aaaa)")
+    parser_search.add_argument("--until", help="Fecha de creación máxima (dd/mm/aaaa)")
+    parser_search.add_argument("--currency", help="Tipo de moneda, por ejemplo PEN")
+    parser_search.add_argument(
+        "--output", default="Busqueda.csv", help="Archivo csv a generar"
+    )
+    parser_search.set_defaults(func=search)
+
+    parser_duplicates = subparsers.add_parser(
+        "duplicates",
+        help="Agrupa las publicaciones repetidas y los reposts de todas las ejecuciones",
+    )
+    parser_duplicates.add_argument("--index", help="Carpeta del detector de duplicados")
+    parser_duplicates.add_argument(
+        "--folder", help="Carpeta donde el scraper guarda la data de facebook"
+    )
+    parser_duplicates.add_argument(
+        "--prefix", help="Nombre con el que inician los archivos del scraper"
+    )
+    parser_duplicates.add_argument(
+        "--min-size",
+        type=int,
+        default=2,
+        help="Cantidad mínima de publicaciones de los clusters a exportar",
+    )
+    parser_duplicates.add_argument(
+        "--output", default="Duplicados.csv", help="Archivo csv a generar"
+    )
+    parser_duplicates.set_defaults(func=duplicates)
+
+    parser_aggregates = subparsers.add_parser(
+        "aggregates",
+        help="Actualiza los agregados por vendedor y locación y los consulta",
+    )
+    parser_aggregates.add_argument("--store", help="Carpeta de los agregados")
+    parser_aggregates.add_argument(
+        "--folder", help="Carpeta donde el scraper guarda la data de facebook"
+    )
+    parser_aggregates.add_argument(
+        "--prefix", help="Nombre con el que inician los archivos del scraper"
+    )
+    parser_aggregates.add_argument(
+        "--by",
+        choices=["vendedor", "locacion"],
+        default="vendedor",
+        help="Agrupa por id_vendedor o por locacion_id",
+    )
+    parser_aggregates.add_argument(
+        "--key",
+        action="append",
+        help="Id del vendedor o de la locación, se puede repetir",
+    )
+    parser_aggregates.add_argument("--since", help="Día mínimo (dd/mm/aaaa)")
+    parser_aggregates.add_argument("--until", help="Día máximo (dd/mm/aaaa)")
+    parser_aggregates.add_argument("--currency", help="Tipo de moneda, por ejemplo PEN")
+    parser_aggregates.add_argument(
+        "--daily", action="store_true", help="Resume cada día por separado"
+    )
+    parser_aggregates.add_argument(
+        "--output", default="Agregados.csv", help="Archivo csv a generar"
+    )
+    parser_aggregates.set_defaults(func=aggregates)
+
+    parser_report = subparsers.add_parser(
+        "report",
+        help="Resume los errores y el rendimiento de todas las ejecuciones",
+    )
+    parser_report.add_argument(
+        "--folder", help="Carpeta donde el scraper guarda los errores"
+    )
+    parser_report.add_argument(
+        "--prefix", help="Nombre con el que inician los archivos de errores"
+    )
+    parser_report.add_argument("--timings", help="Archivo excel de tiempos")
+    parser_report.add_argument(
+        "--freq", default="W", help="Periodo de agrupación: D, W o M"
+    )
+    parser_report.add_argument(
+        "--window",
+        type=int,
+        default=7,
+        help="Ejecuciones recientes que se comparan con las anteriores",
+    )
+    parser_report.add_argument(
+        "--output", default="Reporte_ejecuciones.xlsx", help="Archivo excel a generar"
+    )
+    parser_report.set_defaults(func=report)
+
+    parser_archive = subparsers.add_parser(
+        "archive",
+        help="Consulta el archivo de payloads o vuelve a extraer sus publicaciones",
+    )
+    parser_archive.add_argument("--archive", help="Carpeta del archivo de payloads")
+    accion = parser_archive.add_mutually_exclusive_group()
+    accion.add_argument("--listing", help="Id de la publicación a exportar en json")
+    accion.add_argument(
+        "--replay",
+        action="store_true",
+        help="Vuelve a extraer los datos de todos los payloads con Dataset.agregar_data",
+    )
+    parser_archive.add_argument(
+        "--train",
+        action="store_true",
+        help="Entrena un nuevo diccionario con payloads de todos los días",
+    )
+    parser_archive.add_argument("--since", help="Día mínimo (dd/mm/aaaa)")
+    parser_archive.add_argument("--until", help="Día máximo (dd/mm/aaaa)")
+    parser_archive.add_argument("--output", help="Archivo json o excel a generar")
+    parser_archive.set_defaults(func=archive)
+
+    # Parámetros del servidor de prueba que comparten mock y loadtest
+    parser_servidor = ArgumentParser(add_help=False)
+    parser_servidor.add_argument(
+        "--feed-size",
+        type=int,
+        default=200,
+        help="Cantidad de publicaciones del día en el feed",
+    )
+    parser_servidor.add_argument(
+        "--latency",
+        type=float,
+        default=0.2,
+        help="Segundos de espera de cada respuesta",
+    )
+    parser_servidor.add_argument(
+        "--jitter",
+        type=float,
+        default=0.1,
+        help="Segundos máximos que se suman al azar a la latencia",
+    )
+    parser_servidor.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Proporción de publicaciones que se responden sin información",
+    )
+    parser_servidor.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Proporción de consultas a graphql que se responden con 429",
+    )
+
+    parser_mock = subparsers.add_parser(
+        "mock",
+        parents=[parser_servidor],
+        help="Inicia un servidor local que imita a facebook marketplace",
+    )
+    parser_mock.add_argument("--port", type=int, default=8000, help="Puerto local")
+    parser_mock.set_defaults(func=mock)
+
+    parser_loadtest = subparsers.add_parser(
+        "loadtest",
+        parents=[parser_servidor],
+        help="Mide el rendimiento del scraper contra el servidor de prueba",
+    )
+    parser_loadtest.add_argument(
+        "--navigation", choices=["click", "url"], default="click"
+    )
+    parser_loadtest.add_argument(
+        "--min-pause", type=float, default=0.2, help="Pausa mínima en segundos"
+    )
+    parser_loadtest.add_argument(
+        "--max-pause", type=float, default=5, help="Pausa máxima en segundos"
+    )
+    parser_loadtest.add_argument("--driver-path", help="Ruta del chromedriver")
+    parser_loadtest.add_argument(
+        "--show", action="store_true", help="Muestra el navegador durante la prueba"
+    )
+    parser_loadtest.add_argument(
+        "--output", help="Archivo jsonl donde se agrega el resultado"
+    )
+    parser_loadtest.set_defaults(func=loadtest)
+
+    parser_bench = subparsers.add_parser(
+        "bench-json",
+        help="Compara las librerías de json con las respuestas de graphql grabadas",
+    )
+    parser_bench.add_argument("--archive", help="Carpeta del archivo de payloads")
+    parser_bench.add_argument(
+        "--limit",
+        type=int,
+        default=1000,
+        help="Cantidad máxima de respuestas a medir",
+    )
+    parser_bench.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Veces que se leen todas las respuestas, se toma la más rápida",
+    )
+    parser_bench.set_defaults(func=bench_json)
+    return parser
+
+
+def main(argv=None):
+    """Ejecuta el subcomando indicado en la línea de comandos
+
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos. Defaults to None.
+    """
+    args = crear_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+from json import dump, load
+from logging import INFO, log
+from os import makedirs, path, replace
+from re import compile
+from threading import Lock
+from zlib import crc32
+
+from numpy import (
+    argsort,
+    array,
+    concatenate,
+    empty,
+    float64,
+    full,
+    int64,
+    isfinite,
+    load as load_arrays,
+    savez,
+    searchsorted,
+    uint32,
+    uint64,
+    zeros,
+)
+from numpy.random import default_rng
+from pandas import DataFrame, to_numeric
+from pandas.api.types import is_datetime64_any_dtype
+
+from .preprocessing import CACHE_FOLDER, read_dataset, SCHEMA_FACEBOOK
+from .search import tokenizar
+from .spatial import ENLACE_PUBLICACION, ids_publicaciones
+
+# Cantidad de funciones hash de la firma MinHash
+NUM_PERMUTACIONES = 32
+# Cantidad de bandas del LSH, cada banda usa NUM_PERMUTACIONES / NUM_BANDAS valores de la firma
+NUM_BANDAS = 8
+# Cantidad máxima de candidatos que se revisan por banda, evita recorrer buckets muy poblados
+MAX_CANDIDATOS = 50
+# Constantes impares para combinar los valores de una banda en un solo hash
+MEZCLA = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)
+PRECIO_TILE = compile(r"\d[\d,.]*")
+
+
+def hash_texto(texto):
+    """Función que retorna un hash estable de 32 bits de un texto
+
+    Args:
+        texto (str): Texto
+
+    Returns:
+        int: Hash del texto
+    """
+    return crc32(texto.encode("utf-8"))
+
+
+def clave_titulo(titulo, precio):
+    """Función que retorna la clave de un título y un precio, sin importar tildes ni el orden de las palabras
+
+    Args:
+        titulo (str): Título de la publicación
+        precio (float): Precio de la publicación
+
+    Returns:
+        int: Clave del título y el precio o None si el título no tiene palabras
+    """
+    tokens = sorted(set(tokenizar(titulo)))
+    if not tokens:
+        return None
+    precio = round(precio) if precio == precio else -1
+    return hash_texto(" ".join(tokens) + f"|{precio}")
+
+
+class DetectorDuplicados:
+    """Representa a un detector de publicaciones repetidas entre todas las ejecuciones del scraper
+
+    Cada publicación se resume en una firma MinHash de las palabras de su título y descripción. El
+    LSH agrupa las firmas por bandas, de modo que solo se comparan las publicaciones que coinciden
+    en alguna banda. Dos publicaciones son repetidas si sus firmas son parecidas, son del mismo
+    vendedor y su precio es similar. Las publicaciones repetidas forman un cluster cuyo id es el
+    id de la publicación con la fecha de creación más antigua.
+
+    Attributes:
+        folder (str): Carpeta donde se guarda el detector
+        umbral (float): Similitud de Jaccard estimada mínima entre dos publicaciones repetidas
+        tolerancia_precio (float): Diferencia relativa máxima entre los precios de dos publicaciones repetidas
+        archivos (dict): Fecha de modificación de cada archivo procesado
+    """
+
+    def __init__(self, folder, umbral=0.6, tolerancia_precio=0.25, semilla=1):
+        """Genera todos los atributos para una instancia de la clase DetectorDuplicados
+
+        Args:
+            folder (str): Carpeta donde se guarda el detector
+            umbral (float, optional): Similitud de Jaccard estimada mínima. Defaults to 0.6.
+            tolerancia_precio (float, optional): Diferencia relativa máxima entre los precios. Defaults to 0.25.
+            semilla (int, optional): Semilla de las funciones hash, debe ser la misma entre ejecuciones. Defaults to 1.
+        """
+        self._folder = folder
+        self._umbral = umbral
+        self._tolerancia_precio = tolerancia_precio
+        generador = default_rng(semilla)
+        # Funciones hash multiply-shift: (a * x + b) mod 2^64 >> 32, con a impar
+        self._a = generador.integers(0, 2**63, NUM_PERMUTACIONES, dtype=uint64) * 2 + 1
+        self._b = generador.integers(0, 2**63, NUM_PERMUTACIONES, dtype=uint64)
+        self._firmas = empty((0, NUM_PERMUTACIONES), uint32)
+        self._bandas = empty((0, NUM_BANDAS), uint64)
+        self._vendedor = empty(0, int64)
+        self._precio = empty(0, float64)
+        self._creacion = empty(0, int64)
+        self._id_publicacion = empty(0, int64)
+        self._padre = empty(0, int64)
+        self._titulos = empty(0, int64)
+        self._archivos = {}
+        # Los navegadores del Planificador consultan y registran publicaciones a la vez
+        self._lock = Lock()
+        # Estructuras que se generan a partir de los arreglos cuando se necesitan
+        self._orden_bandas = None
+        self._posicion_id = None
+        self._claves_titulos = None
+        self._filename = path.join(folder, "duplicados")
+        if path.isfile(self._filename + ".npz"):
+            self.cargar()
+
+    @property
+    def folder(self):
+        """Retorna el valor actual del atributo folder"""
+        return self._folder
+
+    @property
+    def archivos(self):
+        """Retorna el valor actual del atributo archivos"""
+        return self._archivos
+
+    def __len__(self):
+        """Retorna la cantidad de publicaciones registradas"""
+        return len(self._padre)
+
+    def firma(self, texto):
+        """Retorna la firma MinHash de las palabras de un texto
+
+        Args:
+            texto (str): Texto
+
+        Returns:
+            numpy.ndarray: Firma del texto o None si el texto no tiene palabras
+        """
+        tokens = set(tokenizar(texto))
+        if not tokens:
+            return None
+        hashes = array([hash_texto(token) for token in tokens], uint64)
+        valores = (self._a[:, None] * hashes[None, :] + self._b[:, None]) >> uint64(32)
+        return valores.min(axis=1).astype(uint32)
+
+    def hash_bandas(self, firmas):
+        """Retorna el hash de cada banda de las firmas
+
+        Args:
+            firmas (numpy.ndarray): Firmas MinHash
+
+        Returns:
+            numpy.ndarray: Hash de cada banda de cada firma
+        """
+        filas = NUM_PERMUTACIONES // NUM_BANDAS
+        bandas = zeros((len(firmas), NUM_BANDAS), uint64)
+        for banda in range(NUM_BANDAS):
+            valor = full(len(firmas), banda, uint64)
+            for fila in range(filas):
+                columna = firmas[:, banda * filas + fila].astype(uint64)
+                valor = (valor ^ columna) * uint64(MEZCLA[fila % 2])
+            bandas[:, banda] = valor
+        return bandas
+
+    def raiz(self, posicion):
+        """Retorna la publicación raíz del cluster al que pertenece una publicación
+
+        Args:
+            posicion (int): Posición de la publicación
+
+        Returns:
+            int: Posición de la publicación raíz
+        """
+        while self._padre[posicion] != posicion:
+            # Compresión de caminos a la mitad
+            self._padre[posicion] = self._padre[self._padre[posicion]]
+            posicion = self._padre[posicion]
+        return posicion
+
+    def antiguedad(self, posicion):
+        """Retorna la clave con la que se ordenan las publicaciones de la más antigua a la más nueva
+
+        Args:
+            posicion (int): Posición de la publicación
+
+        Returns:
+            tuple: Fecha de creación y posición de la publicación
+        """
+        creacion = int(self._creacion[posicion])
+        # Las publicaciones sin fecha de creación se consideran las más nuevas
+        return (creacion if creacion >= 0 else 2**63, posicion)
+
+    def unir(self, posicion_1, posicion_2):
+        """Une los clusters de dos publicaciones. La raíz es la publicación creada primero
+
+        Args:
+            posicion_1 (int): Posición de una publicación
+            posicion_2 (int): Posición de otra publicación
+        """
+        raiz_1, raiz_2 = self.raiz(posicion_1), self.raiz(posicion_2)
+        if raiz_1 != raiz_2:
+            antigua, nueva = sorted((raiz_1, raiz_2), key=self.antiguedad)
+            self._padre[nueva] = antigua
+
+    def son_repetidas(self, posicion_1, posicion_2):
+        """Comprueba si dos publicaciones son repetidas
+
+        Args:
+            posicion_1 (int): Posición de una publicación
+            posicion_2 (int): Posición de otra publicación
+
+        Returns:
+            bool: Indica si las publicaciones son repetidas
+        """
+        vendedor_1, vendedor_2 = self._vendedor[posicion_1], self._vendedor[posicion_2]
+        if vendedor_1 >= 0 and vendedor_2 >= 0 and vendedor_1 != vendedor_2:
+            return False
+        precio_1, precio_2 = self._precio[posicion_1], self._precio[posicion_2]
+        if isfinite(precio_1) and isfinite(precio_2) and max(precio_1, precio_2) > 0:
+            diferencia = abs(precio_1 - precio_2) / max(precio_1, precio_2)
+            if diferencia > self._tolerancia_precio:
+                return False
+        similitud = (self._firmas[posicion_1] == self._firmas[posicion_2]).mean()
+        return similitud >= self._umbral
+
+    def id_cluster(self, posicion):
+        """Retorna el id del cluster de una publicación, que es el id de la publicación creada primero
+
+        Args:
+            posicion (int): Posición de la publicación
+
+        Returns:
+            int: Id del cluster
+        """
+        raiz = self.raiz(posicion)
+        id_publicacion = self._id_publicacion[raiz]
+        return int(id_publicacion) if id_publicacion >= 0 else -int(raiz) - 1
+
+    def agregar(self, df_data):
+        """Registra las publicaciones de un DataFrame (pandas.core.frame.DataFrame) y las agrupa con sus repetidas
+
+        Args:
+            df_data (pandas.core.frame.DataFrame): Publicaciones extraídas por el scraper
+
+        Returns:
+            list: Id del cluster de cada publicación del DataFrame
+        """
+        ids = ids_publicaciones(df_data["enlace"]).tolist()
+        # Los ids se convierten con int, un float pierde los dígitos de los ids mayores a 2^53
+        vendedores = [
+            int(vendedor) if isinstance(vendedor, str) else -1
+            for vendedor in df_data["id_vendedor"]
+            .astype(str)
+            .str.extract(r"^\s*(\d+)(?:\.0*)?\s*$")[0]
+        ]
+        precios = to_numeric(df_data["precio"], errors="coerce").tolist()
+        creacion = df_data["tiempo_creacion"]
+        if is_datetime64_any_dtype(creacion):
+            # read_dataset convierte el epoch a fecha, el scraper lo guarda en segundos
+            creacion = creacion.astype(int64).where(creacion.notna()) // 10**9
+        creaciones = (
+            to_numeric(creacion, errors="coerce").fillna(-1).astype(int64).tolist()
+        )
+        titulos = df_data["titulo_marketplace"].fillna("").astype(str).tolist()
+        descripciones = df_data["descripcion"].fillna("").astype(str).tolist()
+
+        with self._lock:
+            posiciones_id = self.posiciones_id()
+            posiciones = []
+            nuevas = []
+            inicio = len(self)
+            firmas, vendedor, precio, creacion = [], [], [], []
+            id_publicacion, claves = [], []
+            for numero, id_fila in enumerate(ids):
+                # Una publicación que ya fue registrada en otra ejecución conserva su cluster
+                if id_fila >= 0 and id_fila in posiciones_id:
+                    posiciones.append(posiciones_id[id_fila])
+                    continue
+                posicion = inicio + len(firmas)
+                firma = self.firma(titulos[numero] + " " + descripciones[numero])
+                # Las publicaciones sin texto forman su propio cluster y no entran al LSH
+                firmas.append(
+                    firma
+                    if firma is not None
+                    else full(NUM_PERMUTACIONES, posicion % 2**32, uint32)
+                )
+                vendedor.append(vendedores[numero])
+                precio.append(precios[numero])
+                creacion.append(creaciones[numero])
+                id_publicacion.append(id_fila)
+                claves.append(clave_titulo(titulos[numero], precios[numero]) or 0)
+                if id_fila >= 0:
+                    posiciones_id[id_fila] = posicion
+                posiciones.append(posicion)
+                if firma is not None:
+                    nuevas.append(posicion)
+
+            if firmas:
+                firmas = array(firmas, uint32)
+                self._firmas = concatenate([self._firmas, firmas])
+                self._bandas = concatenate([self._bandas, self.hash_bandas(firmas)])
+                self._vendedor = concatenate([self._vendedor, array(vendedor, int64)])
+                self._precio = concatenate([self._precio, array(precio, float64)])
+                self._creacion = concatenate([self._creacion, array(creacion, int64)])
+                self._id_publicacion = concatenate(
+                    [self._id_publicacion, array(id_publicacion, int64)]
+                )
+                self._padre = concatenate(
+                    [self._padre, inicio + array(range(len(firmas)), int64)]
+                )
+                self._titulos = concatenate([self._titulos, array(claves, int64)])
+                self._orden_bandas = None
+                self._claves_titulos = None
+                self.agrupar(nuevas)
+            return [self.id_cluster(posicion) for posicion in posiciones]
+
+    def agrupar(self, nuevas):
+        """Une cada publicación nueva con las publicaciones repetidas que comparten alguna banda
+
+        Args:
+            nuevas (list): Posiciones de las publicaciones nuevas
+        """
+        if self._orden_bandas is None:
+            self._orden_bandas = [
+                argsort(self._bandas[:, banda], kind="stable")
+                for banda in range(NUM_BANDAS)
+            ]
+        for banda in range(NUM_BANDAS):
+            orden = self._orden_bandas[banda]
+            ordenadas = self._bandas[orden, banda]
+            valores = self._bandas[nuevas, banda]
+            inicios = searchsorted(ordenadas, valores, "left")
+            fines = searchsorted(ordenadas, valores, "right")
+            for posicion, inicio, fin in zip(nuevas, inicios, fines):
+                for candidata in orden[inicio : min(fin, inicio + MAX_CANDIDATOS)]:
+                    if candidata != posicion and self.son_repetidas(
+                        posicion, candidata
+                    ):
+                        self.unir(posicion, candidata)
+
+    def posiciones_id(self):
+        """Retorna un diccionario con la posición de cada id de publicación registrado"""
+        if self._posicion_id is None:
+            self._posicion_id = {
+                int(id_publicacion): posicion
+                for posicion, id_publicacion in enumerate(self._id_publicacion)
+                if id_publicacion >= 0
+            }
+        return self._posicion_id
+
+    def es_repost(self, id_publicacion, texto):
+        """Comprueba con la información del feed si una publicación ya fue registrada o es un repost conocido
+
+        Args:
+            id_publicacion (str): Id de la publicación
+            texto (str): Texto de la publicación en el feed, con el precio en la primera línea y el título en la segunda
+
+        Returns:
+            bool: Indica si la publicación se puede omitir
+        """
+        with self._lock:
+            if int(id_publicacion) in self.posiciones_id():
+                return True
+            lineas = [linea for linea in (texto or "").split("\n") if linea.strip()]
+            if len(lineas) < 2:
+                return False
+            precio = PRECIO_TILE.search(lineas[0])
+            if not precio:
+                return False
+            precio = float(precio.group().replace(",", ""))
+            claves = self._claves_titulos
+            if claves is None:
+                claves = self._claves_titulos = set(self._titulos.tolist())
+            return clave_titulo(lineas[1], precio) in claves
+
+    def actualizar(self, filenames, cache_folder=CACHE_FOLDER):
+        """Registra las publicaciones de los archivos nuevos o modificados del scraper
+
+        Args:
+            filenames (list): Lista de rutas de los archivos del scraper
+            cache_folder (str, optional): Carpeta de la caché de lectura. Defaults to CACHE_FOLDER.
+
+        Returns:
+            int: Cantidad de publicaciones procesadas
+        """
+        cantidad = 0
+        for filename in filenames:
+            mtime = path.getmtime(filename)
+            if self._archivos.get(filename) == mtime:
+                continue
+            df_data = read_dataset(
+                filename, schema=SCHEMA_FACEBOOK, cache_folder=cache_folder
+            )
+            self.agregar(df_data)
+            self._archivos[filename] = mtime
+            cantidad += len(df_data)
+            log(INFO, f"Archivo {filename} procesado")
+        return cantidad
+
+    def clusters(self, min_tamano=2):
+        """Retorna las publicaciones de los clusters con una cantidad mínima de publicaciones
+
+        Args:
+            min_tamano (int, optional): Cantidad mínima de publicaciones del cluster. Defaults to 2.
+
+        Returns:
+            pandas.core.frame.DataFrame: Id del cluster, tamaño del cluster y enlace de cada publicación
+        """
+        df_clusters = DataFrame(
+            {
+                "id_cluster": [
+                    self.id_cluster(posicion) for posicion in range(len(self))
+                ],
+                "id_publicacion": self._id_publicacion,
+            }
+        )
+        df_clusters["tamano"] = df_clusters.groupby("id_cluster")[
+            "id_publicacion"
+        ].transform("size")
+        df_clusters = df_clusters[df_clusters["tamano"] >= min_tamano]
+        df_clusters["enlace"] = df_clusters["id_publicacion"].map(
+            ENLACE_PUBLICACION.format
+        )
+        return df_clusters.sort_values(
+            ["tamano", "id_cluster"], ascending=[False, True]
+        )
+
+    def guardar(self):
+        """Guarda el detector en un archivo npz y la lista de archivos procesados en un json"""
+        with self._lock:
+            if not path.exists(self._folder):
+                makedirs(self._folder)
+            with open(self._filename + ".npz.tmp", "wb") as file:
+                savez(
+                    file,
+                    firmas=self._firmas,
+                    vendedor=self._vendedor,
+                    precio=self._precio,
+                    creacion=self._creacion,
+                    id_publicacion=self._id_publicacion,
+                    padre=self._padre,
+                    titulos=self._titulos,
+                )
+            with open(self._filename + ".json.tmp", "w", encoding="utf-8") as file:
+                dump(self._archivos, file)
+            replace(self._filename + ".npz.tmp", self._filename + ".npz")
+            replace(self._filename + ".json.tmp", self._filename + ".json")
+            log(INFO, f"Detector de duplicados guardado con {len(self)} publicaciones")
+
+    def cargar(self):
+        """Lee el detector guardado en la carpeta"""
+        with load_arrays(self._filename + ".npz") as arreglos:
+            self._firmas = arreglos["firmas"]
+            self._vendedor = arreglos["vendedor"]
+            self._precio = arreglos["precio"]
+            # Los detectores guardados antes de registrar la fecha de creación no la tienen
+            self._creacion = (
+                arreglos["creacion"]
+                if "creacion" in arreglos
+                else full(len(self._precio), -1, int64)
+            )
+            self._id_publicacion = arreglos["id_publicacion"]
+            self._padre = arreglos["padre"]
+            self._titulos = arreglos["titulos"]
+        self._bandas = self.hash_bandas(self._firmas)
+        if path.isfile(self._filename + ".json"):
+            with open(self._filename + ".json", encoding="utf-8") as file:
+                self._archivos = load(file)
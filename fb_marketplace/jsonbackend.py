@@ -0,0 +1,154 @@
+from json import dumps, loads
+from logging import INFO, log
+from os import getenv
+from time import perf_counter
+
+try:
+    import orjson
+except ImportError:
+    # orjson es opcional, sin él se usa el módulo json de python
+    orjson = None
+
+# Inicio de la respuesta de graphql que contiene la información de una publicación
+FIRMA_DETALLE = b'{"viewer":{"marketplace_product_details_page"'
+
+
+def dumps_json(objeto):
+    """Función que convierte un objeto a json compacto en bytes con el módulo json de python
+
+    Args:
+        objeto (dict | list): Objeto a convertir
+
+    Returns:
+        bytes: Json codificado en utf-8
+    """
+    return dumps(objeto, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(cuerpo):
+    """Función que lee un json en bytes o str con el módulo json de python
+
+    Args:
+        cuerpo (bytes | str): Json a leer
+
+    Returns:
+        dict | list: Objeto leído
+    """
+    # json.loads con bytes detecta la codificación antes de decodificar, es más lento
+    if isinstance(cuerpo, bytes):
+        cuerpo = cuerpo.decode("utf-8")
+    return loads(cuerpo)
+
+
+class BackendJson:
+    """Representa a una librería que lee y escribe json directamente en bytes
+
+    Attributes:
+        nombre (str): Nombre de la librería
+        loads (function): Función que convierte bytes o str en un objeto
+        dumps (function): Función que convierte un objeto en bytes utf-8
+    """
+
+    def __init__(self, nombre, loads, dumps):
+        """Genera todos los atributos para una instancia de la clase BackendJson
+
+        Args:
+            nombre (str): Nombre de la librería
+            loads (function): Función que convierte bytes o str en un objeto
+            dumps (function): Función que convierte un objeto en bytes utf-8
+        """
+        self._nombre = nombre
+        self.loads = loads
+        self.dumps = dumps
+
+    @property
+    def nombre(self):
+        """Retorna el valor actual del atributo nombre"""
+        return self._nombre
+
+    def __repr__(self):
+        return f"BackendJson({self._nombre})"
+
+
+BACKENDS = {"json": BackendJson("json", loads_json, dumps_json)}
+if orjson:
+    BACKENDS["orjson"] = BackendJson("orjson", orjson.loads, orjson.dumps)
+
+
+def obtener_backend(nombre=None):
+    """Función que retorna la librería de json a usar
+
+    Args:
+        nombre (str, optional): Nombre de la librería, json u orjson. Si es None se usa la variable JSON_BACKEND y si no está definida la más rápida instalada. Defaults to None.
+
+    Returns:
+        BackendJson: Librería de json
+    """
+    nombre = (nombre or getenv("JSON_BACKEND") or "").lower()
+    if not nombre:
+        return BACKENDS.get("orjson", BACKENDS["json"])
+    if nombre not in BACKENDS:
+        log(INFO, f"La librería {nombre} no está instalada, se usa json")
+        return BACKENDS["json"]
+    return BACKENDS[nombre]
+
+
+def es_detalle(cuerpo):
+    """Función que comprueba en bytes si una respuesta de graphql contiene la información de una publicación
+
+    Args:
+        cuerpo (bytes): Cuerpo de la respuesta descomprimido
+
+    Returns:
+        bool: Indica si la respuesta contiene la información de una publicación
+    """
+    return FIRMA_DETALLE in cuerpo
+
+
+def medir_backends(respuestas, repeticiones=5):
+    """Función que mide cuánto tarda cada librería en procesar respuestas de graphql grabadas
+
+    Compara el camino anterior (decodificar a str, buscar la firma en el str y leer el json desde
+    el str) con el actual (buscar la firma y leer el json directamente en los bytes).
+
+    Args:
+        respuestas (list): Cuerpos de respuestas de graphql en bytes
+        repeticiones (int, optional): Cantidad de veces que se procesan todas las respuestas. Defaults to 5.
+
+    Returns:
+        list: Lista de diccionarios con el camino, la librería, las respuestas por segundo y los MB por segundo
+    """
+    megas = sum(len(respuesta) for respuesta in respuestas) / 2**20
+    firma = FIRMA_DETALLE.decode("utf-8")
+
+    def camino_str(backend):
+        for respuesta in respuestas:
+            texto = respuesta.decode("utf-8")
+            if texto.find(firma) != -1:
+                backend.loads(texto)
+
+    def camino_bytes(backend):
+        for respuesta in respuestas:
+            if es_detalle(respuesta):
+                backend.loads(respuesta)
+
+    resultados = []
+    for backend in BACKENDS.values():
+        for camino, funcion in (("str", camino_str), ("bytes", camino_bytes)):
+            # La primera pasada no se mide, calienta las cachés
+            funcion(backend)
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = perf_counter()
+                funcion(backend)
+                tiempos.append(perf_counter() - inicio)
+            mejor = min(tiempos)
+            resultados.append(
+                {
+                    "camino": camino,
+                    "backend": backend.nombre,
+                    "respuestas_por_seg": round(len(respuestas) / mejor, 1),
+                    "mb_por_seg": round(megas / mejor, 1),
+                }
+            )
+    return resultados
@@ -0,0 +1,201 @@
+from json import dumps
+from logging import INFO, log
+from os import listdir, path
+from threading import Event, Thread
+from time import strftime, time
+
+from .mock import MockMarketplace
+from .scraper import ControladorRitmo, ScraperFb
+
+try:
+    from resource import getrusage, RUSAGE_SELF
+except ImportError:
+    # El módulo resource no existe en windows
+    getrusage = None
+
+
+def procesos_hijos():
+    """Función que retorna los hijos de cada proceso del sistema leyendo /proc
+
+    Returns:
+        dict: Diccionario con el pid de cada proceso y la lista de pids de sus hijos
+    """
+    hijos = {}
+    for pid in listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as file:
+                # El nombre del proceso puede tener espacios y va entre paréntesis
+                padre = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        hijos.setdefault(padre, []).append(int(pid))
+    return hijos
+
+
+def memoria_procesos(pid):
+    """Función que retorna la memoria residente de un proceso y de todos sus descendientes
+
+    Args:
+        pid (int): Id del proceso
+
+    Returns:
+        float: Memoria en MB o None si el sistema no tiene /proc
+    """
+    if not path.isdir("/proc"):
+        return None
+    hijos = procesos_hijos()
+    pendientes = [pid]
+    memoria = 0
+    while pendientes:
+        actual = pendientes.pop()
+        pendientes.extend(hijos.get(actual, []))
+        try:
+            with open(f"/proc/{actual}/status", encoding="utf-8") as file:
+                for linea in file:
+                    if linea.startswith("VmRSS:"):
+                        memoria += int(linea.split()[1])
+                        break
+        except OSError:
+            continue
+    return round(memoria / 1024, 1)
+
+
+class MonitorMemoria(Thread):
+    """Representa a un hilo que mide cada segundo la memoria del navegador y guarda el máximo
+
+    Attributes:
+        pid (int): Id del proceso del chromedriver
+        maximo (float): Memoria máxima medida en MB
+    """
+
+    def __init__(self, pid, intervalo=1):
+        """Genera todos los atributos para una instancia de la clase MonitorMemoria
+
+        Args:
+            pid (int): Id del proceso del chromedriver
+            intervalo (float, optional): Segundos entre cada medición. Defaults to 1.
+        """
+        super().__init__(name="Memoria", daemon=True)
+        self.pid = pid
+        self.maximo = None
+        self._intervalo = intervalo
+        self._detener = Event()
+
+    def run(self):
+        """Mide la memoria hasta que se detenga el hilo"""
+        while not self._detener.is_set():
+            memoria = memoria_procesos(self.pid)
+            if memoria is not None:
+                self.maximo = max(self.maximo or 0, memoria)
+            self._detener.wait(self._intervalo)
+
+    def detener(self):
+        """Detiene las mediciones"""
+        self._detener.set()
+        self.join()
+
+
+def ejecutar_prueba(
+    feed_size=200,
+    latencia=0.2,
+    variacion=0.1,
+    tasa_error=0.0,
+    tasa_saturacion=0.0,
+    navegacion="click",
+    pausa_min=0.2,
+    pausa_max=5,
+    driver_path=None,
+    headless=True,
+):
+    """Función que ejecuta el scraper de principio a fin contra el servidor de prueba y mide su rendimiento
+
+    Args:
+        feed_size (int, optional): Cantidad de publicaciones del día en el feed. Defaults to 200.
+        latencia (float, optional): Segundos de espera de cada respuesta del servidor. Defaults to 0.2.
+        variacion (float, optional): Segundos máximos que se suman al azar a la latencia. Defaults to 0.1.
+        tasa_error (float, optional): Proporción de publicaciones que se responden sin información. Defaults to 0.0.
+        tasa_saturacion (float, optional): Proporción de consultas a graphql que se responden con 429. Defaults to 0.0.
+        navegacion (str, optional): Forma de abrir las publicaciones, click o url. Defaults to "click".
+        pausa_min (float, optional): Pausa mínima entre publicaciones en segundos. Defaults to 0.2.
+        pausa_max (float, optional): Pausa máxima entre publicaciones en segundos. Defaults to 5.
+        driver_path (str, optional): Ruta del chromedriver. Si es None se descarga con ChromeDriverManager. Defaults to None.
+        headless (bool, optional): Indica si el navegador se ejecuta sin interfaz gráfica. Defaults to True.
+
+    Returns:
+        dict: Parámetros y resultados de la prueba
+    """
+    mock = MockMarketplace(feed_size, latencia, variacion, tasa_error, tasa_saturacion)
+    url = mock.iniciar()
+    scraper = None
+    monitor = None
+    try:
+        scraper = ScraperFb(
+            headless,
+            driver_path=driver_path,
+            ritmo=ControladorRitmo(
+                pausa=pausa_min, pausa_min=pausa_min, pausa_max=pausa_max
+            ),
+            navegacion=navegacion,
+            espera_reintento=1,
+            url_base=url,
+        )
+        monitor = MonitorMemoria(scraper.pid)
+        monitor.start()
+        scraper.iniciar_sesion("mock@example.com", "mock")
+        inicio = time()
+        scraper.mapear_datos(url + "marketplace/category/apparel/")
+        duracion = time() - inicio
+
+        tiempo = scraper.tiempo
+        tiempo.cantidad = len(scraper.data.dataset["enlace"])
+        tiempo.set_param_final()
+        analizadas = tiempo.cantidad_real + (tiempo.num_error or 0)
+        return {
+            "fecha": strftime("%d/%m/%Y %H:%M:%S"),
+            "feed_size": feed_size,
+            "latencia": latencia,
+            "tasa_error": tasa_error,
+            "tasa_saturacion": tasa_saturacion,
+            "navegacion": navegacion,
+            "extraidas": tiempo.cantidad,
+            "analizadas": analizadas,
+            "errores": tiempo.num_error,
+            "tasa_error_scraper": (
+                round((tiempo.num_error or 0) / analizadas, 3) if analizadas else 0.0
+            ),
+            "reintentos": tiempo.reintentos,
+            "recuperados": tiempo.recuperados,
+            "tiempo_inicio_seg": tiempo.tiempo_inicio,
+            "duracion_seg": round(duracion, 2),
+            "productos_por_min": tiempo.productos_por_min,
+            "productos_por_min_extraccion": (
+                round(tiempo.cantidad / (duracion / 60), 2) if duracion else 0.0
+            ),
+            "pausa_final": round(scraper.ritmo.pausa, 2),
+            "memoria_navegador_max_mb": monitor.maximo,
+            # En linux ru_maxrss está en KB
+            "memoria_python_max_mb": (
+                round(getrusage(RUSAGE_SELF).ru_maxrss / 1024, 1) if getrusage else None
+            ),
+            "servidor": mock.estadisticas,
+        }
+    finally:
+        if monitor:
+            monitor.detener()
+        if scraper:
+            scraper.cerrar()
+        mock.detener()
+
+
+def guardar_resultado(resultado, filename):
+    """Función que agrega el resultado de una prueba a un archivo jsonl para comparar entre versiones
+
+    Args:
+        resultado (dict): Resultado de ejecutar_prueba
+        filename (str): Ruta del archivo jsonl
+    """
+    with open(filename, "a", encoding="utf-8") as file:
+        file.write(dumps(resultado, ensure_ascii=False) + "\n")
+    log(INFO, f"Resultado agregado a {filename}")
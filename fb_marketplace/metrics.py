@@ -0,0 +1,37 @@
+from csv import writer
+from logging import ERROR, INFO, log
+from os import path
+
+
+def exportar_tiempos(filename, sheet_name, output_filename):
+    """Exporta las mediciones de ejecución del scraper guardadas en el archivo excel de tiempos a un archivo csv
+
+    Args:
+        filename (str): Nombre del archivo excel de tiempos
+        sheet_name (str): Nombre de la hoja de cálculo
+        output_filename (str): Nombre del archivo csv a generar
+
+    Returns:
+        int: Cantidad de ejecuciones exportadas
+    """
+    # openpyxl solo se importa cuando se exportan las mediciones
+    from openpyxl import load_workbook
+
+    if not path.isfile(filename):
+        log(ERROR, f"El archivo {filename} no existe")
+        return 0
+
+    tiempos = load_workbook(filename, read_only=True)
+    try:
+        if sheet_name not in tiempos.sheetnames:
+            log(ERROR, f"La hoja {sheet_name} no existe en el archivo {filename}")
+            return 0
+        rows = list(tiempos[sheet_name].iter_rows(values_only=True))
+    finally:
+        tiempos.close()
+
+    with open(output_filename, "w", newline="", encoding="utf-8-sig") as file:
+        writer(file, delimiter=";").writerows(rows)
+    cantidad = max(len(rows) - 1, 0)
+    log(INFO, f"{cantidad} ejecuciones exportadas a {output_filename}")
+    return cantidad
@@ -0,0 +1,410 @@
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from logging import DEBUG, INFO, log
+from random import Random
+from re import compile
+from threading import Lock, Thread
+from time import sleep, time
+from urllib.parse import parse_qs, urlparse
+
+# Clase del enlace que el scraper espera encontrar al iniciar sesión
+CLASE_INICIO = "x1i10hfl x1qjc9v5 xjbqb8w xjqpnuy xa49m3k xqeqjp1 x2hbi6w x13fuv20 xu3j5b3 x1q0q8m5 x26u7qi x972fbf xcfux6l x1qhh985 xm0m39n x9f619 x1ypdohk xdl72j9 x2lah0s xe8uvvx xdj266r x11i5rnm xat24cr x1mh8g0r x2lwn1j xeuugli xexx8yu x4uap5 x18d9i69 xkhd6sd x1n2onr6 x16tdsg8 x1hl2dhg xggy1nq x1ja2u2z x1t137rt x1o1ewxj x3x9cwd x1e5q0jg x13rtm0m x1q0g3np x87ps6o x1lku1pv x1rg5ohu x1a2a7pz x1hc1fzr x1k90msu x6o7n8i xbxq160"
+# Clase de la imagen que el scraper espera encontrar en el detalle de una publicación
+CLASE_IMAGEN = "x5yr21d xl1xv1r xh8yej3"
+IMAGEN = "data:image/gif;base64,R0lGODlhAQABAAAAACw="
+# Primer id de las publicaciones del feed
+ID_BASE = 10**15
+ITEM = compile(r"^/marketplace/item/(\d+)/?$")
+PRENDAS = ["Polo", "Casaca", "Pantalón", "Vestido", "Blusa", "Short", "Chompa", "Falda"]
+MARCAS = ["Adidas", "Nike", "Zara", "H&M", "Topitop", "Puma", "Levi's", "Sin marca"]
+ESTADOS = ["nuevo", "usado", "seminuevo", "con etiqueta"]
+TALLAS = ["S", "M", "L", "XL"]
+DISTRITOS = ["Miraflores", "San Isidro", "Surco", "Lince", "Breña", "Comas", "Ate"]
+
+PAGINA_LOGIN = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Facebook</title></head>
+<body>
+<form method="post" action="/login">
+<input id="email" name="email" type="text">
+<input id="pass" name="pass" type="password">
+<button name="login" type="submit">Iniciar sesión</button>
+</form>
+</body></html>"""
+
+PAGINA_INICIO = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Facebook</title></head>
+<body><a class="{CLASE_INICIO}" href="/marketplace/">Marketplace</a></body></html>"""
+
+# El feed funciona como el de facebook: las publicaciones se cargan al hacer scroll y el detalle se
+# abre sin recargar la página, con una consulta a graphql y el historial del navegador
+PAGINA_FEED = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Marketplace</title>
+<style>
+#feed {{display: grid; grid-template-columns: repeat(4, 220px); gap: 8px}}
+#feed a {{display: block; height: 280px; border: 1px solid #ddd}}
+</style></head>
+<body>
+<div id="feed"></div>
+<div id="detalle"></div>
+<script>
+const feed = document.getElementById("feed");
+const detalle = document.getElementById("detalle");
+let cursor = 0, cargando = false, fin = false;
+async function cargar() {{
+    if (cargando || fin) return;
+    cargando = true;
+    const tiles = await (await fetch("/api/feed?desde=" + cursor)).json();
+    fin = tiles.length === 0;
+    for (const tile of tiles) {{
+        const enlace = document.createElement("a");
+        enlace.href = "/marketplace/item/" + tile.id + "/";
+        enlace.innerText = tile.precio + "\\n" + tile.titulo + "\\n" + tile.locacion;
+        feed.appendChild(enlace);
+    }}
+    cursor += tiles.length;
+    cargando = false;
+}}
+async function abrir(id) {{
+    feed.style.display = "none";
+    await (await fetch("/api/graphql/", {{method: "POST", body: "doc_id=detalle&id=" + id}})).text();
+    if (location.pathname.includes(id)) {{
+        detalle.innerHTML = '<img class="{CLASE_IMAGEN}" src="{IMAGEN}">';
+    }}
+}}
+document.addEventListener("click", (evento) => {{
+    const enlace = evento.target.closest('a[href*="/marketplace/item/"]');
+    if (!enlace) return;
+    evento.preventDefault();
+    history.pushState({{}}, "", enlace.getAttribute("href"));
+    abrir(enlace.getAttribute("href").match(/item\\/(\\d+)/)[1]);
+}});
+window.addEventListener("popstate", () => {{
+    detalle.innerHTML = "";
+    feed.style.display = "";
+}});
+window.addEventListener("scroll", () => {{
+    if (innerHeight + scrollY >= document.body.scrollHeight - 400) cargar();
+}});
+cargar();
+</script>
+</body></html>"""
+
+PAGINA_DETALLE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Marketplace</title></head>
+<body>
+<img class="{clase}" src="{imagen}">
+<script type="application/json">{datos}</script>
+</body></html>"""
+
+
+class ManejadorMock(BaseHTTPRequestHandler):
+    """Responde las peticiones al servidor de prueba de facebook marketplace"""
+
+    def do_GET(self):
+        """Responde la página de inicio, el feed, el detalle de una publicación y las páginas del feed"""
+        mock = self.server.mock
+        url = urlparse(self.path)
+        if url.path == "/":
+            sesion = "c_user=" in self.headers.get("Cookie", "")
+            self.responder(200, PAGINA_INICIO if sesion else PAGINA_LOGIN)
+        elif url.path == "/api/feed":
+            desde = int(parse_qs(url.query).get("desde", ["0"])[0])
+            mock.esperar()
+            mock.contar("feed")
+            self.responder(200, dumps(mock.tiles(desde)), "application/json")
+        elif ITEM.match(url.path):
+            numero = int(ITEM.match(url.path).group(1)) - ID_BASE
+            mock.esperar()
+            mock.contar("detalles")
+            dato = {"target": mock.payload(numero)}
+            if mock.inyectar_error():
+                dato = {}
+            datos = dumps({"require": [{"marketplace_product_details_page": dato}]})
+            self.responder(
+                200,
+                PAGINA_DETALLE.format(
+                    clase=CLASE_IMAGEN,
+                    imagen=IMAGEN,
+                    datos=datos.replace("</", "<\\/"),
+                ),
+            )
+        elif url.path.startswith("/marketplace"):
+            self.responder(200, PAGINA_FEED)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        """Responde el inicio de sesión y las consultas a graphql"""
+        mock = self.server.mock
+        longitud = int(self.headers.get("Content-Length", "0"))
+        cuerpo = parse_qs(self.rfile.read(longitud).decode("utf-8"))
+        url = urlparse(self.path)
+        if url.path == "/login":
+            self.send_response(302)
+            self.send_header("Set-Cookie", "c_user=1; Path=/")
+            self.send_header("Location", "/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif url.path.startswith("/api/graphql"):
+            mock.esperar()
+            mock.contar("graphql")
+            if mock.saturar():
+                self.responder(429, dumps({"error": "rate limit"}), "application/json")
+                return
+            dato = {"target": mock.payload(int(cuerpo.get("id", ["0"])[0]) - ID_BASE)}
+            if mock.inyectar_error():
+                dato = {}
+            respuesta = {"data": {"viewer": {"marketplace_product_details_page": dato}}}
+            self.responder(
+                200,
+                dumps(respuesta, ensure_ascii=False, separators=(",", ":")),
+                "application/json",
+            )
+        else:
+            self.send_error(404)
+
+    def responder(self, estado, contenido, tipo="text/html"):
+        """Envía una respuesta con su contenido
+
+        Args:
+            estado (int): Código de estado http
+            contenido (str): Contenido de la respuesta
+            tipo (str, optional): Tipo de contenido. Defaults to "text/html".
+        """
+        cuerpo = contenido.encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        """Envía las peticiones a los registros de ejecución en lugar de la consola"""
+        log(DEBUG, "Mock: " + format % args)
+
+
+class MockMarketplace:
+    """Representa a un servidor local que imita a facebook marketplace para medir el scraper sin usar facebook
+
+    Tiene una página de inicio de sesión con los campos #email y #pass, un feed que carga las
+    publicaciones al hacer scroll y abre su detalle con una consulta a graphql, y la página del
+    detalle de cada publicación con su json incrustado. Las publicaciones del feed son de hoy,
+    salvo la última, que es de ayer para que el scraper se detenga.
+
+    Attributes:
+        feed_size (int): Cantidad de publicaciones del día en el feed
+        latencia (float): Segundos de espera de cada respuesta del feed y del detalle
+        variacion (float): Segundos máximos que se suman al azar a la latencia
+        tasa_error (float): Proporción de publicaciones que se responden sin información
+        tasa_saturacion (float): Proporción de consultas a graphql que se responden con 429
+        pagina (int): Cantidad de publicaciones que carga el feed en cada scroll
+        estadisticas (dict): Cantidad de peticiones atendidas y de errores inyectados
+    """
+
+    def __init__(
+        self,
+        feed_size=200,
+        latencia=0.2,
+        variacion=0.1,
+        tasa_error=0.0,
+        tasa_saturacion=0.0,
+        pagina=24,
+        semilla=1,
+    ):
+        """Genera todos los atributos para una instancia de la clase MockMarketplace
+
+        Args:
+            feed_size (int, optional): Cantidad de publicaciones del día en el feed. Defaults to 200.
+            latencia (float, optional): Segundos de espera de cada respuesta. Defaults to 0.2.
+            variacion (float, optional): Segundos máximos que se suman al azar a la latencia. Defaults to 0.1.
+            tasa_error (float, optional): Proporción de publicaciones que se responden sin información. Defaults to 0.0.
+            tasa_saturacion (float, optional): Proporción de consultas a graphql que se responden con 429. Defaults to 0.0.
+            pagina (int, optional): Cantidad de publicaciones que carga el feed en cada scroll. Defaults to 24.
+            semilla (int, optional): Semilla de los errores inyectados y de la latencia. Defaults to 1.
+        """
+        self._feed_size = feed_size
+        self._latencia = latencia
+        self._variacion = variacion
+        self._tasa_error = tasa_error
+        self._tasa_saturacion = tasa_saturacion
+        self._pagina = pagina
+        self._random = Random(semilla)
+        self._lock = Lock()
+        self._servidor = None
+        self._estadisticas = {
+            "feed": 0,
+            "detalles": 0,
+            "graphql": 0,
+            "errores_inyectados": 0,
+            "saturaciones": 0,
+        }
+        # Las publicaciones se reparten entre la medianoche y el momento en que inicia el servidor
+        ahora = int(time())
+        medianoche = int(
+            datetime.now()
+            .replace(hour=0, minute=0, second=0, microsecond=0)
+            .timestamp()
+        )
+        self._ahora = ahora
+        self._espacio = max(min(60, (ahora - medianoche) // (feed_size + 1)), 0)
+        self._medianoche = medianoche
+
+    @property
+    def feed_size(self):
+        """Retorna el valor actual del atributo feed_size"""
+        return self._feed_size
+
+    @property
+    def estadisticas(self):
+        """Retorna una copia del atributo estadisticas"""
+        with self._lock:
+            return dict(self._estadisticas)
+
+    def contar(self, campo):
+        """Suma una petición atendida a las estadísticas
+
+        Args:
+            campo (str): Tipo de petición
+        """
+        with self._lock:
+            self._estadisticas[campo] += 1
+
+    def esperar(self):
+        """Espera la latencia configurada más una variación al azar"""
+        with self._lock:
+            espera = self._latencia + self._random.uniform(0, self._variacion)
+        sleep(espera)
+
+    def inyectar_error(self):
+        """Indica si la respuesta actual debe llegar sin la información de la publicación"""
+        with self._lock:
+            error = self._random.random() < self._tasa_error
+            self._estadisticas["errores_inyectados"] += error
+        return error
+
+    def saturar(self):
+        """Indica si la respuesta actual debe ser una señal de saturación"""
+        with self._lock:
+            saturada = self._random.random() < self._tasa_saturacion
+            self._estadisticas["saturaciones"] += saturada
+        return saturada
+
+    def tiles(self, desde):
+        """Retorna las publicaciones del feed que se cargan en un scroll
+
+        Args:
+            desde (int): Posición de la primera publicación
+
+        Returns:
+            list: Lista con el id, el precio, el título y la locación de cada publicación
+        """
+        tiles = []
+        for numero in range(desde, min(desde + self._pagina, self._feed_size + 1)):
+            payload = self.payload(numero)
+            tiles.append(
+                {
+                    "id": payload["id"],
+                    "precio": "S/ " + payload["listing_price"]["amount"].split(".")[0],
+                    "titulo": payload["marketplace_listing_title"],
+                    "locacion": payload["location_text"]["text"],
+                }
+            )
+        return tiles
+
+    def payload(self, numero):
+        """Retorna la información de una publicación con la misma estructura que la de graphql
+
+        Args:
+            numero (int): Posición de la publicación en el feed
+
+        Returns:
+            dict: Información de la publicación
+        """
+        # Cada publicación siempre tiene la misma información
+        aleatorio = Random(numero)
+        prenda = aleatorio.choice(PRENDAS)
+        marca = aleatorio.choice(MARCAS)
+        talla = aleatorio.choice(TALLAS)
+        distrito = aleatorio.choice(DISTRITOS)
+        vendedor = aleatorio.randrange(1, 1 + max(self._feed_size // 4, 1))
+        precio = aleatorio.randrange(10, 400)
+        if numero < self._feed_size:
+            creacion = self._ahora - (numero + 1) * self._espacio
+        else:
+            # La última publicación es de ayer
+            creacion = self._medianoche - 3600
+        return {
+            "__typename": "GroupCommerceProductItem",
+            "id": str(ID_BASE + numero),
+            "marketplace_listing_title": f"{prenda} {marca} talla {talla}",
+            "creation_time": creacion,
+            "delivery_types": [aleatorio.choice(["IN_PERSON", "SHIPPING_ONSITE"])],
+            "redacted_description": {
+                "text": f"{prenda} {marca} {aleatorio.choice(ESTADOS)}, talla {talla}. "
+                f"Entrega en {distrito}. Consultas por interno."
+            },
+            "is_live": True,
+            "is_sold": False,
+            "is_pending": False,
+            "listing_inventory_type": "SINGLE",
+            "listing_price": {
+                "amount": f"{precio}.00",
+                "currency": "PEN",
+                "amount_with_offset_in_currency": str(precio * 100),
+                "formatted_amount": f"S/{precio}",
+            },
+            "location": {
+                "latitude": round(-12.1 + aleatorio.uniform(-0.1, 0.1), 6),
+                "longitude": round(-77.03 + aleatorio.uniform(-0.1, 0.1), 6),
+            },
+            "location_text": {"text": f"{distrito}, LIM"},
+            "location_vanity_or_id": str(100000000000000 + vendedor),
+            "marketplace_listing_seller": {
+                "__typename": "User",
+                "id": str(ID_BASE * 10 + vendedor),
+                "join_time": 1262304000 + vendedor * 86400,
+                "name": f"Vendedor {vendedor}",
+            },
+            "story": {
+                "actors": [
+                    {
+                        "__typename": "User",
+                        "id": str(ID_BASE * 10 + vendedor),
+                        "name": f"Vendedor {vendedor}",
+                    }
+                ],
+                "url": f"https://www.facebook.com/marketplace/item/{ID_BASE + numero}/",
+            },
+            "listing_photos": [
+                {
+                    "id": str(ID_BASE * 100 + numero * 10 + foto),
+                    "image": {"uri": IMAGEN},
+                }
+                for foto in range(aleatorio.randrange(1, 6))
+            ],
+        }
+
+    def iniciar(self, puerto=0):
+        """Inicia el servidor en un hilo
+
+        Args:
+            puerto (int, optional): Puerto local del servidor. Si es 0 se usa un puerto libre. Defaults to 0.
+
+        Returns:
+            str: Url de la página de inicio del servidor
+        """
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", puerto), ManejadorMock)
+        self._servidor.daemon_threads = True
+        self._servidor.mock = self
+        Thread(target=self._servidor.serve_forever, name="Mock", daemon=True).start()
+        url = f"http://127.0.0.1:{self._servidor.server_address[1]}/"
+        log(INFO, f"Servidor de prueba en {url}")
+        return url
+
+    def detener(self):
+        """Detiene el servidor"""
+        if self._servidor:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
@@ -0,0 +1,1702 @@
+# Importación de librerías
+from logging import (
+    basicConfig,
+    ERROR,
+    INFO,
+    log,
+    StreamHandler,
+)
+from glob import glob
+from hashlib import sha1
+from inspect import getsource, isclass, iscode, isfunction
+from io import BytesIO
+from json import dump, load
+from os import listdir, makedirs, path, remove, replace, stat, utime
+from re import escape
+from pandas import (
+    api,
+    concat,
+    DataFrame,
+    ExcelWriter,
+    MultiIndex,
+    notna,
+    read_csv,
+    read_excel,
+    read_feather,
+    Series,
+    to_datetime,
+    to_numeric,
+    to_timedelta,
+)
+
+# Carpeta y tamaño máximo en bytes de la caché de los archivos leídos
+CACHE_FOLDER = "Cache"
+CACHE_MAX_SIZE = 2 * 1024**3
+
+# Valores que representan a un dato nulo dentro de los archivos a procesar
+NULL_VALUES = ["undefined", "null", "-"]
+
+# Prefijos de moneda que acompañan a los precios (S/. 35, US$ 10, PEN 20, ...)
+CURRENCY_PREFIX = r"^(?:S/\.?|US\$|\$|€|PEN|USD)\s*"
+
+# Esquemas de lectura de cada página
+#   usecols: Columnas a leer del archivo (None lee todas las columnas)
+#   dtype: Tipo de dato de cada columna, incluidas las columnas categóricas y booleanas
+#   dates: Columnas de fechas con el formato (format) o la unidad epoch (unit) a usar
+#   bool_labels: Etiquetas con las que se guardan los valores True y False
+#   watermark: Columna creciente usada para detectar las filas nuevas de un archivo reescrito
+#   key: Columnas que identifican a un registro entre distintas ejecuciones
+SCHEMA_DESPEGAR = {
+    "usecols": None,
+    "dtype": {
+        "Escalas": "Int8",
+        "Precio": "str",
+        "Costo cancelacion 1": "float64",
+        "Costo cambios 1": "float64",
+        "Costo cancelacion 2": "float64",
+        "Costo cambios 2": "float64",
+        "Mochila o cartera": "boolean",
+        "Equipaje de mano": "boolean",
+        "Equipaje para documentar": "boolean",
+        "Cancelacion 1": "boolean",
+        "Cambios 1": "boolean",
+        "Cancelacion 2": "boolean",
+        "Cambios 2": "boolean",
+    },
+    "dates": {},
+    "bool_labels": ("VERDADERO", "FALSO"),
+    "watermark": None,
+    "key": None,
+}
+SCHEMA_FACEBOOK = {
+    "usecols": [
+        "Fecha Extraccion",
+        "titulo_marketplace",
+        "tiempo_creacion",
+        "tipo_delivery",
+        "descripcion",
+        "disponible",
+        "vendido",
+        "fecha_union_vendedor",
+        "cantidad",
+        "precio",
+        "tipo_moneda",
+        "amount_with_concurrency",
+        "latitud",
+        "longitud",
+        "locacion",
+        "locacion_id",
+        "name_vendedor",
+        "tipo_vendedor",
+        "id_vendedor",
+        "enlace",
+    ],
+    "dtype": {
+        "tipo_delivery": "category",
+        "disponible": "boolean",
+        "vendido": "boolean",
+        "cantidad": "category",
+        "tipo_moneda": "category",
+        "tipo_vendedor": "category",
+    },
+    "dates": {
+        "Fecha Extraccion": {"format": "%d/%m/%Y"},
+        "tiempo_creacion": {"unit": "s"},
+        "fecha_union_vendedor": {"unit": "s"},
+    },
+    "bool_labels": None,
+    "watermark": "tiempo_creacion",
+    "key": ["enlace"],
+}
+# Archivos de errores (fb_error_*.xlsx) que guarda el scraper en cada ejecución
+SCHEMA_ERRORS = {
+    "usecols": ["Clase", "Mensaje", "Linea de Error", "Codigo Error", "Publicacion"],
+    "dtype": {
+        "Clase": "category",
+        "Linea de Error": "Int32",
+        "Codigo Error": "category",
+    },
+    "dates": {},
+    "bool_labels": None,
+    "watermark": None,
+    "key": None,
+}
+# Hojas del archivo de tiempos (Tiempos.xlsx) con una fila por ejecución del scraper
+SCHEMA_TIMINGS = {
+    "usecols": [
+        "Fecha",
+        "Hora Inicio",
+        "Hora Fin",
+        "Cantidad",
+        "Cantidad Real",
+        "Tiempo Ejecucion (min)",
+        "Categorias / Minuto",
+        "Categorias / Minuto real",
+        "Errores",
+        "Tiempo Inicio (seg)",
+        "Reintentos",
+        "Recuperados",
+    ],
+    "dtype": {
+        "Cantidad": "Int64",
+        "Cantidad Real": "Int64",
+        "Categorias / Minuto": "float64",
+        "Categorias / Minuto real": "float64",
+        "Errores": "Int64",
+        "Tiempo Inicio (seg)": "float64",
+        "Reintentos": "Int64",
+        "Recuperados": "Int64",
+    },
+    "dates": {"Fecha": {"format": "%d/%m/%Y"}},
+    "bool_labels": None,
+    "watermark": None,
+    "key": None,
+}
+
+
+def read_dataset(
+    filename, sep=";", encoding="utf-8", decimal=".", schema=None, cache_folder=None
+):
+    """
+    Función que lee un archivo csv o excel y devuelve un DataFrame (pandas.core.frame.DataFrame)
+    con los tipos de datos declarados en el esquema. Si se indica una carpeta de caché, el
+    DataFrame se guarda en formato feather y se reutiliza mientras el archivo no cambie
+        Parameter:
+                filename (str): Ruta del archivo
+                sep (str): Separador de las columnas
+                encoding (str): Codificación en la que fue guardado el archivo
+                decimal (str): Separador decimal
+                schema (dict): Esquema de lectura de la página (SCHEMA_DESPEGAR, SCHEMA_FACEBOOK, ...)
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    if not cache_folder:
+        return parse_dataset(filename, sep, encoding, decimal, schema)
+
+    cache_filename = get_cache_filename(
+        filename, cache_folder, (sep, encoding, decimal, schema)
+    )
+    if path.isfile(cache_filename):
+        # Actualizar la fecha de uso del archivo para el desalojo de la caché
+        utime(cache_filename)
+        return read_feather(cache_filename)
+
+    data = parse_dataset(filename, sep, encoding, decimal, schema)
+    write_cache(data, cache_filename)
+    return data
+
+
+def parse_dataset(
+    filename, sep=";", encoding="utf-8", decimal=".", schema=None, **options
+):
+    """
+    Función que interpreta un archivo csv o excel y devuelve un DataFrame (pandas.core.frame.DataFrame)
+    con los tipos de datos declarados en el esquema
+        Parameter:
+                filename (str | io.BytesIO): Ruta del archivo o contenido de un archivo csv
+                sep (str): Separador de las columnas
+                encoding (str): Codificación en la que fue guardado el archivo
+                decimal (str): Separador decimal
+                schema (dict): Esquema de lectura de la página
+                options (dict): Opciones adicionales para la lectura de archivos csv (header, names, ...)
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    schema = schema or {}
+    if isinstance(filename, str) and filename.endswith(".xlsx"):
+        # openpyxl entrega valores ya tipados, por lo que los tipos se aplican luego de leer
+        data = read_excel(filename, usecols=schema.get("usecols"))
+        data = change_datatype(data, schema.get("dtype", {}))
+    else:
+        data = read_csv(
+            filename,
+            sep=sep,
+            encoding=encoding,
+            decimal=decimal,
+            usecols=schema.get("usecols"),
+            dtype=schema.get("dtype"),
+            na_values=NULL_VALUES,
+            **options,
+        )
+    return apply_schema(data, schema)
+
+
+def get_cache_filename(filename, cache_folder, options):
+    """
+    Función que retorna la ruta del archivo de caché que corresponde a un archivo leído. La clave
+    depende de la ruta, fecha de modificación y tamaño del archivo y de las opciones de lectura
+        Parameter:
+                filename (str): Ruta del archivo
+                cache_folder (str): Carpeta de la caché
+                options (tuple): Opciones de lectura del archivo
+        Returns:
+                str
+    """
+    file_stat = stat(filename)
+    key = repr(
+        (path.abspath(filename), file_stat.st_mtime_ns, file_stat.st_size, options)
+    )
+    return path.join(cache_folder, sha1(key.encode("utf-8")).hexdigest() + ".feather")
+
+
+def write_cache(df_data, cache_filename, max_size=CACHE_MAX_SIZE):
+    """
+    Función que guarda un DataFrame (pandas.core.frame.DataFrame) en la caché y desaloja los
+    archivos menos usados cuando la caché supera el tamaño máximo
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                cache_filename (str): Ruta del archivo de caché
+                max_size (int): Tamaño máximo de la caché en bytes
+        Returns:
+                None
+    """
+    cache_folder = path.dirname(cache_filename)
+    makedirs(cache_folder, exist_ok=True)
+    temp_filename = cache_filename + ".tmp"
+    try:
+        df_data.to_feather(temp_filename)
+    except (NotImplementedError, TypeError, ValueError) as error:
+        # Columnas con tipos mixtos no se pueden guardar en formato feather
+        log(ERROR, f"No se pudo guardar el archivo en la caché: {error}")
+        if path.isfile(temp_filename):
+            remove(temp_filename)
+        return
+    replace(temp_filename, cache_filename)
+    evict_cache(cache_folder, max_size)
+
+
+def evict_cache(cache_folder, max_size=CACHE_MAX_SIZE):
+    """
+    Función que elimina los archivos de la caché usados hace más tiempo hasta que el tamaño
+    total de la caché no supere el tamaño máximo
+        Parameter:
+                cache_folder (str): Carpeta de la caché
+                max_size (int): Tamaño máximo de la caché en bytes
+        Returns:
+                None
+    """
+    cache_files = [
+        path.join(cache_folder, name)
+        for name in listdir(cache_folder)
+        if name.endswith(".feather")
+    ]
+    cache_files.sort(key=path.getmtime)
+    total_size = sum(path.getsize(cache_file) for cache_file in cache_files)
+    for cache_file in cache_files:
+        if total_size <= max_size:
+            break
+        total_size -= path.getsize(cache_file)
+        remove(cache_file)
+        log(INFO, f"Archivo eliminado de la caché: {cache_file}")
+
+
+def apply_schema(df_data, schema):
+    """
+    Función que convierte las columnas de fechas y reduce el tamaño de las columnas enteras
+    de un DataFrame (pandas.core.frame.DataFrame) de acuerdo al esquema
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                schema (dict): Esquema de lectura de la página
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    for column, options in schema.get("dates", {}).items():
+        df_data[[column]] = to_datetime_columns(
+            df_data, [column], options.get("unit"), options.get("format")
+        )
+    for column in df_data.columns:
+        if api.types.is_integer_dtype(df_data[column]):
+            df_data[column] = to_numeric(df_data[column], downcast="integer")
+    return df_data
+
+
+def write_dataset(
+    df_data, filename, schema=None, sep=";", encoding="utf-8-sig", append=False
+):
+    """
+    Función que guarda un DataFrame (pandas.core.frame.DataFrame) en un archivo csv. Recién
+    en este paso las columnas booleanas se convierten a las etiquetas indicadas en el esquema
+    y los valores nulos de las columnas tipadas se guardan como n.d.
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                filename (str): Ruta del archivo
+                schema (dict): Esquema de lectura de la página
+                sep (str): Separador de las columnas
+                encoding (str): Codificación en la que se guarda el archivo
+                append (bool): Indica si las filas se agregan al final de un archivo existente
+        Returns:
+                None
+    """
+    schema = schema or {}
+    labels = schema.get("bool_labels")
+    if labels:
+        bool_cols = [
+            column
+            for column, datatype in schema.get("dtype", {}).items()
+            if datatype == "boolean" and column in df_data.columns
+        ]
+        true_label, false_label = labels
+        df_data[bool_cols] = df_data[bool_cols].apply(
+            lambda values: values.map({True: true_label, False: false_label})
+        )
+    df_data.to_csv(
+        filename,
+        sep=sep,
+        index=False,
+        encoding=encoding,
+        na_rep="n.d.",
+        mode="a" if append else "w",
+        header=not append,
+    )
+
+
+def get_facebook_filenames(folder, prefix="fb_ropa"):
+    """
+    Función que retorna la lista de archivos diarios generados por el scraper de facebook marketplace
+        Parameter:
+                folder (str): Carpeta donde el scraper guarda las carpetas diarias (%d-%m-%Y)
+                prefix (str): Nombre con el que inician los archivos generados por el scraper
+        Returns:
+                list
+    """
+    return sorted(glob(path.join(folder, "*", prefix + "_*.xlsx")))
+
+
+def read_datasets(filenames, schema=None, cache_folder=None):
+    """
+    Función que lee un conjunto de archivos y los devuelve en un solo DataFrame
+    (pandas.core.frame.DataFrame)
+        Parameter:
+                filenames (list): Lista de rutas de los archivos
+                schema (dict): Esquema de lectura de la página
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    return concat_datasets(
+        [
+            read_dataset(filename, schema=schema, cache_folder=cache_folder)
+            for filename in filenames
+        ],
+        schema,
+    )
+
+
+def concat_datasets(datasets, schema=None):
+    """
+    Función que une una lista de DataFrames (pandas.core.frame.DataFrame) conservando las
+    columnas categóricas del esquema
+        Parameter:
+                datasets (list): Lista de DataFrames
+                schema (dict): Esquema de lectura de la página
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    data = concat(datasets, ignore_index=True)
+    # Al unir archivos con categorías distintas las columnas vuelven a ser de tipo object
+    category_cols = [
+        column
+        for column, datatype in (schema or {}).get("dtype", {}).items()
+        if datatype == "category" and column in data.columns
+    ]
+    data[category_cols] = change_datatype(data[category_cols], "category")
+    return data
+
+
+def get_new_filename(filename, sufix="depurado"):
+    """
+    Función que retorna el nuevo nombre del archivo
+        Parameter:
+                filename (str): Ruta del archivo
+                sufix (str): Identificador adicional que se agrega al final del nombre del archivo
+        Returns:
+                str
+    """
+    index = filename.rfind(".")
+    return filename[:index] + "_" + sufix + filename[index:]
+
+
+def drop_rows(df_data, index):
+    """
+    Función que elimina las filas de un DataFrame (pandas.core.frame.DataFrame) dado los índices
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                index (pandas.core.indexes.base.Index): Índice de las filas a eliminar
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    return df_data.drop(index)
+
+
+def replace_values(df_data, old_value, new_value=None, regex=False):
+    """
+    Función que reemplaza la información contenida dentro del DataFrame (pandas.core.frame.DataFrame)
+    por otro valor dado
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                old_value (str | list | dict): Valor(es) a ser reemplazado(s) o un diccionario
+                    de valores por columna ({columna: {valor: nuevo valor}})
+                new_value (str): Valor a reemplazar
+                regex (bool): Indica si en el reemplazo se hace uso de expresiones regulares
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    if isinstance(old_value, dict):
+        return df_data.replace(old_value, regex=regex)
+    return df_data.replace(old_value, new_value, regex=regex)
+
+
+def replace_null(df_data, new_value):
+    """
+    Función que reemplaza los valores nulos existentes en el DataFrame (pandas.core.frame.DataFrame)
+    por otro valor dado
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                new_value (str): Valor a reemplazar
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    return df_data.fillna(new_value)
+
+
+def change_datatype(df_data, datatype="int64"):
+    """
+    Función que cambia el tipo de dato de de las columnas de un DataFrame (pandas.core.frame.DataFrame)
+    por otro tipo de dato dado
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                datatype (str | dict): Nombre del tipo de dato que se usa para la conversión o
+                    un diccionario con el tipo de dato de cada columna
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    if isinstance(datatype, dict):
+        datatype = {
+            column: value for column, value in datatype.items() if column in df_data
+        }
+    return df_data.astype(datatype)
+
+
+def remove_punctuation(df_data, columns, punctuation="."):
+    """
+    Función que elimina el separador de miles contenidas en las columnas dadas de un DataFrame
+    (pandas.core.frame.DataFrame)
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                columns (list): Lista de columnas que contienen al separador de miles
+                punctuation (str): Separador de miles a ser removido
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    for column in columns:
+        index = df_data[
+            df_data[column].str.contains(r"[{0}]+".format(punctuation)) == True
+        ].index
+        num_values = df_data.loc[index, column].str.split(punctuation).str
+        df_data.loc[index, column] = num_values[0] + num_values[1].str.ljust(3, "0")
+
+    return df_data
+
+
+def fix_price(df_data, columns):
+    """
+    Función que corrige la información de algunos precios erróneos de los registros contenidos en el DataFrame
+    (pandas.core.frame.DataFrame)
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                columns (list): Lista de columnas que contienen al separador de miles
+                punctuation (str): Separador de miles a ser removido
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    for column in columns:
+        index = df_data[df_data[column] < 10].index
+        df_data.loc[index, column] = df_data.loc[index, column] * 1000
+    return df_data
+
+
+def get_final_price(df_data, price_name, tax_name):
+    """
+    Función que recalcula el precio final de todos los registros contenidos en el DataFrame
+    (pandas.core.frame.DataFrame)
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                columns (list): Lista de columnas que contienen al separador de miles
+                punctuation (str): Separador de miles a ser removido
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    return df_data[price_name] + df_data[tax_name]
+
+
+def to_datetime_columns(df_data, columns, unit=None, datetime_format=None):
+    """
+    Función que convierte las columnas dadas de un DataFrame (pandas.core.frame.DataFrame) a fechas.
+    Los valores que no se pueden convertir se reemplazan por NaT
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                columns (list): Lista de columnas a convertir
+                unit (str): Unidad de las fechas en formato epoch (s, ms, ...)
+                datetime_format (str): Formato de las fechas en formato texto
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    return df_data[columns].apply(
+        lambda values: (
+            values
+            if api.types.is_datetime64_any_dtype(values)
+            else to_datetime(values, unit=unit, format=datetime_format, errors="coerce")
+        )
+    )
+
+
+def to_numeric_columns(df_data, columns):
+    """
+    Función que convierte las columnas dadas de un DataFrame (pandas.core.frame.DataFrame) a números.
+    Se eliminan el prefijo de moneda, los separadores de miles y el texto antes y después del
+    número. Los valores que no se pueden convertir se reemplazan por NaN
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                columns (list): Lista de columnas a convertir
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    df_numeric = df_data[columns].copy()
+    for column in columns:
+        if df_numeric[column].dtype == object:
+            df_numeric[column] = (
+                df_numeric[column]
+                .astype(str)
+                .str.strip()
+                .str.replace(CURRENCY_PREFIX, "", case=False, regex=True)
+                .str.replace(r"(?<=\d)[,\s](?=\d{3}(?!\d))", "", regex=True)
+                .str.replace(r"^[^\d\-.]+|[^\d.]+$", "", regex=True)
+            )
+    return df_numeric.apply(to_numeric, errors="coerce")
+
+
+def drop_duplicates(df_data, columns, keep="last"):
+    """
+    Función que elimina los registros duplicados de un DataFrame (pandas.core.frame.DataFrame)
+        Parameter:
+                df_data (pandas.core.frame.DataFrame): DataFrame
+                columns (list): Lista de columnas que identifican de manera única a un registro
+                keep (str): Registro que se conserva entre los duplicados (first o last)
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    return df_data.drop_duplicates(subset=columns, keep=keep, ignore_index=True)
+
+
+class Pipeline:
+    """
+    Clase que registra las transformaciones de un DataFrame (pandas.core.frame.DataFrame) como un
+    plan perezoso. Al ejecutarse, el plan se optimiza: las eliminaciones de filas se adelantan
+    mientras no dependan de columnas modificadas antes, se unen en una sola máscara y los
+    reemplazos y cambios de tipo de dato contiguos se fusionan en una sola operación. El
+    DataFrame se copia una sola vez y los pasos siguientes solo modifican sus columnas.
+    Todas las transformaciones se aplican fila por fila, por lo que el orden de las
+    eliminaciones no altera el resultado
+        Attributes:
+                steps (list): Pasos registrados en el plan, en el orden en que fueron agregados
+    """
+
+    def __init__(self):
+        """Genera todos los atributos para una instancia de la clase Pipeline"""
+        self._steps = []
+
+    @property
+    def steps(self):
+        """Retorna el valor actual del atributo steps"""
+        return self._steps
+
+    def add_step(self, operation, reads, writes, **args):
+        """
+        Método que registra un paso en el plan
+            Parameter:
+                    operation (str): Nombre de la operación
+                    reads (list): Columnas que lee la operación
+                    writes (list): Columnas que modifica la operación
+                    args (dict): Argumentos de la operación
+            Returns:
+                    Pipeline
+        """
+        self._steps.append(
+            {
+                "operation": operation,
+                "reads": list(reads),
+                "writes": list(writes),
+                "args": args,
+            }
+        )
+        return self
+
+    def drop_rows(self, columns, condition):
+        """
+        Método que registra la eliminación de las filas que cumplen una condición
+            Parameter:
+                    columns (list): Columnas que usa la condición
+                    condition (function): Función que recibe el DataFrame y retorna una máscara
+                        booleana con las filas a eliminar
+            Returns:
+                    Pipeline
+        """
+        return self.add_step("drop_rows", columns, [], conditions=[condition])
+
+    def replace_values(self, columns, old_value, new_value=None, regex=False):
+        """
+        Método que registra el reemplazo de valores en las columnas dadas
+            Parameter:
+                    columns (list): Columnas donde se hace el reemplazo
+                    old_value (str | list): Valor(es) a ser reemplazado(s)
+                    new_value (str): Valor a reemplazar
+                    regex (bool): Indica si en el reemplazo se hace uso de expresiones regulares
+            Returns:
+                    Pipeline
+        """
+        if regex:
+            return self.add_step(
+                "replace_regex",
+                columns,
+                columns,
+                old_value=old_value,
+                new_value=new_value,
+            )
+        old_values = old_value if isinstance(old_value, list) else [old_value]
+        mapping = {
+            column: {value: new_value for value in old_values} for column in columns
+        }
+        return self.add_step("replace_values", columns, columns, mapping=mapping)
+
+    def replace_null(self, columns, new_value):
+        """
+        Método que registra el reemplazo de los valores nulos en las columnas dadas
+            Parameter:
+                    columns (list): Columnas donde se hace el reemplazo
+                    new_value (str): Valor a reemplazar
+            Returns:
+                    Pipeline
+        """
+        return self.add_step("replace_null", columns, columns, new_value=new_value)
+
+    def change_datatype(self, columns, datatype="int64"):
+        """
+        Método que registra el cambio de tipo de dato de las columnas dadas
+            Parameter:
+                    columns (list): Columnas a convertir
+                    datatype (str): Nombre del tipo de dato que se usa para la conversión
+            Returns:
+                    Pipeline
+        """
+        return self.add_step(
+            "change_datatype",
+            columns,
+            columns,
+            datatypes={column: datatype for column in columns},
+        )
+
+    def remove_punctuation(self, columns, punctuation="."):
+        """
+        Método que registra la eliminación del separador de miles de las columnas dadas
+            Parameter:
+                    columns (list): Columnas que contienen al separador de miles
+                    punctuation (str): Separador de miles a ser removido
+            Returns:
+                    Pipeline
+        """
+        return self.add_step(
+            "remove_punctuation", columns, columns, punctuation=punctuation
+        )
+
+    def fix_price(self, columns):
+        """
+        Método que registra la corrección de los precios erróneos de las columnas dadas
+            Parameter:
+                    columns (list): Columnas con precios
+            Returns:
+                    Pipeline
+        """
+        return self.add_step("fix_price", columns, columns)
+
+    def get_final_price(self, column, price_name, tax_name):
+        """
+        Método que registra el cálculo del precio final en la columna dada
+            Parameter:
+                    column (str): Columna donde se guarda el precio final
+                    price_name (str): Columna del precio
+                    tax_name (str): Columna del impuesto
+            Returns:
+                    Pipeline
+        """
+        return self.add_step(
+            "get_final_price",
+            [price_name, tax_name],
+            [column],
+            column=column,
+            price_name=price_name,
+            tax_name=tax_name,
+        )
+
+    def optimize(self):
+        """
+        Método que retorna el plan optimizado sin modificar los pasos registrados
+            Parameter:
+                    None
+            Returns:
+                    list
+        """
+        # Adelantar las eliminaciones de filas mientras sus columnas no hayan sido modificadas
+        steps = []
+        for step in self._steps:
+            position = len(steps)
+            if step["operation"] == "drop_rows":
+                while position > 0 and not set(step["reads"]) & set(
+                    steps[position - 1]["writes"]
+                ):
+                    position -= 1
+            steps.insert(position, step)
+
+        # Fusionar los pasos contiguos que se pueden ejecutar en una sola operación
+        plan = []
+        for step in steps:
+            previous = plan[-1] if plan else None
+            if previous is None or previous["operation"] != step["operation"]:
+                plan.append(step)
+            elif step["operation"] == "drop_rows":
+                plan[-1] = merge_steps(
+                    previous,
+                    step,
+                    conditions=previous["args"]["conditions"]
+                    + step["args"]["conditions"],
+                )
+            elif step["operation"] == "replace_values":
+                plan[-1] = merge_steps(
+                    previous,
+                    step,
+                    mapping=compose_mappings(
+                        previous["args"]["mapping"], step["args"]["mapping"]
+                    ),
+                )
+            elif step["operation"] == "change_datatype" and not set(
+                previous["writes"]
+            ) & set(step["writes"]):
+                plan[-1] = merge_steps(
+                    previous,
+                    step,
+                    datatypes={
+                        **previous["args"]["datatypes"],
+                        **step["args"]["datatypes"],
+                    },
+                )
+            else:
+                plan.append(step)
+        return plan
+
+    def explain(self):
+        """
+        Método que retorna una descripción del plan optimizado
+            Parameter:
+                    None
+            Returns:
+                    str
+        """
+        lines = ["Plan optimizado:"]
+        for number, step in enumerate(self.optimize(), start=1):
+            args = {
+                name: len(value) if name == "conditions" else value
+                for name, value in step["args"].items()
+            }
+            lines.append(
+                f"{number}. {step['operation']} columnas={step['reads'] or step['writes']} {args}"
+            )
+        return "\n".join(lines)
+
+    def run(self, df_data):
+        """
+        Método que ejecuta el plan optimizado sobre un DataFrame (pandas.core.frame.DataFrame)
+        sin modificar el DataFrame original
+            Parameter:
+                    df_data (pandas.core.frame.DataFrame): DataFrame
+            Returns:
+                    pandas.core.frame.DataFrame
+        """
+        plan = self.optimize()
+        if plan and plan[0]["operation"] == "drop_rows":
+            # La eliminación de filas genera la única copia del DataFrame
+            data = df_data
+        else:
+            data = df_data.copy()
+
+        for step in plan:
+            operation = step["operation"]
+            columns = step["writes"]
+            args = step["args"]
+            log(INFO, f"Ejecutando {operation} sobre {step['reads'] or columns}")
+            if operation == "drop_rows":
+                mask = args["conditions"][0](data)
+                for condition in args["conditions"][1:]:
+                    mask = mask | condition(data)
+                data = data[~mask].reset_index(drop=True)
+            elif operation == "replace_values":
+                data[columns] = replace_values(data[columns], args["mapping"])
+            elif operation == "replace_regex":
+                data[columns] = replace_values(
+                    data[columns], args["old_value"], args["new_value"], regex=True
+                )
+            elif operation == "replace_null":
+                data[columns] = replace_null(data[columns], args["new_value"])
+            elif operation == "change_datatype":
+                data[columns] = change_datatype(data[columns], args["datatypes"])
+            elif operation == "remove_punctuation":
+                data = remove_punctuation(data, columns, args["punctuation"])
+            elif operation == "fix_price":
+                data = fix_price(data, columns)
+            elif operation == "get_final_price":
+                data[args["column"]] = get_final_price(
+                    data, args["price_name"], args["tax_name"]
+                )
+        return data
+
+
+def merge_steps(previous, step, **args):
+    """
+    Función que une dos pasos contiguos de un plan (Pipeline) en un solo paso
+        Parameter:
+                previous (dict): Paso anterior
+                step (dict): Paso a unir
+                args (dict): Argumentos del paso resultante
+        Returns:
+                dict
+    """
+    return {
+        "operation": step["operation"],
+        "reads": list(dict.fromkeys(previous["reads"] + step["reads"])),
+        "writes": list(dict.fromkeys(previous["writes"] + step["writes"])),
+        "args": args,
+    }
+
+
+def compose_mappings(first, second):
+    """
+    Función que compone dos reemplazos por columna ({columna: {valor: nuevo valor}}) en uno
+    solo, equivalente a aplicar el primero y luego el segundo
+        Parameter:
+                first (dict): Primer reemplazo
+                second (dict): Segundo reemplazo
+        Returns:
+                dict
+    """
+    mapping = {}
+    for column in list(dict.fromkeys(list(first) + list(second))):
+        first_values = first.get(column, {})
+        second_values = second.get(column, {})
+        values = {
+            old_value: second_values.get(new_value, new_value)
+            for old_value, new_value in first_values.items()
+        }
+        for old_value, new_value in second_values.items():
+            values.setdefault(old_value, new_value)
+        mapping[column] = values
+    return mapping
+
+
+def process_data_general(data):
+    """
+    Función que procesa toda la data contenida en el DataFrame (pandas.core.frame.DataFrame)
+    sin importar de dónde proviene la data
+        Parameter:
+                data (pandas.core.frame.DataFrame): DataFrame
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    log(INFO, "Reemplazando valores nulos y sus variantes por n.d.")
+    # Solo las columnas de texto, las columnas tipadas conservan sus valores nulos
+    str_cols = data.select_dtypes(include="object").columns
+    data[str_cols] = replace_null(data[str_cols], "n.d.")
+    data[str_cols] = replace_values(data[str_cols], NULL_VALUES, "n.d.")
+    return data
+
+
+def process_data_despegar(data):
+    """
+    Función que procesa toda la data contenida en el DataFrame (pandas.core.frame.DataFrame)
+    que provenga de la página de despegar.com
+        Parameter:
+                data (pandas.core.frame.DataFrame): DataFrame
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    # Columnas a trabajar
+    stopover_cols = ["Escalas"]
+    price_col = "Precio"
+    price_cols = [
+        price_col,
+        "Impuesto",
+        "Precio Final",
+        "Costo cancelacion 1",
+        "Costo cambios 1",
+        "Costo cancelacion 2",
+        "Costo cambios 2",
+    ]
+    plan = (
+        Pipeline()
+        # Eliminar filas que no contengan información del precio
+        .drop_rows([price_col], lambda values: values[price_col] == "n.d.")
+        # Reemplazar escala 3 a 2
+        .replace_values(stopover_cols, 3, 2)
+        # Reemplazar puntos de las columnas relacionadas con el precio
+        .remove_punctuation([price_col])
+        # Cambiar tipo de dato para la columna Precio
+        .change_datatype(price_cols[:2])
+        # Corregir precios
+        .fix_price([price_col])
+        # Calcular los nuevos precios finales
+        .get_final_price(price_cols[2], *price_cols[:2])
+    )
+    log(INFO, plan.explain())
+    return plan.run(data)
+
+
+def process_data_facebook(data):
+    """
+    Función que procesa toda la data contenida en el DataFrame (pandas.core.frame.DataFrame)
+    que provenga de la página de facebook marketplace (archivos fb_ropa_*.xlsx del scraper)
+        Parameter:
+                data (pandas.core.frame.DataFrame): DataFrame
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    # Columnas a trabajar
+    extraction_col = "Fecha Extraccion"
+    link_col = "enlace"
+    epoch_cols = ["tiempo_creacion", "fecha_union_vendedor"]
+    price_cols = ["precio", "amount_with_concurrency"]
+    category_cols = ["tipo_moneda", "tipo_delivery", "tipo_vendedor"]
+    str_cols = ["titulo_marketplace", "descripcion", "locacion"]
+
+    log(INFO, "Eliminando filas que no contengan el enlace de la publicación")
+    data = drop_rows(data, data[data[link_col].isna()].index)
+
+    log(INFO, "Convirtiendo las fechas de las columnas")
+    # Las fechas ya vienen convertidas cuando se lee con SCHEMA_FACEBOOK
+    data[extraction_col] = to_datetime_columns(
+        data, [extraction_col], datetime_format="%d/%m/%Y"
+    )
+    data[epoch_cols] = to_datetime_columns(data, epoch_cols, unit="s")
+
+    log(INFO, "Eliminando publicaciones duplicadas")
+    # Se conserva la primera extracción de cada publicación, igual que en el procesamiento
+    # incremental, donde las publicaciones ya guardadas no se vuelven a agregar
+    data = data.sort_values(extraction_col, kind="stable")
+    data = drop_duplicates(data, [link_col], keep="first")
+
+    log(INFO, "Convirtiendo los precios a números")
+    data[price_cols] = to_numeric_columns(data, price_cols)
+
+    log(INFO, "Eliminando caracteres de salto de línea")
+    data[str_cols] = replace_values(data[str_cols], r"\r?\n", " ", regex=True)
+
+    log(INFO, "Cambiando tipo de dato de las columnas")
+    data[category_cols] = change_datatype(data[category_cols], "category")
+
+    return data
+
+
+def get_rules_version(rules, schema=None):
+    """
+    Función que retorna un identificador de las reglas de procesamiento. Se calcula con el código
+    de las funciones dadas, de las funciones y clases de este módulo que usan y del esquema, de
+    modo que cualquier cambio en las reglas genera un identificador distinto
+        Parameter:
+                rules (list): Funciones que procesan la data
+                schema (dict): Esquema de lectura de la página
+        Returns:
+                str
+    """
+    digest = sha1(repr(schema).encode("utf-8"))
+    pending = list(rules)
+    seen = set()
+    while pending:
+        rule = pending.pop(0)
+        if rule in seen:
+            continue
+        seen.add(rule)
+        digest.update(getsource(rule).encode("utf-8"))
+        if isclass(rule):
+            codes = [
+                value.__code__ for value in vars(rule).values() if isfunction(value)
+            ]
+        else:
+            codes = [rule.__code__]
+        while codes:
+            code = codes.pop(0)
+            codes.extend(const for const in code.co_consts if iscode(const))
+            for name in code.co_names:
+                value = globals().get(name)
+                is_rule = isfunction(value) or isclass(value)
+                if is_rule and value.__module__ == __name__:
+                    pending.append(value)
+    return digest.hexdigest()
+
+
+def load_watermarks(state_filename):
+    """
+    Función que lee las marcas de agua (watermarks) de un procesamiento incremental
+        Parameter:
+                state_filename (str): Ruta del archivo json con las marcas de agua
+        Returns:
+                dict
+    """
+    if not path.isfile(state_filename):
+        return {"rules_version": None, "sources": {}}
+    with open(state_filename, encoding="utf-8") as file:
+        return load(file)
+
+
+def save_watermarks(state, state_filename):
+    """
+    Función que guarda las marcas de agua (watermarks) de un procesamiento incremental
+        Parameter:
+                state (dict): Marcas de agua de cada archivo y versión de las reglas
+                state_filename (str): Ruta del archivo json con las marcas de agua
+        Returns:
+                None
+    """
+    temp_filename = state_filename + ".tmp"
+    with open(temp_filename, "w", encoding="utf-8") as file:
+        dump(state, file, indent=4)
+    replace(temp_filename, state_filename)
+
+
+def get_checksum(filename, offset, block_size=65536):
+    """
+    Función que retorna el hash del bloque de bytes que termina en la posición dada de un archivo.
+    Permite comprobar que la parte ya procesada del archivo no fue modificada
+        Parameter:
+                filename (str): Ruta del archivo
+                offset (int): Posición final del bloque
+                block_size (int): Tamaño del bloque en bytes
+        Returns:
+                str
+    """
+    with open(filename, "rb") as file:
+        file.seek(max(0, offset - block_size))
+        return sha1(file.read(min(offset, block_size))).hexdigest()
+
+
+def read_new_rows(
+    filename,
+    watermark=None,
+    sep=";",
+    encoding="utf-8",
+    decimal=".",
+    schema=None,
+    cache_folder=None,
+):
+    """
+    Función que lee solo las filas de un archivo que no fueron procesadas en la ejecución anterior.
+    Si el archivo no cambió no se lee; si es un csv al que solo se le agregaron filas se lee desde
+    la última posición procesada; en otro caso se lee completo y se filtran las filas cuya
+    columna de fecha watermark del esquema es mayor al último valor procesado. Si el archivo
+    fue reescrito y el esquema no tiene columna watermark, se retorna completo y se indica
+    que fue reescrito
+        Parameter:
+                filename (str): Ruta del archivo
+                watermark (dict): Marca de agua del archivo en la ejecución anterior
+                sep (str): Separador de las columnas
+                encoding (str): Codificación en la que fue guardado el archivo
+                decimal (str): Separador decimal
+                schema (dict): Esquema de lectura de la página
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+        Returns:
+                tuple: DataFrame con las filas nuevas (None si no hay filas nuevas), la nueva marca
+                    de agua e indicador de si el archivo fue reescrito sin poder filtrar sus filas
+    """
+    schema = schema or {}
+    watermark = watermark or {}
+    file_stat = stat(filename)
+    if (
+        watermark.get("size") == file_stat.st_size
+        and watermark.get("mtime_ns") == file_stat.st_mtime_ns
+    ):
+        return None, watermark, False
+
+    new_watermark = {"size": file_stat.st_size, "mtime_ns": file_stat.st_mtime_ns}
+    appended = False
+    if filename.endswith(".xlsx"):
+        data = read_dataset(filename, schema=schema, cache_folder=cache_folder)
+    else:
+        offset = watermark.get("offset")
+        # La posición guardada es la cantidad de bytes leídos, incluida una última fila sin salto de línea
+        end_offset = file_stat.st_size
+        new_watermark["offset"] = end_offset
+        new_watermark["checksum"] = get_checksum(filename, end_offset)
+        appended = bool(offset) and end_offset >= offset
+        appended = appended and get_checksum(filename, offset) == watermark["checksum"]
+        if appended and end_offset == offset:
+            new_watermark["last_value"] = watermark.get("last_value")
+            return None, new_watermark, False
+        if appended:
+            # El archivo solo creció: se leen los bytes a partir de la última posición leída
+            columns = read_csv(filename, sep=sep, encoding=encoding, nrows=0).columns
+            with open(filename, "rb") as file:
+                file.seek(offset)
+                content = BytesIO(file.read(end_offset - offset))
+            data = parse_dataset(
+                content,
+                sep,
+                encoding,
+                decimal,
+                schema,
+                header=None,
+                names=list(columns),
+            )
+        else:
+            data = read_dataset(
+                filename, sep, encoding, decimal, schema, cache_folder=cache_folder
+            )
+
+    column = schema.get("watermark")
+    filtered = bool(column and column in data.columns)
+    if filtered:
+        values = [data[column].max()]
+        last_value = watermark.get("last_value")
+        if last_value is not None:
+            values.append(to_datetime(last_value))
+            if not appended:
+                # Archivo reescrito: solo las filas posteriores al último valor procesado
+                data = data[data[column] > values[-1]]
+        values = [value for value in values if notna(value)]
+        new_watermark["last_value"] = str(max(values)) if values else None
+    rewritten = bool(watermark) and not appended and not filtered
+    return data.reset_index(drop=True), new_watermark, rewritten
+
+
+def process_incremental(
+    filenames,
+    output_filename,
+    rules,
+    schema=None,
+    sep=";",
+    encoding="utf-8",
+    decimal=".",
+    cache_folder=None,
+    rebuild=False,
+):
+    """
+    Función que procesa solo las filas nuevas de los archivos y las agrega al archivo de salida.
+    El archivo de salida se genera desde cero cuando cambia la versión de las reglas de
+    procesamiento, cuando no existe o cuando se pide reconstruirlo
+        Parameter:
+                filenames (list): Lista de rutas de los archivos
+                output_filename (str): Ruta del archivo csv con la data limpia
+                rules (list): Funciones que procesan la data, en el orden en que se aplican
+                schema (dict): Esquema de lectura de la página
+                sep (str): Separador de las columnas
+                encoding (str): Codificación en la que fue guardado el archivo
+                decimal (str): Separador decimal
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+                rebuild (bool): Indica si el archivo de salida se genera desde cero
+        Returns:
+                int: Cantidad de filas agregadas al archivo de salida
+    """
+    schema = schema or {}
+    state_filename = path.splitext(output_filename)[0] + "_watermarks.json"
+    state = load_watermarks(state_filename)
+    rules_version = get_rules_version(rules, schema)
+    append = state["rules_version"] == rules_version and path.isfile(output_filename)
+    append = append and not rebuild
+    if not append:
+        if not rebuild:
+            log(INFO, "Las reglas de procesamiento cambiaron, se procesa toda la data")
+        state = {"rules_version": rules_version, "sources": {}}
+
+    key = schema.get("key")
+    datasets = []
+    for filename in filenames:
+        source = path.abspath(filename)
+        data, state["sources"][source], rewritten = read_new_rows(
+            filename,
+            state["sources"].get(source),
+            sep,
+            encoding,
+            decimal,
+            schema,
+            cache_folder,
+        )
+        if rewritten and append and not key:
+            # Sin llave ni watermark no se pueden descartar las filas ya guardadas
+            log(INFO, f"El archivo {filename} fue reescrito, se procesa toda la data")
+            return process_incremental(
+                filenames,
+                output_filename,
+                rules,
+                schema,
+                sep,
+                encoding,
+                decimal,
+                cache_folder,
+                rebuild=True,
+            )
+        if data is not None and len(data) > 0:
+            log(INFO, f"{len(data)} filas nuevas en {filename}")
+            datasets.append(data)
+
+    if not datasets:
+        log(INFO, "No existen filas nuevas para procesar")
+        save_watermarks(state, state_filename)
+        return 0
+
+    data = concat_datasets(datasets, schema)
+    for rule in rules:
+        data = rule(data)
+
+    if append and key:
+        # Descartar los registros que ya fueron guardados en ejecuciones anteriores
+        saved = read_csv(output_filename, sep=";", encoding="utf-8-sig", usecols=key)
+        saved_keys = MultiIndex.from_frame(saved.astype(str))
+        data = data[~MultiIndex.from_frame(data[key].astype(str)).isin(saved_keys)]
+
+    write_dataset(data, output_filename, schema, append=append)
+    save_watermarks(state, state_filename)
+    return len(data)
+
+
+def get_error_filenames(folder, prefix="fb_error"):
+    """
+    Función que retorna la lista de archivos de errores diarios generados por el scraper
+        Parameter:
+                folder (str): Carpeta donde el scraper guarda las carpetas diarias de errores (%d-%m-%Y)
+                prefix (str): Nombre con el que inician los archivos de errores
+        Returns:
+                list
+    """
+    return sorted(glob(path.join(folder, "*", prefix + "_*.xlsx")))
+
+
+def read_error_history(filenames, prefix="fb_error", cache_folder=None):
+    """
+    Función que lee todos los archivos de errores en un solo DataFrame (pandas.core.frame.DataFrame)
+    y agrega la fecha, la categoría y el archivo de cada error. La fecha y la categoría se
+    obtienen de la ruta de cada archivo ({fecha}/{prefijo}[_{categoría}]_{%d%m%Y}_{cantidad}.xlsx)
+        Parameter:
+                filenames (list): Lista de rutas de los archivos de errores
+                prefix (str): Nombre con el que inician los archivos de errores
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    columns = SCHEMA_ERRORS["usecols"] + ["Archivo", "Fecha", "Categoria"]
+    history_filename = None
+    if cache_folder and filenames:
+        # El historial completo se guarda en la caché mientras ningún archivo cambie
+        key = repr(
+            [
+                (path.abspath(filename), file_stat.st_mtime_ns, file_stat.st_size)
+                for filename, file_stat in zip(filenames, map(stat, filenames))
+            ]
+            + [prefix, SCHEMA_ERRORS]
+        )
+        history_filename = path.join(
+            cache_folder, sha1(key.encode("utf-8")).hexdigest() + ".feather"
+        )
+        if path.isfile(history_filename):
+            utime(history_filename)
+            return read_feather(history_filename)
+
+    datasets = []
+    for number, filename in enumerate(filenames):
+        data = read_dataset(filename, schema=SCHEMA_ERRORS, cache_folder=cache_folder)
+        datasets.append(data.assign(Archivo=number))
+    if not datasets:
+        return DataFrame(columns=columns).astype({"Fecha": "datetime64[ns]"})
+    data = concat_datasets(datasets, SCHEMA_ERRORS)
+
+    # La fecha y la categoría se obtienen una vez por archivo y se reparten con su número
+    parts = (
+        Series(filenames)
+        .str.replace("\\", "/", regex=False)
+        .str.extract(
+            r"(?P<dia>\d{2}-\d{2}-\d{4})/"
+            + escape(prefix)
+            + r"(?:_(?P<categoria>.+))?_\d{8}_\d+\.xlsx$"
+        )
+    )
+    number = data["Archivo"].to_numpy()
+    data["Fecha"] = to_datetime(parts["dia"], format="%d-%m-%Y").to_numpy()[number]
+    data["Categoria"] = parts["categoria"].to_numpy()[number]
+
+    # La clase se guarda como <class 'modulo.Clase'>, solo se conserva el nombre de la clase
+    data["Clase"] = (
+        data["Clase"]
+        .astype(str)
+        .str.extract(r"(\w+)'?>?$", expand=False)
+        .astype("category")
+    )
+    if history_filename:
+        write_cache(data, history_filename)
+    return data
+
+
+def read_timing_history(filename, cache_folder=None):
+    """
+    Función que lee todas las hojas del archivo de tiempos en un solo DataFrame
+    (pandas.core.frame.DataFrame) con una fila por ejecución y columnas tipadas. Se agregan la
+    hoja, el inicio de la ejecución, la duración en minutos y la cantidad de publicaciones analizadas
+        Parameter:
+                filename (str): Ruta del archivo de tiempos
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    cache_filename = None
+    if cache_folder:
+        cache_filename = get_cache_filename(filename, cache_folder, SCHEMA_TIMINGS)
+        if path.isfile(cache_filename):
+            utime(cache_filename)
+            return read_feather(cache_filename)
+
+    # Todas las hojas se leen en una sola apertura del archivo
+    sheets = read_excel(filename, sheet_name=None)
+    columns = SCHEMA_TIMINGS["usecols"]
+    for name, sheet in sheets.items():
+        # Los valores agregados debajo de un encabezado antiguo quedan en columnas sin nombre
+        sheet.columns = [
+            (
+                columns[position]
+                if str(column).startswith("Unnamed:") and position < len(columns)
+                else column
+            )
+            for position, column in enumerate(sheet.columns)
+        ]
+        sheets[name] = sheet.assign(Hoja=name)
+    # Los archivos antiguos no tienen todas las columnas, las que faltan quedan vacías
+    data = concat(sheets.values(), ignore_index=True).reindex(
+        columns=columns + ["Hoja"]
+    )
+    data = change_datatype(data, SCHEMA_TIMINGS["dtype"])
+    data = apply_schema(data, SCHEMA_TIMINGS)
+    data["Hoja"] = data["Hoja"].astype("category")
+    data["Inicio"] = data["Fecha"] + to_timedelta(
+        data["Hora Inicio"].astype(str), errors="coerce"
+    )
+    # El tiempo de ejecución se guarda como texto (%d days, %H:%M:%S)
+    data["Duracion (min)"] = (
+        to_timedelta(
+            data["Tiempo Ejecucion (min)"]
+            .astype(str)
+            .str.replace(r" days?, ", " days ", regex=True),
+            errors="coerce",
+        ).dt.total_seconds()
+        / 60
+    ).round(2)
+    data["Analizadas"] = data["Cantidad Real"].fillna(0) + data["Errores"].fillna(0)
+    data = data.sort_values(["Hoja", "Inicio"], kind="stable", ignore_index=True)
+    if cache_filename:
+        write_cache(data, cache_filename)
+    return data
+
+
+def summarize_errors(errors, freq="W"):
+    """
+    Función que agrupa los errores por clase y línea de error y cuenta cuántos ocurrieron en cada
+    periodo, ordenados de los más frecuentes a los menos frecuentes
+        Parameter:
+                errors (pandas.core.frame.DataFrame): Errores leídos con read_error_history
+                freq (str): Periodo de agrupación (D, W, M, ...)
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    keys = ["Clase", "Linea de Error"]
+    groups = errors.groupby(keys, observed=True, dropna=False)
+    summary = groups.agg(
+        Total=("Archivo", "size"),
+        Ejecuciones=("Archivo", "nunique"),
+        Publicaciones=("Publicacion", "count"),
+        Primera=("Fecha", "min"),
+        Ultima=("Fecha", "max"),
+        Codigo=("Codigo Error", "first"),
+        Mensaje=("Mensaje", "first"),
+    )
+    periods = (
+        errors.assign(Periodo=errors["Fecha"].dt.to_period(freq).astype(str))
+        .groupby(keys + ["Periodo"], observed=True, dropna=False)
+        .size()
+        .unstack(fill_value=0)
+    )
+    summary = summary.join(periods)
+    return summary.sort_values("Total", ascending=False, kind="stable").reset_index()
+
+
+def summarize_timings(timings, window=7):
+    """
+    Función que resume el rendimiento de las ejecuciones de cada hoja del archivo de tiempos:
+    productos por minuto, tasa de errores y de recuperación de los reintentos, comparación de
+    las últimas ejecuciones con las anteriores y pendiente de la tendencia de los productos
+    por minuto por día, calculada por mínimos cuadrados
+        Parameter:
+                timings (pandas.core.frame.DataFrame): Ejecuciones leídas con read_timing_history
+                window (int): Cantidad de ejecuciones recientes que se comparan con las anteriores
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    data = timings[["Hoja", "Inicio", "Categorias / Minuto", "Duracion (min)"]].copy()
+    data["Errores"] = timings["Errores"].fillna(0).astype("float64")
+    data["Analizadas"] = timings["Analizadas"].astype("float64")
+    data["Reintentos"] = timings["Reintentos"].fillna(0).astype("float64")
+    data["Recuperados"] = timings["Recuperados"].fillna(0).astype("float64")
+    data["Tiempo Inicio (seg)"] = timings["Tiempo Inicio (seg)"]
+
+    # Posición de cada ejecución contando desde la última de su hoja
+    position = data.groupby("Hoja", observed=True).cumcount(ascending=False)
+    recent = position < window
+    previous = (position >= window) & (position < 2 * window)
+    throughput = data["Categorias / Minuto"]
+    data["Reciente"] = throughput.where(recent)
+    data["Anterior"] = throughput.where(previous)
+    data["Errores Recientes"] = data["Errores"].where(recent, 0)
+    data["Analizadas Recientes"] = data["Analizadas"].where(recent, 0)
+
+    # Sumas para la pendiente de mínimos cuadrados de los productos por minuto en el tiempo
+    valid = data["Inicio"].notna() & throughput.notna()
+    days = (data["Inicio"] - data["Inicio"].min()).dt.total_seconds() / 86400
+    data["x"] = days.where(valid)
+    data["y"] = throughput.where(valid)
+    data["xy"] = data["x"] * data["y"]
+    data["xx"] = data["x"] * data["x"]
+    data["n"] = valid.astype("float64")
+
+    groups = data.groupby("Hoja", observed=True)
+    summary = groups.agg(
+        Ejecuciones=("Inicio", "size"),
+        Desde=("Inicio", "min"),
+        Hasta=("Inicio", "max"),
+        Productos_Minuto=("Categorias / Minuto", "mean"),
+        Productos_Minuto_Mediana=("Categorias / Minuto", "median"),
+        Productos_Minuto_Recientes=("Reciente", "mean"),
+        Productos_Minuto_Anteriores=("Anterior", "mean"),
+        Duracion_Media_Min=("Duracion (min)", "mean"),
+        Tiempo_Inicio_Medio_Seg=("Tiempo Inicio (seg)", "mean"),
+    )
+    sums = groups[
+        [
+            "Errores",
+            "Analizadas",
+            "Errores Recientes",
+            "Analizadas Recientes",
+            "Reintentos",
+            "Recuperados",
+            "x",
+            "y",
+            "xy",
+            "xx",
+            "n",
+        ]
+    ].sum()
+    summary["Variacion_Reciente_%"] = (
+        summary["Productos_Minuto_Recientes"] / summary["Productos_Minuto_Anteriores"]
+        - 1
+    ) * 100
+    summary["Pendiente_Productos_Minuto_Dia"] = (
+        sums["n"] * sums["xy"] - sums["x"] * sums["y"]
+    ) / (sums["n"] * sums["xx"] - sums["x"] ** 2).where(lambda value: value > 0)
+    summary["Tasa_Error"] = sums["Errores"] / sums["Analizadas"].where(
+        sums["Analizadas"] > 0
+    )
+    summary["Tasa_Error_Reciente"] = sums["Errores Recientes"] / sums[
+        "Analizadas Recientes"
+    ].where(sums["Analizadas Recientes"] > 0)
+    summary["Tasa_Recuperacion"] = sums["Recuperados"] / sums["Reintentos"].where(
+        sums["Reintentos"] > 0
+    )
+    return summary.round(4).reset_index()
+
+
+def summarize_timing_trend(timings, freq="W"):
+    """
+    Función que calcula los productos por minuto, las publicaciones analizadas y la tasa de
+    errores de cada hoja del archivo de tiempos en cada periodo
+        Parameter:
+                timings (pandas.core.frame.DataFrame): Ejecuciones leídas con read_timing_history
+                freq (str): Periodo de agrupación (D, W, M, ...)
+        Returns:
+                pandas.core.frame.DataFrame
+    """
+    data = timings.assign(
+        Periodo=timings["Inicio"].dt.to_period(freq).astype(str),
+        Errores=timings["Errores"].fillna(0),
+    )
+    trend = data.groupby(["Hoja", "Periodo"], observed=True).agg(
+        Ejecuciones=("Inicio", "size"),
+        Productos_Minuto=("Categorias / Minuto", "mean"),
+        Cantidad=("Cantidad", "sum"),
+        Analizadas=("Analizadas", "sum"),
+        Errores=("Errores", "sum"),
+        Reintentos=("Reintentos", "sum"),
+    )
+    trend["Tasa_Error"] = trend["Errores"] / trend["Analizadas"].where(
+        trend["Analizadas"] > 0
+    )
+    return trend.round(4).reset_index()
+
+
+def report_runs(
+    error_folder,
+    error_prefix,
+    timing_filename,
+    output_filename,
+    freq="W",
+    window=7,
+    cache_folder=CACHE_FOLDER,
+):
+    """
+    Función que genera el reporte de salud de las ejecuciones del scraper a partir de todos los
+    archivos de errores y del archivo de tiempos. El reporte es un archivo excel con las hojas
+    Resumen (rendimiento de cada hoja de tiempos), Tendencia (rendimiento por periodo) y
+    Errores (errores por clase y línea de error en cada periodo)
+        Parameter:
+                error_folder (str): Carpeta donde el scraper guarda los errores
+                error_prefix (str): Nombre con el que inician los archivos de errores
+                timing_filename (str): Ruta del archivo de tiempos
+                output_filename (str): Ruta del archivo excel a generar
+                freq (str): Periodo de agrupación (D, W, M, ...)
+                window (int): Cantidad de ejecuciones recientes que se comparan con las anteriores
+                cache_folder (str): Carpeta de la caché. Si es None no se usa la caché
+        Returns:
+                dict: DataFrames de cada hoja del reporte
+    """
+    report = {}
+    if timing_filename and path.isfile(timing_filename):
+        timings = read_timing_history(timing_filename, cache_folder)
+        log(INFO, f"{len(timings)} ejecuciones leídas de {timing_filename}")
+        report["Resumen"] = summarize_timings(timings, window)
+        report["Tendencia"] = summarize_timing_trend(timings, freq)
+    else:
+        log(ERROR, f"El archivo de tiempos {timing_filename} no existe")
+
+    filenames = get_error_filenames(error_folder, error_prefix)
+    errors = read_error_history(filenames, error_prefix, cache_folder)
+    log(INFO, f"{len(errors)} errores leídos de {len(filenames)} archivos")
+    report["Errores"] = summarize_errors(errors, freq)
+
+    with ExcelWriter(output_filename) as writer:
+        for sheet_name, data in report.items():
+            data.to_excel(writer, sheet_name=sheet_name, index=False)
+    log(INFO, f"Reporte de ejecuciones guardado en {output_filename}")
+    return report
+
+
+def config_log():
+    """
+    Función que configura los logs para rastrear al programa
+        Parameter:
+                None
+        Returns:
+                None
+    """
+    basicConfig(
+        format="%(asctime)s %(message)s",
+        level=INFO,
+        handlers=[StreamHandler()],
+    )
+
+
+def main(tipo_info=None, filename=None, fb_folder=None, fb_filename=None):
+    """
+    Función que limpia la data de la página seleccionada
+        Parameter:
+                tipo_info (str): Página a limpiar (1, 2, 3 o 4). Si es None se pregunta al usuario
+                filename (str): Ruta del archivo csv de despegar, booking o pedidos ya
+                fb_folder (str): Carpeta donde el scraper de facebook marketplace guarda la data
+                fb_filename (str): Nombre con el que inician los archivos del scraper de facebook marketplace
+        Returns:
+                None
+    """
+    try:
+        # Formato para el debugger
+        config_log()
+        log(INFO, "Configurando Formato Básico del Debugger")
+
+        # Variables
+        log(INFO, "Configurando Variables de entorno")
+        filename = (
+            filename
+            or r"despegar_full_destinos_2023-01-27_2023-02_2023-01-29_8.69_.csv"
+        )
+        fb_folder = fb_folder or r"Data//datos_obtenidos"
+        fb_filename = fb_filename or "fb_ropa"
+
+        DESPEGAR = "1"
+        BOOKING = "2"
+        PEDIDOS_YA = "3"
+        FACEBOOK = "4"
+        tipo_info = tipo_info or input(
+        """
+        PREPROCESSING
+
+        De qué página desea limpiar la data:
+        1. Despegar (Digite 1)
+        2. Booking (Digite 2)
+        3. Pedidos Ya (Digite 3)
+        4. Facebook Marketplace (Digite 4)
+        Ingrese una opción: 
+        """
+        )
+        if tipo_info not in [DESPEGAR, BOOKING, PEDIDOS_YA, FACEBOOK]:
+            log(
+                ERROR,
+                f"Se ha digitado un valor que no corresponde. Se admiten solo los valores {DESPEGAR}, {BOOKING}, {PEDIDOS_YA} y {FACEBOOK}",
+            )
+            return
+        # Esquema de lectura de la página seleccionada
+        schema = {DESPEGAR: SCHEMA_DESPEGAR, FACEBOOK: SCHEMA_FACEBOOK}.get(tipo_info)
+
+        # Reglas de procesamiento de la página seleccionada, en el orden en que se aplican
+        rules = {
+            DESPEGAR: [process_data_general, process_data_despegar],
+            BOOKING: [process_data_general],
+            PEDIDOS_YA: [process_data_general],
+            FACEBOOK: [process_data_facebook],
+        }[tipo_info]
+
+        if tipo_info == FACEBOOK:
+            filenames = get_facebook_filenames(fb_folder, fb_filename)
+            if not filenames:
+                log(
+                    ERROR,
+                    "No se encontraron archivos del scraper en la ruta especificada",
+                )
+                return
+            filenameFixed = get_new_filename(path.join(fb_folder, fb_filename + ".csv"))
+            decimal = "."
+        else:
+            if not path.isfile(filename):
+                log(
+                    ERROR,
+                    "El archivo especificado no existe o se encuentra en otra ruta",
+                )
+                return
+            filenames = [filename]
+            filenameFixed = get_new_filename(filename)
+            decimal = ","
+
+        log(INFO, f"Procesando las filas nuevas de {len(filenames)} archivos")
+        cantidad = process_incremental(
+            filenames,
+            filenameFixed,
+            rules,
+            schema,
+            decimal=decimal,
+            cache_folder=CACHE_FOLDER,
+        )
+        log(INFO, f"{cantidad} filas guardadas en {filenameFixed}")
+        log(INFO, "Programa ejecutado satisfactoriamente")
+
+    except Exception as error:
+        log(ERROR, f"Error: {error}")
+        log(INFO, "Programa ejecutado con fallos")
+
+
+if __name__ == "__main__":
+    main()
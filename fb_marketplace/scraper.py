@@ -0,0 +1,2399 @@
+from collections import deque
+from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dump, dumps, load, JSONDecodeError
+from logging import (
+    basicConfig,
+    CRITICAL,
+    DEBUG,
+    ERROR,
+    FileHandler,
+    Formatter,
+    getLogger,
+    INFO,
+    log,
+    shutdown,
+    StreamHandler,
+)
+from logging.handlers import QueueHandler, QueueListener
+from os import environ, getenv, makedirs, path, remove
+from queue import Queue
+from re import compile, sub
+from signal import SIGINT, signal, SIGTERM
+from threading import current_thread, Event, Lock, Thread
+from time import localtime, sleep, strftime, time
+from traceback import TracebackException
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+from openpyxl import load_workbook, Workbook
+from pandas import DataFrame, to_numeric
+from seleniumwire.webdriver import Chrome, ChromeOptions
+from seleniumwire.utils import decode
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    ElementNotInteractableException,
+    TimeoutException,
+)
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.remote_connection import LOGGER as seleniumLogger
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.wait import WebDriverWait
+from urllib3.connectionpool import log as urllibLogger
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.utils import ChromeType, get_browser_version_from_os
+
+from .jsonbackend import es_detalle, obtener_backend
+
+CURRENT_DATE = datetime.now().date()
+
+# Página de inicio de facebook
+FACEBOOK_URL = "https://www.facebook.com/"
+# Dominios propios de facebook, las peticiones a otros dominios se consideran rastreadores
+FIRST_PARTY_HOSTS = ("facebook.com", "fbcdn.net", "fbsbx.com")
+# Subdominios de fbcdn.net que sirven imágenes y videos de las publicaciones
+ASSET_HOSTS = compile(r"^(scontent|video|external)[\w.-]*\.fbcdn\.net$")
+# Extensiones de imágenes, videos y fuentes
+ASSET_EXTENSIONS = compile(
+    r"\.(jpe?g|png|gif|webp|svg|ico|mp4|webm|m4a|m4v|woff2?|ttf|otf|eot)$"
+)
+
+
+# Script que registra las publicaciones que aparecen en el feed de la categoría y retorna solo las nuevas.
+# Un MutationObserver acumula los enlaces agregados al feed, por lo que cada llamada es proporcional
+# a la cantidad de publicaciones nuevas y no a todas las publicaciones cargadas
+FEED_SCRIPT = """
+if (!window.__fbFeed) {
+    const feed = {ruta: location.pathname, vistos: new Set(), nuevos: []};
+    const agregar = (nodo) => {
+        if (nodo.nodeType !== 1 || location.pathname !== feed.ruta) return;
+        const selector = 'a[href*="/marketplace/item/"]';
+        const enlaces = nodo.matches(selector) ? [nodo] : nodo.querySelectorAll(selector);
+        for (const enlace of enlaces) {
+            const id = (enlace.getAttribute("href").match(/\\/item\\/(\\d+)/) || [])[1];
+            if (id && !feed.vistos.has(id)) {
+                feed.vistos.add(id);
+                feed.nuevos.push([id, enlace.href.split("?")[0], enlace.innerText]);
+            }
+        }
+    };
+    agregar(document.body);
+    new MutationObserver((mutaciones) => {
+        for (const mutacion of mutaciones) mutacion.addedNodes.forEach(agregar);
+    }).observe(document.body, {childList: true, subtree: true});
+    window.__fbFeed = feed;
+}
+const nuevos = window.__fbFeed.nuevos;
+window.__fbFeed.nuevos = [];
+return nuevos;
+"""
+
+# Script que retorna los json incrustados en la página que contienen la información de una publicación
+DETAIL_SCRIPT = """
+return Array.from(document.querySelectorAll('script[type="application/json"]'))
+    .map((script) => script.textContent)
+    .filter((texto) => texto.includes("marketplace_product_details_page"));
+"""
+
+
+def buscar_publicacion(objeto):
+    """Busca la información de una publicación dentro de un json incrustado en la página
+
+    Args:
+        objeto (dict | list): Json en el que se busca la información
+
+    Returns:
+        dict: Diccionario con la información de la publicación o None si no se encontró
+    """
+    if isinstance(objeto, dict):
+        if "marketplace_product_details_page" in objeto:
+            return objeto["marketplace_product_details_page"]["target"]
+        objeto = objeto.values()
+    elif not isinstance(objeto, list):
+        return None
+    for valor in objeto:
+        dato = buscar_publicacion(valor)
+        if dato:
+            return dato
+    return None
+
+
+def bloquear_recursos(request):
+    """Cancela las peticiones de imágenes, videos, fuentes y rastreadores que no son necesarias para el scraper
+
+    Args:
+        request (seleniumwire.request.Request): Petición interceptada por seleniumwire
+    """
+    host = request.host.split(":")[0]
+    if (
+        not host.endswith(FIRST_PARTY_HOSTS)
+        or ASSET_HOSTS.match(host)
+        or ASSET_EXTENSIONS.search(request.path.split("?")[0])
+    ):
+        request.abort()
+
+
+def obtener_version_chrome():
+    """Retorna la versión principal de google chrome instalada consultando al sistema operativo, sin usar internet
+
+    Returns:
+        str: Versión principal de chrome o None si no se pudo detectar
+    """
+    try:
+        version = get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        version = None
+    return version.split(".")[0] if version else None
+
+
+def resolver_chromedriver(cache_file, driver_path=None, offline=False, max_age=1):
+    """Retorna la ruta del chromedriver a usar, consultando internet solo cuando no existe uno válido en caché
+
+    Args:
+        cache_file (str): Ruta del archivo json que guarda el chromedriver resuelto en la última ejecución
+        driver_path (str, optional): Ruta fija de un chromedriver. Si se indica no se hace ninguna validación. Defaults to None.
+        offline (bool, optional): Indica si se prohíbe descargar un chromedriver desde internet. Defaults to False.
+        max_age (int, optional): Días en los que se usa el chromedriver de la caché sin comprobar la versión de chrome. Defaults to 1.
+
+    Returns:
+        str: Ruta del chromedriver
+    """
+    if driver_path:
+        log(INFO, f"Usando el chromedriver fijo {driver_path}")
+        return driver_path
+
+    cache = {}
+    if path.isfile(cache_file):
+        with open(cache_file, encoding="utf-8") as file:
+            cache = load(file)
+    cached_path = cache.get("path")
+    cached_exists = bool(cached_path) and path.isfile(cached_path)
+
+    # Chromedriver resuelto recientemente: no se consulta la versión de chrome
+    if cached_exists and time() - cache.get("fecha", 0) < max_age * 86400:
+        return cached_path
+
+    version = obtener_version_chrome()
+    if cached_exists and (offline or version == cache.get("version")):
+        if version != cache.get("version"):
+            log(
+                ERROR,
+                f"El chromedriver en caché puede no ser compatible con chrome {version}",
+            )
+        driver_path = cached_path
+        version = cache.get("version")
+    elif offline:
+        raise FileNotFoundError(
+            f"No existe un chromedriver en caché para chrome {version} y el modo sin conexión está activo"
+        )
+    else:
+        log(INFO, f"Descargando chromedriver para chrome {version}")
+        driver_path = ChromeDriverManager().install()
+
+    cache_folder = path.dirname(cache_file)
+    if cache_folder and not path.exists(cache_folder):
+        makedirs(cache_folder)
+    with open(cache_file, "w", encoding="utf-8") as file:
+        dump({"version": version, "path": driver_path, "fecha": time()}, file)
+    return driver_path
+
+
+class Errores:
+    """Representa a los errores ocurridos durante la ejecución de un scraper
+
+    Attributes:
+        errores (dict): Conjunto de datos que contiene toda información de los errores ocurridos durante la ejecución del scraper
+    """
+
+    def __init__(self):
+        """Genera todos los atributos para una instancia de la clase Errores"""
+        self._errores = {
+            "Clase": [],
+            "Mensaje": [],
+            "Linea de Error": [],
+            "Codigo Error": [],
+            "Publicacion": [],
+        }
+
+    @property
+    def errores(self):
+        """Retorna el valor actual del atributo errores"""
+        return self._errores
+
+    def agregar_error(self, error, enlace=None):
+        """Agrega la información de un nuevo error al conjunto de datos errores
+
+        Args:
+            error (Exception): Error ocurrido durante la ejecución del scraper
+            enlace (str, optional): Enlace de la publicación de la página facebook marketplace. Defaults to None.
+        """
+        log(ERROR, f"Error:\n{error}")
+        traceback_error = TracebackException.from_exception(error)
+        error_stack = traceback_error.stack[0]
+        self._errores["Clase"].append(traceback_error.exc_type)
+        self._errores["Mensaje"].append(traceback_error._str)
+        self._errores["Linea de Error"].append(error_stack.lineno)
+        self._errores["Codigo Error"].append(error_stack.line)
+        self._errores["Publicacion"].append(enlace)
+
+
+class Dataset:
+    """Representa al conjunto de datos generado por el scraper
+
+    Attributes:
+        dataset (dict): Conjunto de datos que contiene toda información extraída de las publicaciones de la página de facebook marketplace
+    """
+
+    def __init__(self):
+        """Genera todos los atributos para una instancia de la clase Dataset"""
+        self._dataset = {
+            "Fecha Extraccion": [],
+            "titulo_marketplace": [],
+            "tiempo_creacion": [],
+            "tipo_delivery": [],
+            "descripcion": [],
+            "disponible": [],
+            "vendido": [],
+            "fecha_union_vendedor": [],
+            "cantidad": [],
+            "precio": [],
+            "tipo_moneda": [],
+            "amount_with_concurrency": [],
+            "latitud": [],
+            "longitud": [],
+            "locacion": [],
+            "locacion_id": [],
+            "name_vendedor": [],
+            "tipo_vendedor": [],
+            "id_vendedor": [],
+            "enlace": [],
+        }
+
+    @property
+    def dataset(self):
+        """Retorna el valor actual del diccionario de datos dataset"""
+        return self._dataset
+
+    def agregar_data(self, item, fecha_extraccion, enlace):
+        """Agrega la información de una publicación al conjunto de datos dataset
+
+        Args:
+            item (dict): Conjunto de datos que contiene toda la información de una publicación
+            fecha_extraccion (str): Fecha correspondiente a la extracción de todas las publicaciones
+            enlace (str): Enlace de la publicación
+        """
+        self._dataset["Fecha Extraccion"].append(fecha_extraccion)
+        self._dataset["titulo_marketplace"].append(
+            item.get("marketplace_listing_title")
+        )
+        self._dataset["tiempo_creacion"].append(item.get("creation_time"))
+        try:
+            self._dataset["tipo_delivery"].append(item.get("delivery_types")[0])
+        except:
+            self._dataset["tipo_delivery"].append(None)
+        try:
+            self._dataset["descripcion"].append(
+                item.get("redacted_description").get("text")
+            )
+        except:
+            self._dataset["descripcion"].append(None)
+        self._dataset["disponible"].append(item.get("is_live"))
+        self._dataset["vendido"].append(item.get("is_sold"))
+        try:
+            self._dataset["fecha_union_vendedor"].append(
+                item.get("marketplace_listing_seller").get("join_time")
+            )
+        except:
+            self._dataset["fecha_union_vendedor"].append(None)
+        self._dataset["cantidad"].append(item.get("listing_inventory_type"))
+        try:
+            listing_price = item.get("listing_price")
+            self._dataset["precio"].append(listing_price.get("amount"))
+            self._dataset["tipo_moneda"].append(listing_price.get("currency"))
+            self._dataset["amount_with_concurrency"].append(
+                listing_price.get("amount_with_offset_in_currency")
+            )
+        except:
+            self._dataset["precio"].append(None)
+            self._dataset["tipo_moneda"].append(None)
+            self._dataset["amount_with_concurrency"].append(None)
+        try:
+            location = item.get("location")
+            self._dataset["latitud"].append(location.get("latitude"))
+            self._dataset["longitud"].append(location.get("longitude"))
+        except:
+            self._dataset["latitud"].append(None)
+            self._dataset["longitud"].append(None)
+        try:
+            self._dataset["locacion"].append(item.get("location_text").get("text"))
+        except:
+            self._dataset["locacion"].append(None)
+
+        self._dataset["locacion_id"].append(item.get("location_vanity_or_id"))
+        try:
+            user = item.get("story").get("actors")[0]
+            self._dataset["name_vendedor"].append(user.get("name"))
+            self._dataset["tipo_vendedor"].append(user.get("__typename"))
+            self._dataset["id_vendedor"].append(user.get("id"))
+        except:
+            self._dataset["name_vendedor"].append(None)
+            self._dataset["tipo_vendedor"].append(None)
+            self._dataset["id_vendedor"].append(None)
+        self._dataset["enlace"].append(enlace)
+
+
+class Tiempo:
+    """Representa al tiempo de ejecución del scraper
+
+    Attributes
+        start (float): Hora de inicio de la ejecución del scraper en segundos
+        fecha (str): Fecha de extracción de las publicaciones en formato %d/%m/%Y
+        hora_inicio (str): Hora de inicio de la ejecución del scraper en formato %H:%M:%S
+        hora_fin (str): Hora de término de la ejecución del scraper en formato %H:%M:%S
+        cantidad (int): Cantidad de publicaciones extraídas de la página de facebook marketplace
+        cantidad_real (int): Cantidad de publicaciones analizadas de la página de facebook marketplace
+        tiempo (str): Tiempo de ejecución del scraper en formato %d days, %H:%M:%S
+        productos_por_min (float): Cantidad de publicaciones que puede extraer el scraper en un minuto
+        productos_por_min_real (float): Cantidad publicaciones que puede analizar el scraper en un minuto
+        num_error (int): Cantidad de errores ocurridos durante la ejecución del scraper
+        tiempo_inicio (float): Segundos que tarda el scraper en iniciar el navegador e iniciar sesión
+        reintentos (int): Cantidad de reintentos de publicaciones fallidas
+        recuperados (int): Cantidad de publicaciones extraídas en un reintento
+    """
+
+    def __init__(self, fecha=None):
+        """Genera todos los atributos para una instancia de la clase Tiempo
+
+        Args:
+            fecha (str, optional): Fecha de extracción en formato %d/%m/%Y. Si es None se usa la fecha actual. Defaults to None.
+        """
+        self._start = time()
+        self._fecha = fecha or datetime.now().strftime("%d/%m/%Y")
+        self._hora_inicio = strftime("%H:%M:%S", localtime(self._start))
+        self._hora_fin = None
+        self._cantidad = 0
+        self._cantidad_real = 0
+        self._tiempo = None
+        self._productos_por_min = None
+        self._productos_por_min_real = None
+        self._num_error = None
+        self._tiempo_inicio = None
+        self._reintentos = 0
+        self._recuperados = 0
+
+    @property
+    def cantidad(self):
+        """Retorna el valor actual o actualiza el valor del atributo cantidad"""
+        return self._cantidad
+
+    @property
+    def cantidad_real(self):
+        """Retorna el valor actual o actualiza el valor del atributo cantidad_real"""
+        return self._cantidad_real
+
+    @property
+    def fecha(self):
+        """Retorna el valor actual del atributo fecha"""
+        return self._fecha
+
+    @property
+    def hora_inicio(self):
+        """Retorna el valor actual del atributo hora_inicio"""
+        return self._hora_inicio
+
+    @property
+    def num_error(self):
+        """Retorna el valor actual o actualiza el valor del atributo num_error"""
+        return self._num_error
+
+    @property
+    def tiempo_inicio(self):
+        """Retorna el valor actual del atributo tiempo_inicio"""
+        return self._tiempo_inicio
+
+    @property
+    def reintentos(self):
+        """Retorna el valor actual o actualiza el valor del atributo reintentos"""
+        return self._reintentos
+
+    @property
+    def recuperados(self):
+        """Retorna el valor actual o actualiza el valor del atributo recuperados"""
+        return self._recuperados
+
+    @cantidad.setter
+    def cantidad(self, cantidad):
+        self._cantidad = cantidad
+
+    @cantidad_real.setter
+    def cantidad_real(self, cantidad_real):
+        self._cantidad_real = cantidad_real
+
+    @num_error.setter
+    def num_error(self, num_error):
+        self._num_error = num_error
+
+    @reintentos.setter
+    def reintentos(self, reintentos):
+        self._reintentos = reintentos
+
+    @recuperados.setter
+    def recuperados(self, recuperados):
+        self._recuperados = recuperados
+
+    def set_param_inicio(self):
+        """Establece el tiempo que tarda el scraper en estar listo para extraer publicaciones"""
+        self._tiempo_inicio = round(time() - self._start, 2)
+        log(INFO, f"Tiempo de inicio: {self._tiempo_inicio} segundos")
+
+    def set_param_final(self):
+        """Establece parametros finales para medir el tiempo de ejecución del scraper"""
+        end = time()
+        self._hora_fin = strftime("%H:%M:%S", localtime(end))
+        total = end - self._start
+        self._tiempo = str(timedelta(seconds=total)).split(".")[0]
+        self._productos_por_min = round(self._cantidad / (total / 60), 2)
+        self._productos_por_min_real = round(self._cantidad_real / (total / 60), 2)
+        log(INFO, f"Errores encontrados: {self._num_error}")
+        log(INFO, f"Reintentos: {self._reintentos}, recuperados: {self._recuperados}")
+        log(INFO, f"Productos Extraídos: {self._cantidad}")
+        log(INFO, f"Hora Fin: {self._hora_fin}")
+
+
+class Categoria:
+    """Representa a una categoría de facebook marketplace a scrapear y al avance de su extracción
+
+    Attributes:
+        nombre (str): Nombre de la categoría usado en los archivos generados
+        url (str): Link de la página de la categoría en facebook marketplace
+        prioridad (int): Prioridad de la categoría. Las categorías con mayor prioridad se abren primero y reciben más turnos
+        max_items (int): Cantidad máxima de publicaciones a analizar. Si es None no hay límite
+        max_minutos (float): Minutos máximos de extracción. Si es None no hay límite
+        tiempo (Tiempo): Objeto de la clase Tiempo que maneja información del tiempo de ejecución de la categoría
+        data (Dataset): Objeto de la clase Dataset que maneja información de las publicaciones extraídas de la categoría
+        errores (Errores): Objeto de la clase Errores que maneja información de los errores ocurridos en la categoría
+        ventana (str): Identificador de la pestaña del navegador donde se encuentra abierta la categoría
+        ventana_detalle (str): Identificador de la pestaña donde se cargan las publicaciones al navegar por url
+        publicaciones (deque): Cola con el id y el enlace de las publicaciones visibles que aún no se analizan
+        vistos (set): Ids de las publicaciones encontradas en el feed de la categoría
+        conocidos (set): Ids de las publicaciones extraídas en ejecuciones anteriores del día. El feed se deja de leer al encontrar una de ellas
+        reintentos (list): Montículo con la hora, el id y el enlace de las publicaciones fallidas a reintentar
+        intentos (dict): Cantidad de intentos fallidos de cada publicación
+        fin_feed (bool): Indica si ya no se analizan nuevas publicaciones del feed
+        indice (int): Cantidad de publicaciones que mapea el scraper
+        num_error (int): Cantidad de errores ocurridos durante el mapeo de la categoría
+        fecha_publicacion (int): Fecha de la última publicación analizada en segundos
+        inicio (int): Inicio de la ventana de tiempo de las publicaciones a extraer en segundos
+        fin (int): Fin de la ventana de tiempo en segundos, las publicaciones posteriores se omiten. Si es None no hay límite
+        servicio (float): Segundos que la categoría ha ocupado al navegador
+        terminada (bool): Indica si la extracción de la categoría ha terminado
+    """
+
+    def __init__(
+        self,
+        nombre,
+        url,
+        prioridad=1,
+        max_items=None,
+        max_minutos=None,
+        tiempo=None,
+        data=None,
+        errores=None,
+        conocidos=None,
+        inicio=None,
+        fin=None,
+    ):
+        """Genera todos los atributos para una instancia de la clase Categoria
+
+        Args:
+            nombre (str): Nombre de la categoría usado en los archivos generados
+            url (str): Link de la página de la categoría en facebook marketplace
+            prioridad (int, optional): Prioridad de la categoría. Defaults to 1.
+            max_items (int, optional): Cantidad máxima de publicaciones a analizar. Defaults to None.
+            max_minutos (float, optional): Minutos máximos de extracción. Defaults to None.
+            tiempo (Tiempo, optional): Tiempo de ejecución a usar. Si es None se crea uno nuevo. Defaults to None.
+            data (Dataset, optional): Conjunto de datos a usar. Si es None se crea uno nuevo. Defaults to None.
+            errores (Errores, optional): Conjunto de errores a usar. Si es None se crea uno nuevo. Defaults to None.
+            conocidos (set, optional): Ids de las publicaciones extraídas en ejecuciones anteriores del día. Defaults to None.
+            inicio (int, optional): Inicio de la ventana de tiempo en segundos. Si es None se usa el inicio del día de extracción. Defaults to None.
+            fin (int, optional): Fin de la ventana de tiempo en segundos. Si es None no hay límite. Defaults to None.
+        """
+        self._nombre = nombre
+        self._url = url
+        self._prioridad = max(prioridad, 1)
+        self._max_items = max_items
+        self._max_minutos = max_minutos
+        if tiempo is None and inicio is not None:
+            # La fecha de extracción es el día de la ventana de tiempo
+            tiempo = Tiempo(datetime.fromtimestamp(inicio).strftime("%d/%m/%Y"))
+        self._tiempo = tiempo or Tiempo()
+        self._data = data or Dataset()
+        self._errores = errores or Errores()
+        self._start = time()
+        self.ventana = None
+        self.ventana_detalle = None
+        self.publicaciones = deque()
+        self.vistos = set()
+        self.conocidos = conocidos or set()
+        self.reintentos = []
+        self.intentos = {}
+        self.fin_feed = False
+        self.indice = 0
+        self.num_error = 0
+        # Entero que hace referencia a la fecha en que se extrae la información
+        self._fecha_extraccion = (
+            int(datetime.strptime(self._tiempo.fecha, "%d/%m/%Y").timestamp())
+            if inicio is None
+            else int(inicio)
+        )
+        self._fin = None if fin is None else int(fin)
+        self.fecha_publicacion = self._fecha_extraccion
+        self.servicio = 0.0
+        self.terminada = False
+
+    @property
+    def nombre(self):
+        """Retorna el valor actual del atributo nombre"""
+        return self._nombre
+
+    @property
+    def url(self):
+        """Retorna el valor actual del atributo url"""
+        return self._url
+
+    @property
+    def prioridad(self):
+        """Retorna el valor actual del atributo prioridad"""
+        return self._prioridad
+
+    @property
+    def tiempo(self):
+        """Retorna el valor actual del atributo tiempo"""
+        return self._tiempo
+
+    @property
+    def data(self):
+        """Retorna el valor actual del atributo data"""
+        return self._data
+
+    @property
+    def inicio(self):
+        """Retorna el valor actual del atributo inicio"""
+        return self._fecha_extraccion
+
+    @property
+    def fin(self):
+        """Retorna el valor actual del atributo fin"""
+        return self._fin
+
+    @property
+    def errores(self):
+        """Retorna el valor actual del atributo errores"""
+        return self._errores
+
+    def agregar_publicaciones(self, publicaciones):
+        """Agrega a la cola las publicaciones del feed que no se han visto antes
+
+        Args:
+            publicaciones (list): Lista con el id, el enlace y el texto del feed de las publicaciones
+        """
+        for id_publicacion, enlace, *_ in publicaciones:
+            if id_publicacion not in self.vistos:
+                self.vistos.add(id_publicacion)
+                self.publicaciones.append((id_publicacion, enlace))
+
+    def agregar_reintento(self, id_publicacion, enlace, espera):
+        """Agrega una publicación fallida a la cola de reintentos
+
+        Args:
+            id_publicacion (str): Id de la publicación
+            enlace (str): Enlace de la publicación
+            espera (float): Segundos que deben pasar antes de reintentar la publicación
+        """
+        heappush(self.reintentos, (time() + espera, id_publicacion, enlace))
+
+    def siguiente_reintento(self):
+        """Retorna el siguiente reintento que ya cumplió su espera. Si el feed terminó espera al siguiente reintento
+
+        Returns:
+            tuple: Id y enlace de la publicación a reintentar o None si no hay reintentos listos
+        """
+        if not self.reintentos:
+            return None
+        espera = self.reintentos[0][0] - time()
+        if espera > 0:
+            if not self.fin_feed:
+                return None
+            sleep(espera)
+        return heappop(self.reintentos)[1:]
+
+    def debe_terminar(self):
+        """Comprueba si la categoría cumple alguna de sus condiciones de parada
+
+        Returns:
+            bool: Indica si la extracción de la categoría debe terminar
+        """
+        # La última publicación analizada es anterior al inicio de la ventana de tiempo
+        if self.fecha_publicacion < self._fecha_extraccion:
+            return True
+        if self._max_items is not None and self.indice >= self._max_items:
+            log(INFO, f"La categoría {self._nombre} alcanzó su límite de publicaciones")
+            return True
+        if (
+            self._max_minutos is not None
+            and time() - self._start >= self._max_minutos * 60
+        ):
+            log(INFO, f"La categoría {self._nombre} alcanzó su límite de tiempo")
+            return True
+        return False
+
+
+class ControladorRitmo:
+    """Representa a un controlador que ajusta la pausa entre publicaciones según la respuesta de facebook
+
+    Sigue la estrategia AIMD: mientras la página responde rápido y sin errores la pausa disminuye
+    de forma aditiva, y ante señales de saturación (respuestas 429, errores frecuentes o latencias
+    altas) la pausa aumenta de forma multiplicativa.
+
+    Attributes:
+        pausa (float): Segundos de espera entre publicaciones
+        pausa_min (float): Pausa mínima en segundos
+        pausa_max (float): Pausa máxima en segundos
+        paso (float): Segundos que disminuye la pausa por cada publicación sin problemas
+        factor (float): Factor por el que se multiplica la pausa ante una señal de saturación
+        latencia_max (float): Latencia promedio en segundos a partir de la cual se considera saturada la página
+        tasa_error_max (float): Proporción de errores en la ventana a partir de la cual se considera saturada la página
+        latencia (float): Latencia promedio en segundos de las últimas publicaciones
+        resultados (deque): Ventana con los últimos resultados, True si hubo error
+    """
+
+    def __init__(
+        self,
+        pausa=2,
+        pausa_min=1,
+        pausa_max=30,
+        paso=0.1,
+        factor=2,
+        latencia_max=5,
+        tasa_error_max=0.2,
+        ventana=10,
+    ):
+        """Genera todos los atributos para una instancia de la clase ControladorRitmo
+
+        Args:
+            pausa (float, optional): Pausa inicial en segundos. Defaults to 2.
+            pausa_min (float, optional): Pausa mínima en segundos. Defaults to 1.
+            pausa_max (float, optional): Pausa máxima en segundos. Defaults to 30.
+            paso (float, optional): Segundos que disminuye la pausa por cada publicación sin problemas. Defaults to 0.1.
+            factor (float, optional): Factor por el que se multiplica la pausa ante una señal de saturación. Defaults to 2.
+            latencia_max (float, optional): Latencia promedio máxima en segundos. Defaults to 5.
+            tasa_error_max (float, optional): Proporción máxima de errores en la ventana. Defaults to 0.2.
+            ventana (int, optional): Cantidad de publicaciones usadas para calcular la proporción de errores. Defaults to 10.
+        """
+        self._pausa_min = pausa_min
+        self._pausa_max = max(pausa_max, pausa_min)
+        self._pausa = min(max(pausa, self._pausa_min), self._pausa_max)
+        self._paso = paso
+        self._factor = factor
+        self._latencia_max = latencia_max
+        self._tasa_error_max = tasa_error_max
+        self._latencia = None
+        self._resultados = deque(maxlen=ventana)
+
+    @property
+    def pausa(self):
+        """Retorna el valor actual del atributo pausa"""
+        return self._pausa
+
+    @property
+    def latencia(self):
+        """Retorna el valor actual del atributo latencia"""
+        return self._latencia
+
+    def tasa_error(self):
+        """Retorna la proporción de errores en la ventana de resultados"""
+        if not self._resultados:
+            return 0
+        return sum(self._resultados) / len(self._resultados)
+
+    def registrar(self, latencia, error=False, saturado=False):
+        """Registra el resultado de una publicación y ajusta la pausa
+
+        Args:
+            latencia (float): Segundos que tardó en cargar la publicación
+            error (bool, optional): Indica si ocurrió un error atribuible a la página. Defaults to False.
+            saturado (bool, optional): Indica si la página respondió con una señal explícita de saturación. Defaults to False.
+        """
+        self._resultados.append(error)
+        # Promedio móvil exponencial de la latencia
+        if self._latencia is None:
+            self._latencia = latencia
+        else:
+            self._latencia = 0.8 * self._latencia + 0.2 * latencia
+
+        if saturado:
+            motivo = "respuesta 429"
+        elif error and self.tasa_error() > self._tasa_error_max:
+            motivo = f"tasa de errores de {self.tasa_error():.0%}"
+        elif self._latencia > self._latencia_max:
+            motivo = f"latencia promedio de {self._latencia:.2f} segundos"
+        else:
+            motivo = None
+
+        if motivo:
+            pausa = min(self._pausa * self._factor, self._pausa_max)
+        elif not error:
+            pausa = max(self._pausa - self._paso, self._pausa_min)
+        else:
+            pausa = self._pausa
+
+        if pausa > self._pausa:
+            log(
+                INFO, f"Reduciendo el ritmo por {motivo}: pausa de {pausa:.2f} segundos"
+            )
+        elif pausa < self._pausa and pausa == self._pausa_min:
+            log(INFO, f"Ritmo máximo alcanzado: pausa de {pausa:.2f} segundos")
+        self._pausa = pausa
+
+
+class ScraperFb:
+    """Representa a un bot para hacer web scraping en fb marketplace
+
+    Attributes:
+        tiempo (Tiempo): Objeto de la clase Tiempo que maneja información del tiempo de ejecución del scraper
+        driver (webdriver.Chrome): Objeto de la clase webdriver que maneja un navegador para hacer web scraping
+        wait (WebDriverWait): Objeto de la clase WebDriverWait que maneja el Tiempo de espera durante la ejecución del scraper
+        ritmo (ControladorRitmo): Objeto de la clase ControladorRitmo que ajusta la pausa entre publicaciones
+        errores (Errores): Objeto de la clase Errores que maneja información de los errores ocurridos durante la ejecución del scraper
+        data (Dataset): Objeto de la clase Dataset que maneja información de las publicaciones extraídas por el scraper
+    """
+
+    def __init__(
+        self,
+        headless=False,
+        block_assets=False,
+        window_size=None,
+        user_data_dir=None,
+        driver_path=None,
+        ritmo=None,
+        navegacion="click",
+        max_reintentos=3,
+        espera_reintento=5,
+        detector=None,
+        omitir_reposts=False,
+        almacen=None,
+        url_base=FACEBOOK_URL,
+        json_backend=None,
+    ):
+        """Genera todos los atributos para una instancia de la clase ScraperFb
+
+        Args:
+            headless (bool, optional): Indica si el navegador se ejecuta sin interfaz gráfica. Defaults to False.
+            block_assets (bool, optional): Indica si se bloquean las imágenes, videos, fuentes y rastreadores. Defaults to False.
+            window_size (str, optional): Tamaño de la ventana del navegador en formato ancho,alto. Si es None se maximiza la ventana. Defaults to None.
+            user_data_dir (str, optional): Carpeta del perfil de chrome donde se conserva la sesión entre ejecuciones. Defaults to None.
+            driver_path (str, optional): Ruta del chromedriver. Si es None se descarga con ChromeDriverManager. Defaults to None.
+            ritmo (ControladorRitmo, optional): Controlador de la pausa entre publicaciones. Si es None se usa uno con los valores por defecto. Defaults to None.
+            navegacion (str, optional): Forma de abrir las publicaciones. Con click se abren desde el feed y se regresa con el historial, con url se cargan en una pestaña de detalle sin tocar el feed. Defaults to "click".
+            max_reintentos (int, optional): Cantidad máxima de reintentos de una publicación fallida. Defaults to 3.
+            espera_reintento (float, optional): Segundos de espera antes del primer reintento, se duplica en cada reintento. Defaults to 5.
+            detector (DetectorDuplicados, optional): Detector que asigna un cluster a las publicaciones guardadas. Si es None no se asignan clusters. Defaults to None.
+            omitir_reposts (bool, optional): Indica si se omiten las publicaciones del feed que el detector ya conoce. Defaults to False.
+            almacen (AlmacenPayloads, optional): Archivo donde se guarda el payload de cada publicación extraída. Si es None no se guardan. Defaults to None.
+            url_base (str, optional): Página de inicio donde se inicia sesión, se cambia para usar el servidor de prueba. Defaults to FACEBOOK_URL.
+            json_backend (str, optional): Librería para leer las respuestas de graphql, json u orjson. Si es None se usa la variable JSON_BACKEND o la más rápida instalada. Defaults to None.
+        """
+        log(INFO, "Inicializando scraper")
+        self._tiempo = Tiempo()
+
+        # Variable que maneja las opciones de chrome
+        chrome_options = ChromeOptions()
+
+        # Configurar nivel de notificacones de chrome
+        prefs = {"profile.default_content_setting_values.notifications": 2}
+        if block_assets:
+            # Deshabilitar la descarga de imágenes desde chrome
+            prefs["profile.managed_default_content_settings.images"] = 2
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option("prefs", prefs)
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        chrome_options.add_argument("--disable-gpu")
+        if headless:
+            chrome_options.add_argument("--headless=new")
+        if window_size:
+            chrome_options.add_argument(f"--window-size={window_size}")
+        if urlparse(url_base).hostname in ("127.0.0.1", "localhost"):
+            # Chrome no envía al proxy de seleniumwire las peticiones locales si no se indica
+            chrome_options.add_argument("--proxy-bypass-list=<-loopback>")
+        if user_data_dir:
+            chrome_options.add_argument(
+                f"--user-data-dir={path.abspath(user_data_dir)}"
+            )
+
+        self._driver = Chrome(
+            chrome_options=chrome_options,
+            service=Service(driver_path or ChromeDriverManager().install()),
+        )
+        if block_assets:
+            # Cancelar los videos, fuentes y rastreadores que chrome no permite bloquear
+            self._driver.request_interceptor = bloquear_recursos
+        if not window_size:
+            self._driver.maximize_window()
+        self._wait = WebDriverWait(self._driver, 10)
+        self._errores = Errores()
+        self._data = Dataset()
+        self._ritmo = ritmo or ControladorRitmo()
+        self._navegacion = navegacion
+        self._max_reintentos = max_reintentos
+        self._espera_reintento = espera_reintento
+        self._detector = detector
+        self._omitir_reposts = omitir_reposts
+        self._almacen = almacen
+        self._url_base = url_base
+        self._json = obtener_backend(json_backend)
+        log(INFO, f"Librería de json: {self._json.nombre}")
+        log(INFO, f"Hora de inicio: {self._tiempo.hora_inicio}")
+
+    @property
+    def data(self):
+        """Retorna el valor actual del atributo data"""
+        return self._data
+
+    @property
+    def errores(self):
+        """Retorna el valor actual del atributo errores"""
+        return self._errores
+
+    @property
+    def tiempo(self):
+        """Retorna el valor actual del atributo tiempo"""
+        return self._tiempo
+
+    @property
+    def ritmo(self):
+        """Retorna el valor actual del atributo ritmo"""
+        return self._ritmo
+
+    @property
+    def pid(self):
+        """Retorna el id del proceso del chromedriver, del que dependen los procesos de chrome"""
+        return self._driver.service.process.pid
+
+    def pagina_saturada(self):
+        """Comprueba si facebook respondió con una señal de saturación a las últimas peticiones
+
+        Returns:
+            bool: Indica si alguna petición recibió una respuesta 429
+        """
+        return any(
+            request.response and request.response.status_code == 429
+            for request in self._driver.requests
+        )
+
+    def sesion_valida(self):
+        """Comprueba si el navegador tiene una sesión de facebook activa
+
+        Returns:
+            bool: Indica si la sesión está activa
+        """
+        # La cookie c_user solo existe con una sesión iniciada y el formulario de inicio de sesión no se muestra
+        sesion_iniciada = self._driver.get_cookie("c_user") is not None
+        formulario_login = self._driver.find_elements(By.ID, "email")
+        return sesion_iniciada and not formulario_login
+
+    def restaurar_sesion(self, session_file):
+        """Restaura la sesión guardada en una ejecución anterior
+
+        Args:
+            session_file (str): Ruta del archivo donde se guardan las cookies y el localStorage de la sesión
+
+        Returns:
+            bool: Indica si la sesión restaurada es válida
+        """
+        log(INFO, "Restaurando sesión")
+        self._driver.get(self._url_base)
+        if path.isfile(session_file):
+            with open(session_file, encoding="utf-8") as file:
+                session = load(file)
+            for cookie in session["cookies"]:
+                self._driver.add_cookie(cookie)
+            self._driver.execute_script(
+                "for (const [key, value] of Object.entries(arguments[0])) localStorage.setItem(key, value);",
+                session["local_storage"],
+            )
+            self._driver.get(self._url_base)
+        return self.sesion_valida()
+
+    def guardar_sesion(self, session_file):
+        """Guarda las cookies y el localStorage de la sesión actual
+
+        Args:
+            session_file (str): Ruta del archivo donde se guardan las cookies y el localStorage de la sesión
+        """
+        session = {
+            "cookies": self._driver.get_cookies(),
+            "local_storage": self._driver.execute_script(
+                "return Object.assign({}, window.localStorage);"
+            ),
+        }
+        session_folder = path.dirname(session_file)
+        if session_folder and not path.exists(session_folder):
+            makedirs(session_folder)
+        with open(session_file, "w", encoding="utf-8") as file:
+            dump(session, file)
+        log(INFO, "Sesión guardada correctamente")
+
+    def iniciar_sesion(self, user_name, user_password, session_file=None):
+        """Inicia sesión en la página web de facebook usando un usuario y contraseña
+
+        Args:
+            user_name (str): Usuario activo de facebook
+            user_password (str): Contraseña del usuario activo de facebook
+            session_file (str, optional): Ruta del archivo de la sesión guardada. Si la sesión guardada es válida no se vuelve a iniciar sesión. Defaults to None.
+        """
+        if session_file and self.restaurar_sesion(session_file):
+            log(INFO, "Sesión restaurada con éxito")
+            self._tiempo.set_param_inicio()
+            return
+
+        log(INFO, "Iniciando sesión")
+        self._driver.get(self._url_base)
+
+        # Localizando los campos de usuario y contraseña
+        username = self._wait.until(EC.presence_of_element_located((By.ID, "email")))
+        password = self._wait.until(EC.presence_of_element_located((By.ID, "pass")))
+        # Limpiando el contenido que existe en los campos de usuario y contraseña
+        username.clear()
+        password.clear()
+        # Mandando valores a los campos de usuario y contraseña
+        username.send_keys(user_name)
+        password.send_keys(user_password)
+        # Dar click en el botón de iniciar sesión
+        self._wait.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[name='login']"))
+        ).click()
+        # Esperando a que se inicie sesión correctamente
+        self._wait.until(
+            EC.presence_of_element_located(
+                (
+                    By.XPATH,
+                    "//a[@class='x1i10hfl x1qjc9v5 xjbqb8w xjqpnuy xa49m3k xqeqjp1 x2hbi6w x13fuv20 xu3j5b3 x1q0q8m5 x26u7qi x972fbf xcfux6l x1qhh985 xm0m39n x9f619 x1ypdohk xdl72j9 x2lah0s xe8uvvx xdj266r x11i5rnm xat24cr x1mh8g0r x2lwn1j xeuugli xexx8yu x4uap5 x18d9i69 xkhd6sd x1n2onr6 x16tdsg8 x1hl2dhg xggy1nq x1ja2u2z x1t137rt x1o1ewxj x3x9cwd x1e5q0jg x13rtm0m x1q0g3np x87ps6o x1lku1pv x1rg5ohu x1a2a7pz x1hc1fzr x1k90msu x6o7n8i xbxq160']",
+                )
+            )
+        )
+        log(INFO, "Inicio de sesión con éxito")
+        if session_file:
+            self.guardar_sesion(session_file)
+        self._tiempo.set_param_inicio()
+
+    def obtener_publicaciones(self, categoria):
+        """Retornar las publicaciones que aparecieron en el feed de la categoría desde la última consulta
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace abierta en la pestaña actual
+
+        Returns:
+            list: Lista con el id, el enlace y el texto del feed de las nuevas publicaciones de Facebook Marketplace
+        """
+        publicaciones = self._driver.execute_script(FEED_SCRIPT)
+        for numero, publicacion in enumerate(publicaciones):
+            if publicacion[0] in categoria.conocidos:
+                # El feed está ordenado por fecha, desde aquí las publicaciones ya se extrajeron
+                log(
+                    INFO,
+                    f"Se alcanzó la última publicación extraída de la categoría {categoria.nombre}",
+                )
+                categoria.fin_feed = True
+                publicaciones = publicaciones[:numero]
+                break
+        if self._detector is None or not self._omitir_reposts:
+            return publicaciones
+        # Omitir las publicaciones ya extraídas y los reposts de publicaciones conocidas
+        nuevas = [
+            publicacion
+            for publicacion in publicaciones
+            if not self._detector.es_repost(publicacion[0], publicacion[2])
+        ]
+        if len(nuevas) < len(publicaciones):
+            log(
+                INFO,
+                f"Se omitieron {len(publicaciones) - len(nuevas)} publicaciones conocidas",
+            )
+        return nuevas
+
+    def leer_publicacion(self, desde_feed=True):
+        """Retorna la información de la publicación cargada en la pestaña actual
+
+        Args:
+            desde_feed (bool, optional): Indica si la publicación se abrió desde el feed. Si es False también se busca la información incrustada en la página. Defaults to True.
+
+        Returns:
+            dict: Información de la publicación o None si no se encontró
+        """
+        for request in self._driver.requests:
+            # Validar si la api es de graphql
+            if not request.response or "graphql" not in request.url:
+                continue
+
+            # Obtener la respuesta de la api en bytes
+            body = decode(
+                request.response.body,
+                request.response.headers.get("Content-Encoding", "identity"),
+            )
+            # Validar si la respuesta es la deseada sin convertirla a str
+            if not es_detalle(body):
+                continue
+
+            # Convertir al formato json la respuesta directamente desde los bytes
+            json_data = self._json.loads(body)
+
+            # Diccionario que contiene toda la información de la publicación
+            return json_data["data"]["viewer"]["marketplace_product_details_page"][
+                "target"
+            ]
+
+        # Al cargar la publicación por url su información viene incrustada en la página
+        if not desde_feed:
+            for texto in self._driver.execute_script(DETAIL_SCRIPT):
+                dato = buscar_publicacion(self._json.loads(texto))
+                if dato:
+                    return dato
+        return None
+
+    def fecha_creacion(self, categoria, enlace):
+        """Retorna la fecha de creación de una publicación abriéndola en la pestaña de detalle
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace abierta con abrir_categoria
+            enlace (str): Enlace de la publicación
+
+        Returns:
+            int: Fecha de creación en segundos o None si no se pudo leer
+        """
+        try:
+            del self._driver.requests
+            self.abrir_detalle(categoria, enlace)
+            self._wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, "//img[@class='x5yr21d xl1xv1r xh8yej3']")
+                )
+            )
+            dato = self.leer_publicacion(False)
+            return dato["creation_time"] if dato else None
+        except (KeyError, JSONDecodeError, TimeoutException) as error:
+            categoria.errores.agregar_error(error, enlace)
+            return None
+        finally:
+            sleep(self._ritmo.pausa)
+
+    def saltar_hasta_ventana(self, categoria):
+        """Descarta del inicio del feed las publicaciones más recientes que la ventana de tiempo
+
+        El feed está ordenado por fecha de creación, así que se abre la última publicación visible
+        y mientras sea posterior a la ventana se descartan todas y se baja en el feed. Luego se
+        busca con una búsqueda binaria la primera publicación visible que cae dentro de la ventana.
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace abierta con abrir_categoria
+        """
+        descartadas = 0
+        while categoria.publicaciones:
+            creacion = self.fecha_creacion(categoria, categoria.publicaciones[-1][1])
+            if creacion is None or creacion < categoria.fin:
+                break
+            descartadas += len(categoria.publicaciones)
+            categoria.publicaciones.clear()
+            self._driver.switch_to.window(categoria.ventana)
+            self._driver.execute_script(
+                "window.scrollTo(0, document.body.scrollHeight)"
+            )
+            sleep(3 * self._ritmo.pausa)
+            categoria.agregar_publicaciones(self.obtener_publicaciones(categoria))
+        else:
+            log(INFO, "No se encontraron más publicaciones en el feed")
+            categoria.fin_feed = True
+
+        # La última publicación visible está dentro de la ventana o no se pudo leer
+        bajo, alto = 0, len(categoria.publicaciones) - 1
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            creacion = self.fecha_creacion(categoria, categoria.publicaciones[medio][1])
+            if creacion is None:
+                break
+            if creacion >= categoria.fin:
+                bajo = medio + 1
+            else:
+                alto = medio
+        for _ in range(bajo):
+            categoria.publicaciones.popleft()
+        descartadas += bajo
+        self._driver.switch_to.window(categoria.ventana)
+        log(
+            INFO,
+            f"Se descartaron {descartadas} publicaciones posteriores a la ventana de la categoría {categoria.nombre}",
+        )
+
+    def abrir_categoria(self, categoria):
+        """Abre la página de una categoría en una nueva pestaña y mapea sus primeras publicaciones
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace a scrapear
+        """
+        log(INFO, f"Accediendo a la URL de la categoría {categoria.nombre}")
+        self._driver.switch_to.new_window("tab")
+        categoria.ventana = self._driver.current_window_handle
+        self._driver.get(categoria.url)
+
+        log(INFO, f"Mapeando Publicaciones de la categoría {categoria.nombre}")
+        categoria.agregar_publicaciones(self.obtener_publicaciones(categoria))
+        if categoria.fin is not None:
+            self.saltar_hasta_ventana(categoria)
+
+    def abrir_detalle(self, categoria, enlace):
+        """Carga una publicación en la pestaña de detalle de la categoría sin tocar el feed
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace abierta con abrir_categoria
+            enlace (str): Enlace de la publicación
+        """
+        if categoria.ventana_detalle is None:
+            # Pestaña donde se cargan las publicaciones para que el feed no se vuelva a renderizar
+            self._driver.switch_to.new_window("tab")
+            categoria.ventana_detalle = self._driver.current_window_handle
+        else:
+            self._driver.switch_to.window(categoria.ventana_detalle)
+        self._driver.get(enlace)
+
+    def programar_reintento(self, categoria, id_publicacion, enlace):
+        """Agrega una publicación fallida a la cola de reintentos de la categoría con una espera exponencial
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace a la que pertenece la publicación
+            id_publicacion (str): Id de la publicación
+            enlace (str): Enlace de la publicación
+        """
+        intentos = categoria.intentos.get(id_publicacion, 0) + 1
+        if intentos > self._max_reintentos:
+            log(INFO, f"Se descarta la publicación {enlace} tras {intentos} intentos")
+            return
+        categoria.intentos[id_publicacion] = intentos
+        espera = self._espera_reintento * 2 ** (intentos - 1)
+        categoria.agregar_reintento(id_publicacion, enlace, espera)
+        log(INFO, f"Reintento {intentos} de {enlace} en {espera} segundos")
+
+    def avanzar_categoria(self, categoria, quantum=None):
+        """Extrae los datos de las siguientes publicaciones de una categoría abierta
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace abierta con abrir_categoria
+            quantum (int, optional): Cantidad máxima de publicaciones a analizar en este turno. Si es None se analizan hasta cumplir alguna condición de parada. Defaults to None.
+        """
+        inicio = time()
+        # Cuenta la cantidad de publicaciones que analiza el scraper en este turno
+        turnos = 0
+        id_publicacion = enlace = None
+        while not categoria.terminada and (quantum is None or turnos < quantum):
+            i = categoria.indice
+            inicio_item = time()
+            # Indica si el resultado de la publicación es una señal de que la página está saturada
+            senal_error = False
+            # Los reintentos se intercalan con las publicaciones del feed en cuanto cumplen su espera
+            reintento = categoria.siguiente_reintento()
+            # Indica si la publicación se abre desde el feed
+            desde_feed = not reintento and self._navegacion == "click"
+            # Campos de la publicación que se agregan a los registros en formato json
+            campos = {"categoria": categoria.nombre, "item": i + 1}
+            try:
+                log(
+                    INFO,
+                    f"Scrapeando item {i + 1} de la categoría {categoria.nombre}",
+                    extra=campos,
+                )
+                # Eliminar de la memoria requests innecesarios
+                del self._driver.requests
+                if reintento:
+                    id_publicacion, enlace = reintento
+                    categoria.tiempo.reintentos += 1
+                    self.abrir_detalle(categoria, enlace)
+                elif self._navegacion == "url":
+                    id_publicacion, enlace = categoria.publicaciones.popleft()
+                    self.abrir_detalle(categoria, enlace)
+                else:
+                    # Localizar y dar click a la siguiente publicación del feed
+                    id_publicacion, enlace = categoria.publicaciones.popleft()
+                    self._driver.switch_to.window(categoria.ventana)
+                    self._driver.find_element(
+                        By.CSS_SELECTOR,
+                        f'a[href*="/marketplace/item/{id_publicacion}/"]',
+                    ).click()
+                self._wait.until(
+                    EC.presence_of_element_located(
+                        (By.XPATH, "//img[@class='x5yr21d xl1xv1r xh8yej3']")
+                    )
+                )
+                fin_carga = time()
+                campos["id_publicacion"] = id_publicacion
+                # Link de la publicación de facebook
+                enlace = sub(
+                    r"\?.+", "", self._driver.execute_script("return document.URL")
+                )
+                dato = self.leer_publicacion(desde_feed)
+
+                if dato:
+                    # Extraer la fecha de publicación
+                    categoria.fecha_publicacion = dato["creation_time"]
+
+                if (
+                    dato
+                    and categoria.fin is not None
+                    and dato["creation_time"] >= categoria.fin
+                ):
+                    # La publicación es más reciente que la ventana de tiempo de la categoría
+                    log(DEBUG, f"Item {i + 1} posterior a la ventana", extra=campos)
+                elif dato:
+                    log(DEBUG, f"{dato['marketplace_listing_title']}", extra=campos)
+                    categoria.data.agregar_data(dato, categoria.tiempo.fecha, enlace)
+                    if self._almacen is not None:
+                        # Conservar el payload para volver a extraer sus datos si cambia agregar_data
+                        self._almacen.agregar(
+                            id_publicacion, enlace, categoria.tiempo.fecha, dato
+                        )
+                    # Duración en segundos de la carga de la publicación y de la extracción de sus datos
+                    campos["duraciones"] = {
+                        "carga": round(fin_carga - inicio_item, 3),
+                        "extraccion": round(time() - fin_carga, 3),
+                    }
+                    log(INFO, f"Item {i + 1} scrapeado con éxito", extra=campos)
+                    if reintento:
+                        categoria.tiempo.recuperados += 1
+
+                if desde_feed:
+                    # Regresar al inicio donde se encuentran todas las publicaciones de facebook
+                    self._driver.execute_script("window.history.go(-1)")
+
+            except (
+                NoSuchElementException,
+                ElementNotInteractableException,
+                StaleElementReferenceException,
+            ) as error:
+                categoria.errores.agregar_error(error)
+                categoria.num_error += 1
+                senal_error = isinstance(error, StaleElementReferenceException)
+
+            except (
+                AttributeError,
+                KeyError,
+                JSONDecodeError,
+                TimeoutException,
+            ) as error:
+                categoria.errores.agregar_error(error, enlace)
+                if desde_feed:
+                    self._driver.execute_script("window.history.go(-1)")
+                categoria.num_error += 1
+                senal_error = isinstance(error, TimeoutException)
+                if not isinstance(error, AttributeError):
+                    self.programar_reintento(categoria, id_publicacion, enlace)
+            except Exception as error:
+                categoria.errores.agregar_error(error, enlace)
+                categoria.num_error += 1
+                categoria.indice += 1
+                categoria.terminada = True
+                log(CRITICAL, "Se detuvo inesperadamente el programa")
+                log(CRITICAL, f"Causa:\n{error}")
+
+            finally:
+                categoria.indice += 1
+                turnos += 1
+                # Ajustar el ritmo del scraper según la respuesta de la página
+                self._ritmo.registrar(
+                    time() - inicio_item, senal_error, self.pagina_saturada()
+                )
+
+                # Verificar si se ha mapeado todas las publicaciones visibles
+                if not categoria.publicaciones and not categoria.fin_feed:
+                    self._driver.switch_to.window(categoria.ventana)
+                    # Hacer uso del scroll para obtener más publicaciones
+                    self._driver.execute_script(
+                        "window.scrollTo(0, document.body.scrollHeight)"
+                    )
+                    sleep(3 * self._ritmo.pausa)
+                    # Mapear solo las nuevas publicaciones
+                    categoria.agregar_publicaciones(
+                        self.obtener_publicaciones(categoria)
+                    )
+                    if not categoria.publicaciones:
+                        log(INFO, "No se encontraron más publicaciones en el feed")
+                        categoria.fin_feed = True
+                sleep(self._ritmo.pausa)
+                log(
+                    DEBUG,
+                    "-------------------------------------------------------------------",
+                )
+                # Verificar si la categoría cumple alguna condición de parada
+                categoria.fin_feed = categoria.fin_feed or categoria.debe_terminar()
+                # La categoría termina cuando no quedan publicaciones ni reintentos pendientes
+                categoria.terminada = categoria.terminada or (
+                    categoria.fin_feed and not categoria.reintentos
+                )
+
+        # Registrar el tiempo que la categoría ocupó al navegador
+        categoria.servicio += time() - inicio
+
+    def cerrar_categoria(self, categoria):
+        """Cierra la pestaña de una categoría y registra sus datos del tiempo de ejecución
+
+        Args:
+            categoria (Categoria): Categoría de facebook marketplace abierta con abrir_categoria
+        """
+        del self._driver.requests
+        # Guardar algunos datos del tiempo de ejecución del scraper
+        categoria.tiempo.cantidad_real = categoria.indice - categoria.num_error
+        categoria.tiempo.num_error = categoria.num_error
+        for ventana in (categoria.ventana, categoria.ventana_detalle):
+            if ventana in self._driver.window_handles:
+                self._driver.switch_to.window(ventana)
+                self._driver.close()
+        self._driver.switch_to.window(self._driver.window_handles[0])
+        categoria.ventana = categoria.ventana_detalle = None
+        log(INFO, f"Fin de la extraccion de la categoría {categoria.nombre}")
+
+    def mapear_datos(self, url):
+        """Mapea y extrae los datos de las publicaciones de una categoría
+
+        Args:
+            url (str): Link de la página de una categoría en facebook marketplace
+        """
+        log(INFO, "Creando variables")
+        categoria = Categoria(
+            "categoria",
+            url,
+            tiempo=self._tiempo,
+            data=self._data,
+            errores=self._errores,
+        )
+        self.abrir_categoria(categoria)
+        self.avanzar_categoria(categoria)
+        self.cerrar_categoria(categoria)
+
+    def cerrar(self):
+        """Cierra el navegador usado por el scraper"""
+        self._driver.quit()
+
+    def guardar_datos(
+        self,
+        filetype="Data",
+        folder="Data//datos_obtenidos",
+        filename="fb_data",
+        categoria=None,
+    ):
+        """Guarda los datos o errores obtenidos durante la ejecución del scraper
+
+        Args:
+            filetype (str, optional): Indica si la información son datos de las publicaciones o errores. Se acepta Data y Error. Defaults to "Data".
+            folder (str, optional): Ruta del archivo. Defaults to "Data//datos_obtenidos".
+            filename (str, optional): Nombre del archivo. Defaults to "fb_data".
+            categoria (Categoria, optional): Categoría cuya información se va a guardar. Si no es None su nombre se agrega al nombre del archivo. Defaults to None.
+
+        Returns:
+            str: Ruta del archivo guardado o None si no se guardó
+        """
+        log(INFO, f"Guardando {filetype}")
+        data, errores, tiempo = self._data, self._errores, self._tiempo
+        if categoria:
+            data, errores, tiempo = categoria.data, categoria.errores, categoria.tiempo
+            filename = filename + "_" + categoria.nombre
+        # Comprobando si el valor ingresado para la variable filetype es correcto
+        if filetype == "Data":
+            # Registrando toda la información de las publicaciones extraídas por el scraper
+            dataset = data.dataset
+        elif filetype == "Error":
+            # Registrando toda la información de los errores ocurridos durante la ejecución del scraper
+            dataset = errores.errores
+        else:
+            log(
+                INFO,
+                f"El archivo de tipo {filetype} no está admitido. Solo se aceptan los valores Data y Error",
+            )
+            log(
+                ERROR,
+                f"El archivo de tipo {filetype} no se va a guardar por no ser de tipo Data o Error",
+            )
+            return
+        # Crear un dataframe
+        df_fb_mkp_ropa = DataFrame(dataset)
+
+        # Comprobando que el dataset contenga información
+        if len(df_fb_mkp_ropa) == 0:
+            log(
+                INFO,
+                f"El archivo de tipo {filetype} no se va a guardar por no tener información",
+            )
+            return
+
+        # Ejecutando diferentes acciones de acuerdo al tipo de información que se va a guardar
+        if filetype == "Data":
+            # Eliminando las publicaciones cuya fecha de creación está fuera de la ventana de tiempo
+            fecha_extraccion = datetime.strptime(tiempo.fecha, "%d/%m/%Y").timestamp()
+            fin = None
+            if categoria:
+                fecha_extraccion, fin = categoria.inicio, categoria.fin
+            tiempo_creacion = to_numeric(df_fb_mkp_ropa["tiempo_creacion"])
+            fuera = tiempo_creacion < fecha_extraccion
+            if fin is not None:
+                fuera |= tiempo_creacion >= fin
+            df_fb_mkp_ropa = df_fb_mkp_ropa[~fuera]
+            if self._detector is not None and len(df_fb_mkp_ropa):
+                # Asignando a cada publicación el cluster de sus publicaciones repetidas
+                df_fb_mkp_ropa = df_fb_mkp_ropa.assign(
+                    id_cluster=self._detector.agregar(df_fb_mkp_ropa)
+                )
+                self._detector.guardar()
+            # Registrando la cantidad de información que contiene el dataset
+            cantidad = len(df_fb_mkp_ropa)
+            tiempo.cantidad = cantidad
+        else:
+            # Registrando la cantidad de errores ocurridos durante la ejecución del scraper
+            cantidad = tiempo.num_error
+
+        datetime_obj = datetime.strptime(tiempo.fecha, "%d/%m/%Y")
+        # Generando la ruta donde se va a guardar la información
+        filepath = path.join(folder, datetime_obj.strftime("%d-%m-%Y"))
+        # Generando el nombre del archivo que va a contener la información
+        filename = (
+            filename
+            + "_"
+            + datetime_obj.strftime("%d%m%Y")
+            + "_"
+            + str(cantidad)
+            + ".xlsx"
+        )
+        # Verificando si la ruta donde se va a guardar la información existe
+        if not path.exists(filepath):
+            # Creando la ruta donde se va a guardar la información
+            makedirs(filepath)
+        # Guardando la información en un archivo de tipo excel
+        df_fb_mkp_ropa.to_excel(path.join(filepath, filename), index=False)
+        log(INFO, f"{filetype} Guardados Correctamente")
+        return path.join(filepath, filename)
+
+    def guardar_tiempos(self, filename, sheet_name, categoria=None):
+        """Guarda la información del tiempo de ejecución del scraper
+
+        Args:
+            filename (str): Nombre del archivo
+            sheet_name (str): Nombre de la hoja de cálculo
+            categoria (Categoria, optional): Categoría cuyo tiempo se va a guardar. Si no es None se guarda en una hoja con el nombre de la categoría. Defaults to None.
+        """
+        log(INFO, "Guardando tiempos")
+        tiempo = self._tiempo
+        if categoria:
+            tiempo = categoria.tiempo
+            # Excel no admite nombres de hojas de más de 31 caracteres
+            sheet_name = (sheet_name + "_" + categoria.nombre)[:31]
+        # Guardando los parametros finales del tiempo de ejecución del scraper
+        tiempo.set_param_final()
+        # Variable que indica si el encabezados existe o no en el archivo de excel
+        header_exist = True
+        # Verificando si el archivo existe o no
+        if path.isfile(filename):
+            # Leendo el archivo
+            tiempos = load_workbook(filename)
+            # Comprobando si ya existe un sheet con el nombre indicado en la variable sheet_name
+            if sheet_name not in [ws.title for ws in tiempos.worksheets]:
+                # Creando un nuevo sheet
+                tiempos.create_sheet(sheet_name)
+                # Especificar que no existen encabezados en el nuevo sheet
+                header_exist = False
+        else:
+            # Creando un archivo de tipo workbook
+            tiempos = Workbook()
+            tiempos.worksheets[0].title = sheet_name
+            header_exist = False
+
+        # Seleccionar el sheet deseado donde se va a guardar la información
+        worksheet = tiempos[sheet_name]
+
+        # Lista que contiene los encabezados a ser insertados
+        keys = [
+            "Fecha",
+            "Hora Inicio",
+            "Hora Fin",
+            "Cantidad",
+            "Cantidad Real",
+            "Tiempo Ejecucion (min)",
+            "Categorias / Minuto",
+            "Categorias / Minuto real",
+            "Errores",
+            "Tiempo Inicio (seg)",
+            "Reintentos",
+            "Recuperados",
+        ]
+        # Comprobando si el encabezados existe o no
+        if not header_exist:
+            # Otra forma de indicar los encabezados
+            # keys = list(self._tiempo.__dict__.keys())[1:]
+            # Insertando los encabezados al sheet
+            worksheet.append(keys)
+        else:
+            # Un encabezado antiguo tiene menos columnas que los valores actuales
+            header = [cell.value for cell in worksheet[1] if cell.value is not None]
+            for column in range(len(header), len(keys)):
+                worksheet.cell(row=1, column=column + 1, value=keys[column])
+        # Lista que contiene los valores a ser insertados
+        values = list(tiempo.__dict__.values())[1:]
+        # Insertando la información del tiempo al sheet
+        worksheet.append(values)
+        # Guardar la información en un archivo excel
+        tiempos.save(filename)
+        # Cerrar el archivo excel
+        tiempos.close()
+        log(INFO, "Tiempos Guardados Correctamente")
+
+
+class Planificador:
+    """Representa a un planificador que reparte la extracción de varias categorías entre varios navegadores
+
+    Cada navegador abre hasta max_pestanas categorías a la vez y en cada turno avanza la categoría
+    que menos tiempo ha ocupado al navegador con respecto a su prioridad, de modo que ninguna
+    categoría acapare el navegador.
+
+    Attributes:
+        pendientes (list): Montículo con las categorías que aún no se han abierto ordenadas por prioridad
+        num_navegadores (int): Cantidad de navegadores que trabajan en paralelo
+        max_pestanas (int): Cantidad máxima de categorías abiertas a la vez en cada navegador
+        quantum (int): Cantidad de publicaciones que se analizan por turno en una categoría
+    """
+
+    def __init__(self, categorias, num_navegadores=1, max_pestanas=2, quantum=5):
+        """Genera todos los atributos para una instancia de la clase Planificador
+
+        Args:
+            categorias (list): Lista de diccionarios con los parámetros de la clase Categoria
+            num_navegadores (int, optional): Cantidad de navegadores que trabajan en paralelo. Defaults to 1.
+            max_pestanas (int, optional): Cantidad máxima de categorías abiertas a la vez en cada navegador. Defaults to 2.
+            quantum (int, optional): Cantidad de publicaciones que se analizan por turno en una categoría. Defaults to 5.
+        """
+        self._pendientes = [
+            (-categoria.get("prioridad", 1), orden, categoria)
+            for orden, categoria in enumerate(categorias)
+        ]
+        heapify(self._pendientes)
+        self._num_navegadores = max(num_navegadores, 1)
+        self._max_pestanas = max(max_pestanas, 1)
+        self._quantum = max(quantum, 1)
+        self._lock = Lock()
+        self._lock_archivos = Lock()
+
+    @property
+    def pendientes(self):
+        """Retorna el valor actual del atributo pendientes"""
+        return self._pendientes
+
+    def siguiente_categoria(self):
+        """Retorna la categoría pendiente de mayor prioridad
+
+        Returns:
+            Categoria: Categoría a scrapear o None si no quedan categorías pendientes
+        """
+        with self._lock:
+            if not self._pendientes:
+                return None
+            return Categoria(**heappop(self._pendientes)[2])
+
+    def finalizar_categoria(self, scraper, categoria, guardar):
+        """Cierra la pestaña de una categoría y guarda su información
+
+        Args:
+            scraper (ScraperFb): Scraper donde se encuentra abierta la categoría
+            categoria (Categoria): Categoría a finalizar
+            guardar (function): Función que recibe el scraper y la categoría y guarda su información
+        """
+        try:
+            scraper.cerrar_categoria(categoria)
+        except Exception as error:
+            categoria.errores.agregar_error(error)
+        # Los archivos de tiempos son compartidos por todas las categorías
+        with self._lock_archivos:
+            guardar(scraper, categoria)
+
+    def trabajar(self, crear_scraper, guardar):
+        """Extrae las categorías pendientes con un navegador hasta que no quede ninguna
+
+        Args:
+            crear_scraper (function): Función que retorna un scraper con la sesión iniciada
+            guardar (function): Función que recibe el scraper y la categoría y guarda su información
+        """
+        scraper = None
+        activas = []
+        try:
+            scraper = crear_scraper()
+            while True:
+                # Abrir categorías pendientes hasta ocupar todas las pestañas disponibles
+                while len(activas) < self._max_pestanas:
+                    categoria = self.siguiente_categoria()
+                    if categoria is None:
+                        break
+                    activas.append(categoria)
+                    scraper.abrir_categoria(categoria)
+                if not activas:
+                    break
+                # Avanzar la categoría que menos ha ocupado al navegador según su prioridad
+                categoria = min(
+                    activas,
+                    key=lambda categoria: categoria.servicio / categoria.prioridad,
+                )
+                scraper.avanzar_categoria(categoria, self._quantum)
+                if categoria.terminada:
+                    activas.remove(categoria)
+                    self.finalizar_categoria(scraper, categoria, guardar)
+
+        except Exception as error:
+            log(ERROR, f"Error: {error}")
+            log(
+                CRITICAL,
+                f"Se detuvo inesperadamente el navegador {current_thread().name}",
+            )
+            # Guardar lo extraído hasta el momento de las categorías abiertas
+            for categoria in activas:
+                categoria.errores.agregar_error(error)
+                self.finalizar_categoria(scraper, categoria, guardar)
+
+        finally:
+            if scraper:
+                scraper.cerrar()
+
+    def ejecutar(self, crear_scraper, guardar):
+        """Extrae todas las categorías repartiéndolas entre los navegadores
+
+        Args:
+            crear_scraper (function): Función que retorna un scraper con la sesión iniciada
+            guardar (function): Función que recibe el scraper y la categoría y guarda su información
+        """
+        log(INFO, f"Iniciando {self._num_navegadores} navegadores")
+        navegadores = [
+            Thread(
+                target=self.trabajar,
+                args=(crear_scraper, guardar),
+                name=f"Navegador-{num + 1}",
+            )
+            for num in range(self._num_navegadores)
+        ]
+        for navegador in navegadores:
+            navegador.start()
+        for navegador in navegadores:
+            navegador.join()
+
+        if self._pendientes:
+            log(
+                ERROR,
+                f"No se extrajeron {len(self._pendientes)} categorías por fallos en los navegadores",
+            )
+
+
+class ManejadorSalud(BaseHTTPRequestHandler):
+    """Responde las consultas al endpoint de salud del demonio con su estado en formato json"""
+
+    def do_GET(self):
+        """Retorna el estado del demonio en la ruta /health"""
+        if self.path.rstrip("/") != "/health":
+            self.send_error(404)
+            return
+        cuerpo = dumps(self.server.demonio.estado(), ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        """Envía las consultas al endpoint a los registros de ejecución en lugar de la consola"""
+        log(DEBUG, "Health: " + format % args)
+
+
+class Demonio:
+    """Representa a un proceso que mantiene un navegador con la sesión iniciada y scrapea cada cierto tiempo
+
+    En cada ciclo se recorre el feed de cada categoría solo hasta la última publicación extraída
+    en los ciclos anteriores del día, y los archivos del día se reemplazan con todo lo extraído
+    hasta el momento. Al cambiar de día se guardan los tiempos del día anterior y se empieza
+    desde cero. El estado del demonio se consulta en http://127.0.0.1:puerto/health.
+
+    Attributes:
+        categorias (list): Lista de diccionarios con los parámetros de la clase Categoria
+        intervalo (float): Minutos entre el inicio de un ciclo y el siguiente
+        puerto (int): Puerto local del endpoint de salud. Si es None no se inicia el endpoint
+        ciclos (int): Cantidad de ciclos ejecutados
+    """
+
+    def __init__(self, categorias, intervalo=15, puerto=8765):
+        """Genera todos los atributos para una instancia de la clase Demonio
+
+        Args:
+            categorias (list): Lista de diccionarios con los parámetros de la clase Categoria
+            intervalo (float, optional): Minutos entre el inicio de un ciclo y el siguiente. Defaults to 15.
+            puerto (int, optional): Puerto local del endpoint de salud. Si es None no se inicia el endpoint. Defaults to 8765.
+        """
+        self._categorias = categorias
+        self._intervalo = intervalo
+        self._puerto = puerto
+        self._scraper = None
+        self._estados = {}
+        self._fecha = None
+        self._detener = Event()
+        self._lock = Lock()
+        self.ciclos = 0
+        # Información que expone el endpoint de salud
+        self._salud = {
+            "estado": "iniciando",
+            "inicio": strftime("%d/%m/%Y %H:%M:%S"),
+            "ciclos": 0,
+            "ultimo_ciclo": None,
+            "proximo_ciclo": None,
+            "categorias": {},
+        }
+
+    @property
+    def categorias(self):
+        """Retorna el valor actual del atributo categorias"""
+        return self._categorias
+
+    @property
+    def intervalo(self):
+        """Retorna el valor actual del atributo intervalo"""
+        return self._intervalo
+
+    @property
+    def puerto(self):
+        """Retorna el valor actual del atributo puerto"""
+        return self._puerto
+
+    def estado(self):
+        """Retorna una copia del estado del demonio y del rendimiento de cada categoría
+
+        Returns:
+            dict: Estado del demonio
+        """
+        with self._lock:
+            salud = dict(self._salud)
+            salud["categorias"] = {
+                nombre: dict(valores)
+                for nombre, valores in self._salud["categorias"].items()
+            }
+        if self._scraper is not None:
+            salud["pausa"] = round(self._scraper.ritmo.pausa, 2)
+        return salud
+
+    def actualizar_salud(self, **campos):
+        """Actualiza los campos del estado que expone el endpoint de salud"""
+        with self._lock:
+            self._salud.update(campos)
+
+    def detener(self, *args):
+        """Indica al demonio que termine al finalizar la categoría en curso"""
+        log(INFO, "Deteniendo el demonio")
+        self._detener.set()
+
+    def cerrar_dia(self, guardar_tiempos):
+        """Guarda los tiempos de las categorías del día y reinicia su estado
+
+        Args:
+            guardar_tiempos (function): Función que recibe el scraper y la categoría y guarda sus tiempos
+        """
+        for estado in self._estados.values():
+            if estado["ciclos"] and self._scraper is not None:
+                guardar_tiempos(self._scraper, estado["categoria"])
+        self._estados = {}
+        self._fecha = datetime.now().strftime("%d/%m/%Y")
+        with self._lock:
+            self._salud["categorias"] = {}
+
+    def estado_categoria(self, parametros):
+        """Retorna el estado del día de una categoría, creándolo si no existe
+
+        Args:
+            parametros (dict): Parámetros de la clase Categoria
+
+        Returns:
+            dict: Tiempo, datos, errores, publicaciones conocidas y archivos guardados de la categoría
+        """
+        nombre = parametros["nombre"]
+        if nombre not in self._estados:
+            self._estados[nombre] = {
+                "tiempo": Tiempo(),
+                "data": Dataset(),
+                "errores": Errores(),
+                "conocidos": set(),
+                "archivos": [],
+                "procesadas": 0,
+                "num_error": 0,
+                "segundos": 0.0,
+                "ciclos": 0,
+                "categoria": None,
+            }
+        return self._estados[nombre]
+
+    def ciclo(self, guardar):
+        """Extrae las publicaciones nuevas de todas las categorías y actualiza los archivos del día
+
+        Args:
+            guardar (function): Función que recibe el scraper y la categoría, guarda su información y retorna las rutas de los archivos guardados
+        """
+        for parametros in self._categorias:
+            if self._detener.is_set():
+                return
+            estado = self.estado_categoria(parametros)
+            categoria = Categoria(
+                **parametros,
+                tiempo=estado["tiempo"],
+                data=estado["data"],
+                errores=estado["errores"],
+                conocidos=estado["conocidos"],
+            )
+            estado["categoria"] = categoria
+            inicio = time()
+            try:
+                self._scraper.abrir_categoria(categoria)
+                self._scraper.avanzar_categoria(categoria)
+            finally:
+                try:
+                    self._scraper.cerrar_categoria(categoria)
+                except Exception as error:
+                    categoria.errores.agregar_error(error)
+                # Las publicaciones que quedaron en cola no se extrajeron y se revisan en el siguiente ciclo
+                pendientes = {
+                    id_publicacion for id_publicacion, _ in categoria.publicaciones
+                }
+                pendientes.update(reintento[1] for reintento in categoria.reintentos)
+                estado["conocidos"].update(categoria.vistos - pendientes)
+                # Acumular los contadores del día, cerrar_categoria solo registra los del ciclo
+                estado["procesadas"] += categoria.indice
+                estado["num_error"] += categoria.num_error
+                estado["ciclos"] += 1
+                categoria.tiempo.cantidad_real = (
+                    estado["procesadas"] - estado["num_error"]
+                )
+                categoria.tiempo.num_error = estado["num_error"]
+                # Reemplazar los archivos del día por los que contienen lo extraído hasta ahora
+                archivos = [ruta for ruta in guardar(self._scraper, categoria) if ruta]
+                for ruta in estado["archivos"]:
+                    if ruta not in archivos and path.isfile(ruta):
+                        remove(ruta)
+                estado["archivos"] = archivos
+
+                duracion = time() - inicio
+                estado["segundos"] += duracion
+                with self._lock:
+                    self._salud["categorias"][categoria.nombre] = {
+                        "publicaciones_ciclo": categoria.indice,
+                        "errores_ciclo": categoria.num_error,
+                        "duracion_ciclo_seg": round(duracion, 2),
+                        "publicaciones_por_min": (
+                            round(categoria.indice / (duracion / 60), 2)
+                            if duracion
+                            else 0.0
+                        ),
+                        "publicaciones_dia": estado["procesadas"],
+                        "publicaciones_por_min_dia": (
+                            round(estado["procesadas"] / (estado["segundos"] / 60), 2)
+                            if estado["segundos"]
+                            else 0.0
+                        ),
+                        "errores_dia": estado["num_error"],
+                        "guardadas_dia": categoria.tiempo.cantidad,
+                    }
+
+    def ejecutar(self, crear_scraper, guardar, guardar_tiempos):
+        """Ejecuta un ciclo cada intervalo minutos hasta que se detenga el demonio
+
+        Args:
+            crear_scraper (function): Función que retorna un scraper con la sesión iniciada
+            guardar (function): Función que recibe el scraper y la categoría, guarda su información y retorna las rutas de los archivos guardados
+            guardar_tiempos (function): Función que recibe el scraper y la categoría y guarda sus tiempos
+        """
+        servidor = None
+        if self._puerto:
+            servidor = ThreadingHTTPServer(("127.0.0.1", self._puerto), ManejadorSalud)
+            servidor.demonio = self
+            Thread(target=servidor.serve_forever, name="Health", daemon=True).start()
+            log(INFO, f"Endpoint de salud en http://127.0.0.1:{self._puerto}/health")
+        self._fecha = datetime.now().strftime("%d/%m/%Y")
+        try:
+            while not self._detener.is_set():
+                inicio = time()
+                if datetime.now().strftime("%d/%m/%Y") != self._fecha:
+                    log(INFO, "Cambio de día, guardando los tiempos del día anterior")
+                    self.cerrar_dia(guardar_tiempos)
+                self.actualizar_salud(estado="scrapeando")
+                try:
+                    if self._scraper is None:
+                        # El navegador se mantiene abierto y con la sesión iniciada entre ciclos
+                        self._scraper = crear_scraper()
+                    self.ciclo(guardar)
+                except Exception as error:
+                    log(ERROR, f"Error: {error}")
+                    log(
+                        CRITICAL,
+                        "Se detuvo el navegador, se reiniciará en el siguiente ciclo",
+                    )
+                    if self._scraper is not None:
+                        try:
+                            self._scraper.cerrar()
+                        except Exception:
+                            pass
+                    self._scraper = None
+                    self.actualizar_salud(error=str(error))
+                self.ciclos += 1
+                proximo = inicio + self._intervalo * 60
+                self.actualizar_salud(
+                    estado="esperando",
+                    ciclos=self.ciclos,
+                    ultimo_ciclo=strftime("%d/%m/%Y %H:%M:%S", localtime(inicio)),
+                    proximo_ciclo=strftime("%d/%m/%Y %H:%M:%S", localtime(proximo)),
+                )
+                log(INFO, f"Ciclo {self.ciclos} terminado")
+                self._detener.wait(max(proximo - time(), 0))
+        finally:
+            self.actualizar_salud(estado="detenido")
+            if self._scraper is not None:
+                self.cerrar_dia(guardar_tiempos)
+                self._scraper.cerrar()
+                self._scraper = None
+            if servidor:
+                servidor.shutdown()
+                servidor.server_close()
+
+
+def cargar_categorias(filename):
+    """Función que lee las categorías a scrapear de un archivo json
+
+    Args:
+        filename (str): Ruta del archivo json con una lista de categorías. Cada categoría tiene
+            los campos nombre, url y opcionalmente prioridad, max_items y max_minutos
+
+    Returns:
+        list: Lista de diccionarios con los parámetros de cada categoría
+    """
+    with open(filename, encoding="utf-8") as file:
+        return load(file)
+
+
+class FormatoJson(Formatter):
+    """Formatea los registros de ejecución como una línea json que incluye los campos de cada publicación"""
+
+    # Campos extra que se agregan a los registros de las publicaciones
+    CAMPOS = ("categoria", "item", "id_publicacion", "duraciones")
+
+    def format(self, record):
+        """Retorna el registro de ejecución en formato json
+
+        Args:
+            record (logging.LogRecord): Registro de ejecución
+
+        Returns:
+            str: Línea json con la información del registro
+        """
+        registro = {
+            "fecha": self.formatTime(record),
+            "nivel": record.levelname,
+            "hilo": record.threadName,
+            "mensaje": record.getMessage(),
+        }
+        for campo in self.CAMPOS:
+            if hasattr(record, campo):
+                registro[campo] = getattr(record, campo)
+        return dumps(registro, ensure_ascii=False)
+
+
+def config_log(
+    log_folder,
+    log_filename,
+    log_file_mode,
+    log_file_encoding,
+    log_level=INFO,
+    log_json=False,
+):
+    """Función que configura los logs para rastrear al programa
+
+    Los registros se encolan y un hilo en segundo plano los escribe en la consola y en el archivo,
+    de modo que la escritura no retrasa la extracción de las publicaciones
+
+    Args:
+        log_folder (str): Carpeta donde se va a generar el archivo log
+        log_filename (str): Nombre del archivo log a ser generado
+        log_file_mode (str): Modo de guardado del archivo
+        log_file_encoding (str): Codificación usada para el archivo
+        log_level (int | str, optional): Nivel mínimo de los registros. Defaults to INFO.
+        log_json (bool, optional): Indica si el archivo log se genera en formato json lines. Defaults to False.
+
+    Returns:
+        QueueListener: Hilo que escribe los registros, se debe detener al finalizar el programa
+    """
+    # Mostrar solo los errores de los registros que maneja selenium
+    seleniumLogger.setLevel(ERROR)
+    # Mostrar solo los errores de los registros que maneja urllib
+    urllibLogger.setLevel(ERROR)
+    # Mostrar solo los errores de los registros que maneja seleniumwire
+    logger = getLogger("seleniumwire")
+    logger.setLevel(ERROR)
+    environ["WDM_LOG"] = "0"
+    # Generando la ruta donde se va a guardar los registros de ejecución
+    log_path = path.join(log_folder, CURRENT_DATE.strftime("%d-%m-%Y"))
+    # Generando el nombre del archivo que va a contener los registros de ejecución
+    log_filename = (
+        log_filename
+        + "_"
+        + CURRENT_DATE.strftime("%d%m%Y")
+        + (".jsonl" if log_json else ".log")
+    )
+    # Verificando si la ruta donde se va a guardar los registros de ejecución existe
+    if not path.exists(log_path):
+        # Creando la ruta donde se va a guardar los registros de ejecución
+        makedirs(log_path)
+    # Manejadores que escriben los registros desde el hilo en segundo plano
+    stream_handler = StreamHandler()
+    stream_handler.setFormatter(Formatter("%(asctime)s %(message)s"))
+    file_handler = FileHandler(
+        path.join(log_path, log_filename), log_file_mode, log_file_encoding
+    )
+    file_handler.setFormatter(
+        FormatoJson() if log_json else Formatter("%(asctime)s %(message)s")
+    )
+    cola = Queue()
+    listener = QueueListener(cola, stream_handler, file_handler)
+    listener.start()
+    # Configuración básica de los logs que maneja este programa
+    queue_handler = QueueHandler(cola)
+    # El mensaje se encola sin formato, cada manejador le da su propio formato
+    queue_handler.setFormatter(Formatter("%(message)s"))
+    basicConfig(level=log_level, handlers=[queue_handler])
+    return listener
+
+
+def validar_parametros(parametros):
+    """Función que valida si los parámetros a usar están definidos
+
+    Args:
+        parametros (list): Lista de parámetros
+
+    Returns:
+        bool: Indica si los parámetros son validos
+    """
+    for parametro in parametros:
+        # Verifica que el parámetro haya sido definido
+        if not parametro:
+            log(ERROR, "Parámetros incorrectos")
+            return False
+
+    log(INFO, "Parámetros válidos")
+    return True
+
+
+def main(intervalo=None, desde=None, hasta=None, horas=None):
+    """Función que ejecuta el scraper una vez, como demonio o para rellenar días anteriores
+
+    Args:
+        intervalo (float, optional): Minutos entre los ciclos del demonio. Si es None se usa la variable DAEMON_INTERVAL y si no está definida el scraper se ejecuta una sola vez. Defaults to None.
+        desde (str, optional): Primer día a rellenar en formato %d/%m/%Y. Si no es None se extraen las publicaciones de los días indicados en ventanas de tiempo. Defaults to None.
+        hasta (str, optional): Último día a rellenar en formato %d/%m/%Y. Si es None se rellena solo el día desde. Defaults to None.
+        horas (int, optional): Duración en horas de cada ventana del relleno. Si es None se usa la variable BACKFILL_WINDOW_HOURS. Defaults to None.
+    """
+    listener = None
+    try:
+        # Cargar variables de entorno
+        load_dotenv()
+
+        # Formato para el debugger
+        listener = config_log(
+            "Log",
+            "fb_ropa_log",
+            "w",
+            "utf-8",
+            (getenv("LOG_LEVEL") or "INFO").upper(),
+            getenv("LOG_JSON", "False").lower() == "true",
+        )
+        log(INFO, "Configurando Formato Básico del Debugger")
+        log(INFO, "Variables de entorno cargadas")
+
+        # Url de la categoría a scrapear
+        url_ropa = getenv("URL_CATEGORY")
+
+        # Parámetros opcionales para scrapear varias categorías en paralelo
+        categories_file = getenv("CATEGORIES_FILE")
+        num_browsers = int(getenv("NUM_BROWSERS") or "1")
+        max_tabs = int(getenv("MAX_TABS") or "2")
+        quantum = int(getenv("QUANTUM") or "5")
+
+        # Parámetros opcionales del ritmo del scraper
+        min_pause = float(getenv("MIN_PAUSE") or "1")
+        max_pause = float(getenv("MAX_PAUSE") or "30")
+
+        # Parámetros para guardar la data extraída por el scraper
+        data_filename = getenv("DATA_FILENAME")
+        data_folder = getenv("DATA_FOLDER")
+
+        # Parámetros para guardar la medición de la ejecución del scraper
+        filename_tiempos = getenv("FILENAME_TIEMPOS")
+        sheet_tiempos = getenv("SHEET_TIEMPOS")
+
+        # Parámetros para guardar los errores durante la ejecución por el scraper
+        error_filename = getenv("ERROR_FILENAME")
+        error_folder = getenv("ERROR_FOLDER")
+
+        # Parámetros de inicio de sesión
+        user = getenv("FB_USERNAME")
+        password = getenv("FB_PASSWORD")
+
+        # Parámetros opcionales del perfil del navegador
+        headless = getenv("HEADLESS", "False").lower() == "true"
+        block_assets = getenv("BLOCK_ASSETS", "False").lower() == "true"
+        window_size = getenv("WINDOW_SIZE")
+
+        # Parámetros opcionales para conservar la sesión entre ejecuciones
+        session_file = getenv("SESSION_FILE")
+        user_data_dir = getenv("USER_DATA_DIR")
+
+        # Parámetros opcionales para resolver el chromedriver
+        driver_path = getenv("CHROMEDRIVER_PATH")
+        driver_cache_file = getenv("DRIVER_CACHE_FILE") or "Drivers//chromedriver.json"
+        driver_offline = getenv("DRIVER_OFFLINE", "False").lower() == "true"
+
+        # Parámetro opcional para abrir las publicaciones por click o por url
+        navigation = getenv("NAVIGATION") or "click"
+
+        # Parámetros opcionales para reintentar las publicaciones fallidas
+        max_retries = int(getenv("MAX_RETRIES") or "3")
+        retry_delay = float(getenv("RETRY_DELAY") or "5")
+
+        # Parámetros opcionales del modo demonio
+        daemon_interval = intervalo or float(getenv("DAEMON_INTERVAL") or "0")
+        health_port = int(getenv("HEALTH_PORT") or "8765")
+
+        # Parámetros opcionales del relleno de días anteriores
+        backfill_state = getenv("BACKFILL_STATE") or "Data//relleno.json"
+        window_hours = horas or int(getenv("BACKFILL_WINDOW_HOURS") or "24")
+
+        # Parámetros opcionales del detector de publicaciones repetidas
+        duplicates_index = getenv("DUPLICATES_INDEX")
+        skip_reposts = getenv("SKIP_REPOSTS", "False").lower() == "true"
+        detector = None
+        if duplicates_index:
+            from .duplicates import DetectorDuplicados
+
+            detector = DetectorDuplicados(duplicates_index)
+
+        # Parámetro opcional del archivo de payloads de las publicaciones
+        payload_archive = getenv("PAYLOAD_ARCHIVE")
+        almacen = None
+        if payload_archive:
+            from .archive import AlmacenPayloads
+
+            almacen = AlmacenPayloads(payload_archive)
+
+        # Parámetro opcional del índice de búsqueda que se actualiza con cada archivo guardado
+        search_index = getenv("SEARCH_INDEX")
+
+        # Parámetro opcional de los agregados por vendedor y locación que se actualizan con cada archivo guardado
+        aggregates_store = getenv("AGGREGATES_STORE")
+        agregados = None
+        if aggregates_store:
+            from .aggregates import AgregadosMercado
+
+            agregados = AgregadosMercado(aggregates_store)
+
+        def indexar(filename, anterior=None):
+            if not filename:
+                return
+            # El demonio y el relleno reemplazan el archivo anterior de la categoría
+            reemplazado = anterior if anterior != filename else None
+            if search_index:
+                try:
+                    from .search import IndiceTexto
+
+                    indice = IndiceTexto(search_index)
+                    indice.indexar_archivo(filename)
+                    if reemplazado in indice.archivos:
+                        indice.eliminar_archivo(reemplazado)
+                except Exception as error:
+                    log(ERROR, f"No se pudo indexar el archivo {filename}: {error}")
+            if agregados is not None:
+                try:
+                    agregados.agregar_archivo(filename)
+                    if reemplazado in agregados.archivos:
+                        agregados.eliminar_archivo(reemplazado)
+                    agregados.guardar()
+                except Exception as error:
+                    log(ERROR, f"No se pudo agregar el archivo {filename}: {error}")
+
+        # Validar parámetros
+        if not validar_parametros(
+            [
+                url_ropa or categories_file,
+                data_filename,
+                data_folder,
+                filename_tiempos,
+                sheet_tiempos,
+                error_filename,
+                error_folder,
+                user,
+                password,
+            ]
+        ):
+            return
+
+        # Inicializar scrapper
+        driver_path = resolver_chromedriver(
+            driver_cache_file, driver_path, driver_offline
+        )
+
+        def nuevo_scraper(perfil):
+            return ScraperFb(
+                headless,
+                block_assets,
+                window_size,
+                perfil,
+                driver_path,
+                ControladorRitmo(pausa_min=min_pause, pausa_max=max_pause),
+                navigation,
+                max_retries,
+                retry_delay,
+                detector,
+                skip_reposts,
+                almacen,
+            )
+
+        if daemon_interval and not desde:
+            categorias = (
+                cargar_categorias(categories_file)
+                if categories_file
+                else [{"nombre": "categoria", "url": url_ropa}]
+            )
+
+            def crear_scraper():
+                scraper = nuevo_scraper(user_data_dir)
+                scraper.iniciar_sesion(user, password, session_file)
+                return scraper
+
+            # Archivo de datos guardado en el ciclo anterior de cada categoría
+            anteriores = {}
+
+            def guardar(scraper, categoria):
+                archivo_data = scraper.guardar_datos(
+                    "Data", data_folder, data_filename, categoria
+                )
+                indexar(archivo_data, anteriores.get(categoria.nombre))
+                anteriores[categoria.nombre] = archivo_data
+                archivo_error = scraper.guardar_datos(
+                    "Error", error_folder, error_filename, categoria
+                )
+                return [archivo_data, archivo_error]
+
+            def guardar_tiempos(scraper, categoria):
+                scraper.guardar_tiempos(filename_tiempos, sheet_tiempos, categoria)
+
+            # Extracción de datos cada daemon_interval minutos con el mismo navegador
+            demonio = Demonio(categorias, daemon_interval, health_port)
+            signal(SIGINT, demonio.detener)
+            signal(SIGTERM, demonio.detener)
+            demonio.ejecutar(crear_scraper, guardar, guardar_tiempos)
+            log(INFO, "Programa finalizado")
+            return
+
+        if categories_file or desde:
+            # Lock que evita iniciar sesión en varios navegadores al mismo tiempo
+            lock_sesion = Lock()
+
+            def crear_scraper():
+                # Cada navegador necesita su propia carpeta de perfil de chrome
+                perfil = user_data_dir
+                if user_data_dir and num_browsers > 1:
+                    perfil = user_data_dir + "_" + current_thread().name
+                with lock_sesion:
+                    scraper = nuevo_scraper(perfil)
+                    scraper.iniciar_sesion(user, password, session_file)
+                return scraper
+
+            categorias = (
+                cargar_categorias(categories_file)
+                if categories_file
+                else [{"nombre": "categoria", "url": url_ropa}]
+            )
+
+            if desde:
+                from .backfill import Relleno
+
+                relleno = Relleno(backfill_state, desde, hasta or desde, window_hours)
+
+                def guardar(scraper, categoria):
+                    # Archivos de una ejecución anterior que no terminó la ventana
+                    anteriores = relleno.archivos(categoria)
+                    archivo_data = scraper.guardar_datos(
+                        "Data", data_folder, data_filename, categoria
+                    )
+                    indexar(archivo_data, anteriores[0] if anteriores else None)
+                    archivo_error = scraper.guardar_datos(
+                        "Error", error_folder, error_filename, categoria
+                    )
+                    scraper.guardar_tiempos(filename_tiempos, sheet_tiempos, categoria)
+                    relleno.registrar(categoria, [archivo_data, archivo_error])
+
+                # Cada ventana de tiempo de cada categoría se extrae como una categoría
+                categorias = relleno.ventanas(categorias)
+
+            else:
+
+                def guardar(scraper, categoria):
+                    indexar(
+                        scraper.guardar_datos(
+                            "Data", data_folder, data_filename, categoria
+                        )
+                    )
+                    scraper.guardar_datos(
+                        "Error", error_folder, error_filename, categoria
+                    )
+                    scraper.guardar_tiempos(filename_tiempos, sheet_tiempos, categoria)
+
+            # Extracción de datos de todas las categorías
+            planificador = Planificador(categorias, num_browsers, max_tabs, quantum)
+            planificador.ejecutar(crear_scraper, guardar)
+            log(INFO, "Programa finalizado")
+            return
+
+        scraper = nuevo_scraper(user_data_dir)
+
+        # Iniciar sesión
+        scraper.iniciar_sesion(user, password, session_file)
+
+        # Extracción de datos
+        scraper.mapear_datos(url_ropa)
+
+        # Guardando la data extraída por el scraper
+        indexar(scraper.guardar_datos("Data", data_folder, data_filename))
+
+        # Guardando los errores extraídos por el scraper
+        scraper.guardar_datos("Error", error_folder, error_filename)
+
+        # Guardando los tiempos durante la ejecución del scraper
+        scraper.guardar_tiempos(filename_tiempos, sheet_tiempos)
+        log(INFO, "Programa finalizado")
+
+    except Exception as error:
+        log(ERROR, f"Error: {error}")
+        log(INFO, "Programa ejecutado con fallos")
+
+    finally:
+        try:
+            del scraper
+        except:
+            pass
+        # Escribir los registros pendientes y liberar el archivo log
+        if listener:
+            listener.stop()
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+from datetime import datetime
+from json import dump, load
+from logging import INFO, log
+from os import makedirs, path, remove, replace
+from re import compile, split
+from unicodedata import category, normalize
+from zlib import compress, decompress
+
+from numpy import (
+    arange,
+    array,
+    concatenate,
+    cumsum,
+    diff,
+    frombuffer,
+    int64,
+    intersect1d,
+    load as load_arrays,
+    savez,
+    searchsorted,
+    setdiff1d,
+    uint8,
+    uint32,
+    union1d,
+    unique,
+)
+from pandas import concat, DataFrame, read_feather, Timedelta, Timestamp, to_numeric
+
+from .preprocessing import CACHE_FOLDER, read_dataset, SCHEMA_FACEBOOK
+
+# Columnas de las publicaciones que se indexan
+COLUMNAS_TEXTO = ["titulo_marketplace", "descripcion"]
+# Columnas de las publicaciones que se guardan para mostrar los resultados y aplicar los filtros
+COLUMNAS_DOCUMENTO = [
+    "titulo_marketplace",
+    "precio",
+    "tipo_moneda",
+    "tiempo_creacion",
+    "enlace",
+]
+# Palabras del español que no aportan a la búsqueda
+STOPWORDS = frozenset(
+    "a al con de del el en la las lo los o para por que se sin su sus un una uno unos unas y".split()
+)
+TOKEN = compile(r"[a-z0-9]+")
+
+
+def normalizar(texto):
+    """Función que convierte un texto a minúsculas y sin tildes
+
+    Args:
+        texto (str): Texto
+
+    Returns:
+        str: Texto normalizado
+    """
+    return "".join(
+        caracter
+        for caracter in normalize("NFKD", texto.lower())
+        if category(caracter) != "Mn"
+    )
+
+
+def tokenizar(texto):
+    """Función que separa un texto en palabras normalizadas, sin tildes ni stopwords
+
+    Args:
+        texto (str): Texto
+
+    Returns:
+        list: Lista de palabras
+    """
+    if not isinstance(texto, str):
+        return []
+    return [
+        token for token in TOKEN.findall(normalizar(texto)) if token not in STOPWORDS
+    ]
+
+
+def interpretar_consulta(consulta):
+    """Función que interpreta una consulta booleana
+
+    Las palabras de un grupo se combinan con AND y los grupos se separan con OR. Una palabra que
+    empieza con - se excluye y una palabra que termina en * se busca como prefijo.
+
+    Args:
+        consulta (str): Consulta, por ejemplo "polo* algodon -nino OR camisa"
+
+    Returns:
+        list: Lista de grupos, cada uno es una lista de tuplas (palabra, prefijo, excluida)
+    """
+    grupos = []
+    for texto in split(r"\s+OR\s+", consulta.strip()):
+        grupo = []
+        for palabra in texto.split():
+            excluida = palabra.startswith("-")
+            prefijo = palabra.endswith("*")
+            tokens = TOKEN.findall(normalizar(palabra))
+            for posicion, token in enumerate(tokens):
+                # Las stopwords no se indexan, salvo que se busquen como prefijo
+                ultimo = posicion == len(tokens) - 1
+                if token in STOPWORDS and not (prefijo and ultimo):
+                    continue
+                grupo.append((token, prefijo and ultimo, excluida))
+        if grupo:
+            grupos.append(grupo)
+    return grupos
+
+
+def comprimir_postings(documentos):
+    """Función que comprime una lista ordenada de documentos guardando las diferencias entre ellos
+
+    Args:
+        documentos (list): Lista ordenada de números de documento
+
+    Returns:
+        bytes: Lista comprimida
+    """
+    return compress(diff(array(documentos, int64), prepend=0).astype(uint32).tobytes())
+
+
+def descomprimir_postings(datos):
+    """Función que descomprime una lista de documentos generada con comprimir_postings
+
+    Args:
+        datos (bytes): Lista comprimida
+
+    Returns:
+        numpy.ndarray: Números de documento ordenados
+    """
+    return cumsum(frombuffer(decompress(datos), uint32), dtype=int64)
+
+
+class Segmento:
+    """Representa al índice invertido de un archivo del scraper
+
+    Attributes:
+        terminos (numpy.ndarray): Palabras indexadas ordenadas alfabéticamente
+        posiciones (numpy.ndarray): Posición de la lista comprimida de cada palabra dentro de postings
+        postings (bytes): Listas de documentos comprimidas de todas las palabras
+        documentos (pandas.core.frame.DataFrame): Información de las publicaciones para los resultados y filtros
+    """
+
+    def __init__(self, terminos, posiciones, postings, documentos):
+        """Genera todos los atributos para una instancia de la clase Segmento
+
+        Args:
+            terminos (numpy.ndarray): Palabras indexadas ordenadas alfabéticamente
+            posiciones (numpy.ndarray): Posición de la lista comprimida de cada palabra
+            postings (bytes): Listas de documentos comprimidas de todas las palabras
+            documentos (pandas.core.frame.DataFrame): Información de las publicaciones
+        """
+        self._terminos = terminos
+        self._posiciones = posiciones
+        self._postings = postings
+        self._documentos = documentos
+
+    @property
+    def documentos(self):
+        """Retorna el valor actual del atributo documentos"""
+        return self._documentos
+
+    def postings(self, indice):
+        """Retorna los documentos que contienen a la palabra en la posición indicada
+
+        Args:
+            indice (int): Posición de la palabra en terminos
+
+        Returns:
+            numpy.ndarray: Números de documento ordenados
+        """
+        inicio, fin = self._posiciones[indice], self._posiciones[indice + 1]
+        return descomprimir_postings(self._postings[inicio:fin])
+
+    def buscar(self, termino, prefijo=False):
+        """Retorna los documentos que contienen a una palabra o a una palabra que empieza con ella
+
+        Args:
+            termino (str): Palabra normalizada
+            prefijo (bool, optional): Indica si se busca como prefijo. Defaults to False.
+
+        Returns:
+            numpy.ndarray: Números de documento ordenados
+        """
+        inicio = searchsorted(self._terminos, termino, "left")
+        if prefijo:
+            fin = searchsorted(self._terminos, termino + "\uffff", "left")
+        else:
+            fin = inicio + int(
+                inicio < len(self._terminos) and self._terminos[inicio] == termino
+            )
+        if fin <= inicio:
+            return array([], int64)
+        return unique(
+            concatenate([self.postings(indice) for indice in range(inicio, fin)])
+        )
+
+    def evaluar(self, grupos):
+        """Retorna los documentos que cumplen una consulta interpretada con interpretar_consulta
+
+        Args:
+            grupos (list): Grupos de la consulta
+
+        Returns:
+            numpy.ndarray: Números de documento ordenados
+        """
+        resultado = array([], int64)
+        for grupo in grupos:
+            incluidos = None
+            excluidos = array([], int64)
+            for termino, prefijo, excluida in grupo:
+                documentos = self.buscar(termino, prefijo)
+                if excluida:
+                    excluidos = union1d(excluidos, documentos)
+                elif incluidos is None:
+                    incluidos = documentos
+                else:
+                    incluidos = intersect1d(incluidos, documentos, assume_unique=True)
+            if incluidos is None:
+                # Un grupo solo con exclusiones parte de todos los documentos
+                incluidos = arange(len(self._documentos), dtype=int64)
+            resultado = union1d(resultado, setdiff1d(incluidos, excluidos, True))
+        return resultado
+
+    def guardar(self, filename):
+        """Guarda el segmento en un archivo npz con el diccionario y un archivo feather con las publicaciones
+
+        Args:
+            filename (str): Ruta del segmento sin extensión
+        """
+        with open(filename + ".npz.tmp", "wb") as file:
+            savez(
+                file,
+                terminos=self._terminos,
+                posiciones=self._posiciones,
+                postings=frombuffer(self._postings, uint8),
+            )
+        self._documentos.to_feather(filename + ".feather.tmp")
+        replace(filename + ".npz.tmp", filename + ".npz")
+        replace(filename + ".feather.tmp", filename + ".feather")
+
+
+def crear_segmento(df_data):
+    """Función que genera el índice invertido de las publicaciones de un archivo
+
+    Args:
+        df_data (pandas.core.frame.DataFrame): Publicaciones extraídas por el scraper
+
+    Returns:
+        Segmento: Índice invertido de las publicaciones
+    """
+    indice = {}
+    textos = df_data[COLUMNAS_TEXTO[0]].fillna("").astype(str)
+    for columna in COLUMNAS_TEXTO[1:]:
+        textos = textos + " " + df_data[columna].fillna("").astype(str)
+    for documento, texto in enumerate(textos):
+        for token in set(tokenizar(texto)):
+            indice.setdefault(token, []).append(documento)
+
+    terminos = sorted(indice)
+    bloques = [comprimir_postings(indice[termino]) for termino in terminos]
+    posiciones = cumsum([0] + [len(bloque) for bloque in bloques], dtype=int64)
+    documentos = df_data[COLUMNAS_DOCUMENTO].reset_index(drop=True)
+    documentos["precio"] = to_numeric(documentos["precio"], errors="coerce")
+    documentos["tipo_moneda"] = documentos["tipo_moneda"].astype(str)
+    return Segmento(
+        array(terminos, dtype=str), posiciones, b"".join(bloques), documentos
+    )
+
+
+def cargar_segmento(filename):
+    """Función que lee un segmento guardado con Segmento.guardar
+
+    Args:
+        filename (str): Ruta del segmento sin extensión
+
+    Returns:
+        Segmento: Índice invertido de las publicaciones
+    """
+    with load_arrays(filename + ".npz") as arreglos:
+        terminos = arreglos["terminos"]
+        posiciones = arreglos["posiciones"]
+        postings = arreglos["postings"].tobytes()
+    return Segmento(terminos, posiciones, postings, read_feather(filename + ".feather"))
+
+
+class IndiceTexto:
+    """Representa a un índice invertido en disco sobre los títulos y descripciones de las publicaciones
+
+    Cada archivo del scraper se indexa en un segmento independiente, de modo que los archivos
+    nuevos se agregan sin volver a indexar los anteriores.
+
+    Attributes:
+        folder (str): Carpeta donde se guardan los segmentos
+        archivos (dict): Número de segmento y fecha de modificación de cada archivo indexado
+    """
+
+    def __init__(self, folder):
+        """Genera todos los atributos para una instancia de la clase IndiceTexto
+
+        Args:
+            folder (str): Carpeta donde se guardan los segmentos
+        """
+        self._folder = folder
+        self._manifiesto = path.join(folder, "manifiesto.json")
+        self._archivos = {}
+        if path.isfile(self._manifiesto):
+            with open(self._manifiesto, encoding="utf-8") as file:
+                self._archivos = load(file)
+        # Segmentos leídos del disco
+        self._segmentos = {}
+
+    @property
+    def folder(self):
+        """Retorna el valor actual del atributo folder"""
+        return self._folder
+
+    @property
+    def archivos(self):
+        """Retorna el valor actual del atributo archivos"""
+        return self._archivos
+
+    def ruta_segmento(self, segmento):
+        """Retorna la ruta sin extensión de un segmento
+
+        Args:
+            segmento (int): Número del segmento
+
+        Returns:
+            str: Ruta del segmento
+        """
+        return path.join(self._folder, f"segmento_{segmento}")
+
+    def segmento(self, segmento):
+        """Retorna un segmento, leyéndolo del disco la primera vez
+
+        Args:
+            segmento (int): Número del segmento
+
+        Returns:
+            Segmento: Índice invertido del segmento
+        """
+        if segmento not in self._segmentos:
+            self._segmentos[segmento] = cargar_segmento(self.ruta_segmento(segmento))
+        return self._segmentos[segmento]
+
+    def indexar_archivo(self, filename, df_data=None, cache_folder=CACHE_FOLDER):
+        """Indexa un archivo del scraper en un nuevo segmento. Si el archivo ya estaba indexado se reemplaza
+
+        Args:
+            filename (str): Ruta del archivo del scraper
+            df_data (pandas.core.frame.DataFrame, optional): Publicaciones del archivo. Si es None se lee el archivo. Defaults to None.
+            cache_folder (str, optional): Carpeta de la caché de lectura. Defaults to CACHE_FOLDER.
+
+        Returns:
+            int: Cantidad de publicaciones indexadas
+        """
+        if df_data is None:
+            df_data = read_dataset(
+                filename, schema=SCHEMA_FACEBOOK, cache_folder=cache_folder
+            )
+        registro = self._archivos.get(filename)
+        if registro:
+            segmento = registro[0]
+        else:
+            segmento = max((num for num, _ in self._archivos.values()), default=-1)
+            segmento += 1
+        if not path.exists(self._folder):
+            makedirs(self._folder)
+        nuevo = crear_segmento(df_data)
+        nuevo.guardar(self.ruta_segmento(segmento))
+        self._segmentos[segmento] = nuevo
+        self._archivos[filename] = [segmento, path.getmtime(filename)]
+        self.guardar_manifiesto()
+        log(INFO, f"Archivo {filename} indexado en el segmento {segmento}")
+        return len(df_data)
+
+    def eliminar_archivo(self, filename):
+        """Elimina del índice el segmento de un archivo
+
+        Args:
+            filename (str): Ruta del archivo del scraper
+        """
+        segmento = self._archivos.pop(filename)[0]
+        self._segmentos.pop(segmento, None)
+        for extension in (".npz", ".feather"):
+            if path.isfile(self.ruta_segmento(segmento) + extension):
+                remove(self.ruta_segmento(segmento) + extension)
+        self.guardar_manifiesto()
+
+    def actualizar(self, filenames, cache_folder=CACHE_FOLDER):
+        """Indexa los archivos nuevos o modificados del scraper y elimina los que ya no existen
+
+        Args:
+            filenames (list): Lista de rutas de todos los archivos del scraper
+            cache_folder (str, optional): Carpeta de la caché de lectura. Defaults to CACHE_FOLDER.
+
+        Returns:
+            int: Cantidad de publicaciones indexadas
+        """
+        vigentes = set(filenames)
+        for filename in [nombre for nombre in self._archivos if nombre not in vigentes]:
+            # El demonio y el relleno reemplazan el archivo del día por uno con otro nombre
+            self.eliminar_archivo(filename)
+            log(INFO, f"Archivo {filename} eliminado del índice")
+        cantidad = 0
+        for filename in filenames:
+            registro = self._archivos.get(filename)
+            if registro and registro[1] == path.getmtime(filename):
+                continue
+            cantidad += self.indexar_archivo(filename, cache_folder=cache_folder)
+        return cantidad
+
+    def guardar_manifiesto(self):
+        """Guarda la lista de archivos indexados"""
+        with open(self._manifiesto + ".tmp", "w", encoding="utf-8") as file:
+            dump(self._archivos, file)
+        replace(self._manifiesto + ".tmp", self._manifiesto)
+
+    def buscar(
+        self,
+        consulta,
+        precio_min=None,
+        precio_max=None,
+        desde=None,
+        hasta=None,
+        moneda=None,
+    ):
+        """Busca las publicaciones que cumplen una consulta booleana y los filtros indicados
+
+        Args:
+            consulta (str): Consulta booleana, ver interpretar_consulta
+            precio_min (float, optional): Precio mínimo. Defaults to None.
+            precio_max (float, optional): Precio máximo. Defaults to None.
+            desde (str, optional): Fecha de creación mínima en formato %d/%m/%Y. Defaults to None.
+            hasta (str, optional): Fecha de creación máxima en formato %d/%m/%Y. Defaults to None.
+            moneda (str, optional): Tipo de moneda, por ejemplo PEN. Defaults to None.
+
+        Returns:
+            pandas.core.frame.DataFrame: Publicaciones encontradas
+        """
+        grupos = interpretar_consulta(consulta)
+        resultados = []
+        for segmento, _ in sorted(self._archivos.values()):
+            indice = self.segmento(segmento)
+            documentos = indice.documentos.iloc[indice.evaluar(grupos)]
+            filtro = True
+            if precio_min is not None:
+                filtro = filtro & (documentos["precio"] >= precio_min)
+            if precio_max is not None:
+                filtro = filtro & (documentos["precio"] <= precio_max)
+            if desde:
+                filtro = filtro & (
+                    documentos["tiempo_creacion"]
+                    >= Timestamp(datetime.strptime(desde, "%d/%m/%Y"))
+                )
+            if hasta:
+                filtro = filtro & (
+                    documentos["tiempo_creacion"]
+                    < Timestamp(datetime.strptime(hasta, "%d/%m/%Y"))
+                    + Timedelta(days=1)
+                )
+            if moneda:
+                filtro = filtro & (documentos["tipo_moneda"] == moneda.upper())
+            if filtro is not True:
+                documentos = documentos[filtro]
+            resultados.append(documentos)
+        if not resultados:
+            return DataFrame(columns=COLUMNAS_DOCUMENTO)
+        return concat(resultados, ignore_index=True)
@@ -0,0 +1,439 @@
+from json import dump, load
+from logging import INFO, log
+from os import makedirs, path, replace
+
+from numpy import (
+    arcsin,
+    argsort,
+    array,
+    concatenate,
+    cos,
+    degrees,
+    empty,
+    float64,
+    floor,
+    full,
+    int32,
+    int64,
+    isfinite,
+    load as load_arrays,
+    radians,
+    savez,
+    searchsorted,
+    sin,
+    sqrt,
+)
+from pandas import DataFrame, to_numeric
+
+from .preprocessing import CACHE_FOLDER, read_dataset, SCHEMA_FACEBOOK
+
+# Tamaño en grados de las celdas de la grilla, aproximadamente 1 km en el ecuador
+TAMANO_CELDA = 0.01
+# Radio medio de la tierra en kilómetros
+RADIO_TIERRA = 6371.0088
+# Desplazamiento que convierte las filas y columnas de la grilla en enteros positivos
+DESPLAZAMIENTO = 1 << 21
+# Enlace de una publicación a partir de su id
+ENLACE_PUBLICACION = "https://www.facebook.com/marketplace/item/{}/"
+# Tipo de dato de los códigos de moneda, texto de hasta 8 caracteres
+MONEDA = "U8"
+
+
+def ids_publicaciones(enlaces):
+    """Función que retorna el id de cada publicación a partir de su enlace
+
+    Los ids se convierten con int para no perder dígitos: un id mayor a 2^53 no cabe en un float.
+
+    Args:
+        enlaces (pandas.core.series.Series): Enlaces de las publicaciones
+
+    Returns:
+        numpy.ndarray: Id de cada publicación, -1 si el enlace no tiene id
+    """
+    ids = enlaces.astype(str).str.extract(r"/item/(\d+)")[0]
+    return array(
+        [int(numero) if isinstance(numero, str) else -1 for numero in ids], int64
+    )
+
+
+class IndiceEspacial:
+    """Representa a un índice espacial de las publicaciones extraídas por el scraper
+
+    Las coordenadas se guardan en arreglos de numpy y se agrupan en las celdas de una grilla. Los
+    arreglos se ordenan por celda, de modo que una consulta solo recorre las celdas que cubre.
+
+    Attributes:
+        tamano_celda (float): Tamaño en grados de las celdas de la grilla
+        latitud (numpy.ndarray): Latitud de cada publicación
+        longitud (numpy.ndarray): Longitud de cada publicación
+        precio (numpy.ndarray): Precio de cada publicación, nan si no tiene precio
+        moneda (numpy.ndarray): Tipo de moneda del precio de cada publicación
+        id_publicacion (numpy.ndarray): Id de cada publicación, -1 si no tiene enlace
+        archivo (numpy.ndarray): Número del archivo del que proviene cada publicación
+        archivos (dict): Número y fecha de modificación de cada archivo indexado
+    """
+
+    def __init__(self, tamano_celda=TAMANO_CELDA):
+        """Genera todos los atributos para una instancia de la clase IndiceEspacial
+
+        Args:
+            tamano_celda (float, optional): Tamaño en grados de las celdas de la grilla. Defaults to TAMANO_CELDA.
+        """
+        self._tamano_celda = tamano_celda
+        self._latitud = empty(0, float64)
+        self._longitud = empty(0, float64)
+        self._precio = empty(0, float64)
+        self._moneda = empty(0, MONEDA)
+        self._id_publicacion = empty(0, int64)
+        self._archivo = empty(0, int32)
+        self._archivos = {}
+        # Claves de las celdas ordenadas y posición de cada publicación en ese orden
+        self._celdas = None
+        self._orden = None
+
+    @property
+    def tamano_celda(self):
+        """Retorna el valor actual del atributo tamano_celda"""
+        return self._tamano_celda
+
+    @property
+    def archivos(self):
+        """Retorna el valor actual del atributo archivos"""
+        return self._archivos
+
+    def __len__(self):
+        """Retorna la cantidad de publicaciones indexadas"""
+        return len(self._latitud)
+
+    def celda(self, latitud, longitud):
+        """Retorna la fila y la columna de la grilla que corresponden a unas coordenadas
+
+        Args:
+            latitud (float | numpy.ndarray): Latitud
+            longitud (float | numpy.ndarray): Longitud
+
+        Returns:
+            tuple: Fila y columna de la grilla
+        """
+        fila = floor(latitud / self._tamano_celda).astype(int64) + DESPLAZAMIENTO
+        columna = floor(longitud / self._tamano_celda).astype(int64) + DESPLAZAMIENTO
+        return fila, columna
+
+    def clave(self, latitud, longitud):
+        """Retorna la clave de la celda que corresponde a unas coordenadas
+
+        Args:
+            latitud (float | numpy.ndarray): Latitud
+            longitud (float | numpy.ndarray): Longitud
+
+        Returns:
+            int | numpy.ndarray: Clave de la celda, ordenada por fila y luego por columna
+        """
+        fila, columna = self.celda(latitud, longitud)
+        return fila * (2 * DESPLAZAMIENTO) + columna
+
+    def agregar(self, df_data, archivo=0):
+        """Agrega las publicaciones de un DataFrame (pandas.core.frame.DataFrame) al índice
+
+        Args:
+            df_data (pandas.core.frame.DataFrame): Publicaciones extraídas por el scraper
+            archivo (int, optional): Número del archivo del que provienen las publicaciones. Defaults to 0.
+
+        Returns:
+            int: Cantidad de publicaciones con coordenadas agregadas
+        """
+        latitud = to_numeric(df_data["latitud"], errors="coerce").to_numpy(float64)
+        longitud = to_numeric(df_data["longitud"], errors="coerce").to_numpy(float64)
+        precio = to_numeric(df_data["precio"], errors="coerce").to_numpy(float64)
+        moneda = (
+            df_data["tipo_moneda"]
+            .astype("string")
+            .fillna("")
+            .str.upper()
+            .to_numpy(MONEDA)
+        )
+        id_publicacion = ids_publicaciones(df_data["enlace"])
+        # Solo se indexan las publicaciones que tienen coordenadas
+        validas = isfinite(latitud) & isfinite(longitud)
+        cantidad = int(validas.sum())
+        self._latitud = concatenate([self._latitud, latitud[validas]])
+        self._longitud = concatenate([self._longitud, longitud[validas]])
+        self._precio = concatenate([self._precio, precio[validas]])
+        self._moneda = concatenate([self._moneda, moneda[validas]])
+        self._id_publicacion = concatenate(
+            [self._id_publicacion, id_publicacion[validas]]
+        )
+        self._archivo = concatenate([self._archivo, full(cantidad, archivo, int32)])
+        self._celdas = None
+        return cantidad
+
+    def eliminar_archivo(self, archivo):
+        """Elimina del índice las publicaciones de un archivo
+
+        Args:
+            archivo (int): Número del archivo
+        """
+        conservar = self._archivo != archivo
+        self._latitud = self._latitud[conservar]
+        self._longitud = self._longitud[conservar]
+        self._precio = self._precio[conservar]
+        self._moneda = self._moneda[conservar]
+        self._id_publicacion = self._id_publicacion[conservar]
+        self._archivo = self._archivo[conservar]
+        self._celdas = None
+
+    def actualizar(self, filenames, cache_folder=CACHE_FOLDER):
+        """Agrega al índice los archivos nuevos o modificados del scraper y elimina los que ya no existen
+
+        Args:
+            filenames (list): Lista de rutas de todos los archivos del scraper
+            cache_folder (str, optional): Carpeta de la caché de lectura. Defaults to CACHE_FOLDER.
+
+        Returns:
+            int: Cantidad de archivos agregados, modificados o eliminados
+        """
+        cantidad = 0
+        vigentes = set(filenames)
+        for filename in [nombre for nombre in self._archivos if nombre not in vigentes]:
+            # El demonio y el relleno reemplazan el archivo del día por uno con otro nombre
+            self.eliminar_archivo(self._archivos.pop(filename)[0])
+            cantidad += 1
+            log(INFO, f"Archivo {filename} eliminado del índice")
+        for filename in filenames:
+            mtime = path.getmtime(filename)
+            registro = self._archivos.get(filename)
+            if registro and registro[1] == mtime:
+                continue
+            if registro:
+                # El archivo cambió, se reemplazan sus publicaciones
+                self.eliminar_archivo(registro[0])
+                archivo = registro[0]
+            else:
+                archivo = max((num for num, _ in self._archivos.values()), default=-1)
+                archivo += 1
+            df_data = read_dataset(
+                filename, schema=SCHEMA_FACEBOOK, cache_folder=cache_folder
+            )
+            self.agregar(df_data, archivo)
+            self._archivos[filename] = [archivo, mtime]
+            cantidad += 1
+            log(INFO, f"Archivo {filename} indexado")
+        return cantidad
+
+    def ordenar(self):
+        """Ordena las publicaciones por celda si el índice cambió desde la última consulta"""
+        if self._celdas is None:
+            claves = self.clave(self._latitud, self._longitud)
+            self._orden = argsort(claves, kind="stable")
+            self._celdas = claves[self._orden]
+
+    def buscar_rectangulo(self, lat_min, lon_min, lat_max, lon_max):
+        """Busca las publicaciones dentro de un rectángulo de coordenadas
+
+        Args:
+            lat_min (float): Latitud mínima
+            lon_min (float): Longitud mínima
+            lat_max (float): Latitud máxima
+            lon_max (float): Longitud máxima
+
+        Returns:
+            numpy.ndarray: Posiciones de las publicaciones encontradas
+        """
+        self.ordenar()
+        fila_min, columna_min = self.celda(lat_min, lon_min)
+        fila_max, columna_max = self.celda(lat_max, lon_max)
+        # Cada fila de la grilla ocupa un tramo continuo de las claves ordenadas
+        filas = []
+        for fila in range(int(fila_min), int(fila_max) + 1):
+            base = fila * (2 * DESPLAZAMIENTO)
+            inicio = searchsorted(self._celdas, base + columna_min, "left")
+            fin = searchsorted(self._celdas, base + columna_max, "right")
+            filas.append(self._orden[inicio:fin])
+        filas = concatenate(filas) if filas else empty(0, int64)
+        # Descartar las publicaciones de las celdas del borde que quedan fuera del rectángulo
+        latitud = self._latitud[filas]
+        longitud = self._longitud[filas]
+        dentro = (
+            (latitud >= lat_min)
+            & (latitud <= lat_max)
+            & (longitud >= lon_min)
+            & (longitud <= lon_max)
+        )
+        return filas[dentro]
+
+    def buscar_radio(self, latitud, longitud, radio_km):
+        """Busca las publicaciones dentro de un radio alrededor de unas coordenadas
+
+        Args:
+            latitud (float): Latitud del centro
+            longitud (float): Longitud del centro
+            radio_km (float): Radio en kilómetros
+
+        Returns:
+            tuple: Posiciones de las publicaciones encontradas y su distancia al centro en kilómetros
+        """
+        # Rectángulo que contiene al círculo
+        delta_lat = degrees(radio_km / RADIO_TIERRA)
+        delta_lon = delta_lat / max(cos(radians(latitud)), 1e-6)
+        filas = self.buscar_rectangulo(
+            latitud - delta_lat,
+            longitud - delta_lon,
+            latitud + delta_lat,
+            longitud + delta_lon,
+        )
+        # Distancia de haversine al centro
+        lat_1, lon_1 = radians(latitud), radians(longitud)
+        lat_2, lon_2 = radians(self._latitud[filas]), radians(self._longitud[filas])
+        a = (
+            sin((lat_2 - lat_1) / 2) ** 2
+            + cos(lat_1) * cos(lat_2) * sin((lon_2 - lon_1) / 2) ** 2
+        )
+        distancias = 2 * RADIO_TIERRA * arcsin(sqrt(a))
+        dentro = distancias <= radio_km
+        return filas[dentro], distancias[dentro]
+
+    def publicaciones(self, filas, distancias=None):
+        """Retorna la información de las publicaciones encontradas en una consulta
+
+        Args:
+            filas (numpy.ndarray): Posiciones de las publicaciones
+            distancias (numpy.ndarray, optional): Distancia de cada publicación al centro. Defaults to None.
+
+        Returns:
+            pandas.core.frame.DataFrame
+        """
+        df_data = DataFrame(
+            {
+                "latitud": self._latitud[filas],
+                "longitud": self._longitud[filas],
+                "precio": self._precio[filas],
+                "tipo_moneda": self._moneda[filas],
+                "enlace": [
+                    (
+                        ENLACE_PUBLICACION.format(id_publicacion)
+                        if id_publicacion >= 0
+                        else None
+                    )
+                    for id_publicacion in self._id_publicacion[filas]
+                ],
+            }
+        )
+        if distancias is not None:
+            df_data["distancia_km"] = distancias
+        return df_data
+
+    def agregados_celdas(self, filas=None):
+        """Retorna la cantidad de publicaciones y los agregados del precio de cada celda y tipo de moneda
+
+        Args:
+            filas (numpy.ndarray, optional): Posiciones de las publicaciones a agregar. Si es None se usan todas. Defaults to None.
+
+        Returns:
+            pandas.core.frame.DataFrame
+        """
+        if filas is None:
+            self.ordenar()
+            claves, precio = self._celdas, self._precio[self._orden]
+            moneda = self._moneda[self._orden]
+        else:
+            claves = self.clave(self._latitud[filas], self._longitud[filas])
+            precio, moneda = self._precio[filas], self._moneda[filas]
+        # Los precios en distintas monedas no se pueden promediar juntos
+        agregados = (
+            DataFrame({"celda": claves, "tipo_moneda": moneda, "precio": precio})
+            .groupby(["celda", "tipo_moneda"], sort=False)["precio"]
+            .agg(["size", "count", "mean", "min", "max"])
+            .rename(
+                columns={
+                    "size": "cantidad",
+                    "count": "cantidad_con_precio",
+                    "mean": "precio_promedio",
+                    "min": "precio_min",
+                    "max": "precio_max",
+                }
+            )
+            .reset_index()
+        )
+        # Esquina suroeste de cada celda
+        celdas = agregados.pop("celda").to_numpy()
+        agregados.insert(
+            0,
+            "latitud",
+            (
+                (celdas // (2 * DESPLAZAMIENTO) - DESPLAZAMIENTO) * self._tamano_celda
+            ).round(6),
+        )
+        agregados.insert(
+            1,
+            "longitud",
+            (
+                (celdas % (2 * DESPLAZAMIENTO) - DESPLAZAMIENTO) * self._tamano_celda
+            ).round(6),
+        )
+        return agregados
+
+    def guardar(self, filename):
+        """Guarda el índice en un archivo npz con los arreglos y un archivo json con los archivos indexados
+
+        Args:
+            filename (str): Ruta del índice sin extensión
+        """
+        folder = path.dirname(filename)
+        if folder and not path.exists(folder):
+            makedirs(folder)
+        # Se escribe en archivos temporales para no dejar un índice a medias
+        with open(filename + ".npz.tmp", "wb") as file:
+            savez(
+                file,
+                latitud=self._latitud,
+                longitud=self._longitud,
+                precio=self._precio,
+                moneda=self._moneda,
+                id_publicacion=self._id_publicacion,
+                archivo=self._archivo,
+            )
+        with open(filename + ".json.tmp", "w", encoding="utf-8") as file:
+            dump({"tamano_celda": self._tamano_celda, "archivos": self._archivos}, file)
+        replace(filename + ".npz.tmp", filename + ".npz")
+        replace(filename + ".json.tmp", filename + ".json")
+        log(INFO, f"Índice espacial guardado con {len(self)} publicaciones")
+
+    def cargar(self, filename):
+        """Lee un índice guardado con el método guardar
+
+        Args:
+            filename (str): Ruta del índice sin extensión
+        """
+        with open(filename + ".json", encoding="utf-8") as file:
+            estado = load(file)
+        with load_arrays(filename + ".npz") as arreglos:
+            self._latitud = arreglos["latitud"]
+            self._longitud = arreglos["longitud"]
+            self._precio = arreglos["precio"]
+            # Los índices guardados antes de registrar la moneda no la tienen
+            self._moneda = (
+                arreglos["moneda"]
+                if "moneda" in arreglos
+                else full(len(self._precio), "", MONEDA)
+            )
+            self._id_publicacion = arreglos["id_publicacion"]
+            self._archivo = arreglos["archivo"]
+        self._tamano_celda = estado["tamano_celda"]
+        self._archivos = estado["archivos"]
+        self._celdas = None
+
+
+def cargar_indice(filename, tamano_celda=TAMANO_CELDA):
+    """Función que lee un índice espacial guardado. Si no existe retorna un índice vacío
+
+    Args:
+        filename (str): Ruta del índice sin extensión
+        tamano_celda (float, optional): Tamaño de las celdas de un índice nuevo. Defaults to TAMANO_CELDA.
+
+    Returns:
+        IndiceEspacial: Índice espacial
+    """
+    indice = IndiceEspacial(tamano_celda)
+    if path.isfile(filename + ".npz") and path.isfile(filename + ".json"):
+        indice.cargar(filename)
+    return indice
@@ -0,0 +1,92 @@
+from math import floor
+
+from numpy import sort
+from numpy.random import default_rng
+from pandas import DataFrame
+
+from fb_marketplace.aggregates import AgregadosMercado
+
+
+def listings(prices, seller="1", day="01/01/2023", currency="PEN"):
+    return DataFrame(
+        {
+            "Fecha Extraccion": day,
+            "precio": prices,
+            "tipo_moneda": currency,
+            "vendido": [index % 4 == 0 for index in range(len(prices))],
+            "disponible": True,
+            "id_vendedor": seller,
+            "locacion_id": "lima",
+        }
+    )
+
+
+def add_file(store, tmp_path, name, df_data):
+    filename = tmp_path / name
+    filename.touch()
+    return store.agregar_archivo(str(filename), df_data)
+
+
+def test_consultar_empty_store(tmp_path):
+    store = AgregadosMercado(str(tmp_path / "agregados"))
+
+    result = store.consultar()
+
+    assert len(result) == 0
+    assert {"cantidad", "precio_promedio", "precio_min", "p50", "p90"} <= set(
+        result.columns
+    )
+
+
+def test_percentile_relative_error(tmp_path):
+    prices = default_rng(0).lognormal(4, 1, 5000).round(2) + 1
+    store = AgregadosMercado(str(tmp_path / "agregados"), precision=0.01)
+    add_file(store, tmp_path, "a.xlsx", listings(prices[:2500]))
+    add_file(store, tmp_path, "b.xlsx", listings(prices[2500:]))
+
+    result = store.consultar().iloc[0]
+
+    ordered = sort(prices)
+    assert result["cantidad"] == 5000
+    for column, percentile in (("p25", 0.25), ("p50", 0.5), ("p90", 0.9)):
+        expected = ordered[floor(percentile * (len(ordered) - 1))]
+        assert abs(result[column] - expected) <= 0.01 * expected + 0.01
+    assert abs(result["precio_min"] - ordered[0]) <= 0.01 * ordered[0] + 0.01
+    assert abs(result["precio_max"] - ordered[-1]) <= 0.01 * ordered[-1] + 0.01
+
+
+def test_replace_and_remove_file(tmp_path):
+    store = AgregadosMercado(str(tmp_path / "agregados"))
+    add_file(store, tmp_path, "a.xlsx", listings([10.0, 20.0, 30.0]))
+    add_file(store, tmp_path, "b.xlsx", listings([40.0], seller="2"))
+    # El mismo archivo reescrito reemplaza sus conteos
+    add_file(store, tmp_path, "a.xlsx", listings([10.0, 20.0]))
+    store.guardar()
+
+    store = AgregadosMercado(str(tmp_path / "agregados"))
+    result = store.consultar().set_index("clave")
+
+    assert result.loc["1", "cantidad"] == 2
+    assert result.loc["1", "precio_promedio"] == 15.0
+    assert result.loc["2", "cantidad"] == 1
+
+    store.eliminar_archivo(str(tmp_path / "b.xlsx"))
+
+    assert store.consultar()["clave"].tolist() == ["1"]
+
+
+def test_separates_currencies_and_filters_days(tmp_path):
+    store = AgregadosMercado(str(tmp_path / "agregados"))
+    add_file(store, tmp_path, "a.xlsx", listings([10.0, 20.0], day="01/01/2023"))
+    add_file(
+        store,
+        tmp_path,
+        "b.xlsx",
+        listings([5.0], day="02/01/2023", currency="USD"),
+    )
+
+    result = store.consultar()
+    since = store.consultar(desde="02/01/2023")
+
+    assert sorted(result["tipo_moneda"]) == ["PEN", "USD"]
+    assert since["tipo_moneda"].tolist() == ["USD"]
@@ -0,0 +1,71 @@
+from random import Random
+
+from fb_marketplace.archive import AlmacenPayloads
+
+
+def payloads(cantidad, seed=0):
+    rng = Random(seed)
+    colores = ["azul", "negro", "rojo", "blanco", "verde", "gris"]
+    prendas = ["Polo", "Polera", "Camisa", "Casaca", "Pantalón", "Short"]
+    for numero in range(cantidad):
+        id_publicacion = str(10**15 + numero)
+        yield (
+            id_publicacion,
+            f"https://www.facebook.com/marketplace/item/{id_publicacion}/",
+            f"{1 + numero % 3:02d}/01/2023",
+            {
+                "marketplace_listing_title": f"{rng.choice(prendas)} {rng.choice(colores)} talla {rng.choice('SML')}",
+                "redacted_description": {
+                    "text": f"Prenda en buen estado {rng.random()}"
+                },
+                "formatted_price": {"text": f"S/. {rng.randint(10, 300)}"},
+                "location_text": {"text": rng.choice(["Lima", "Callao", "Arequipa"])},
+                "marketplace_listing_seller": {"id": str(rng.randint(1, 10**9))},
+            },
+        )
+
+
+def test_round_trip_without_dictionary(tmp_path):
+    almacen = AlmacenPayloads(str(tmp_path), muestras=1000)
+    datos = list(payloads(30))
+    for dato in datos:
+        almacen.agregar(*dato)
+
+    leidos = list(almacen.leer())
+
+    assert almacen.dias() == ["01-01-2023", "02-01-2023", "03-01-2023"]
+    assert sorted(payload["enlace"] for payload in leidos) == sorted(
+        dato[1] for dato in datos
+    )
+    assert almacen.obtener(datos[4][0])["dato"] == datos[4][3]
+
+
+def test_round_trip_after_training(tmp_path):
+    almacen = AlmacenPayloads(str(tmp_path), muestras=100)
+    datos = list(payloads(300))
+    for dato in datos:
+        almacen.agregar(*dato)
+    assert (tmp_path / "manifiesto.json").is_file()
+
+    # Otra instancia lee los frames comprimidos antes y después del diccionario
+    almacen = AlmacenPayloads(str(tmp_path))
+    leidos = {payload["enlace"]: payload for payload in almacen.leer()}
+
+    assert len(leidos) == len(datos)
+    for id_publicacion, enlace, fecha_extraccion, dato in datos:
+        assert leidos[enlace]["fecha_extraccion"] == fecha_extraccion
+        assert leidos[enlace]["dato"] == dato
+    assert almacen.obtener(datos[0][0])["dato"] == datos[0][3]
+    assert almacen.obtener(datos[-1][0])["dato"] == datos[-1][3]
+
+
+def test_leer_filters_days(tmp_path):
+    almacen = AlmacenPayloads(str(tmp_path), muestras=1000)
+    for dato in payloads(30):
+        almacen.agregar(*dato)
+
+    leidos = list(almacen.leer("02/01/2023", "02/01/2023"))
+
+    assert len(leidos) == 10
+    assert {payload["fecha_extraccion"] for payload in leidos} == {"02/01/2023"}
+    assert almacen.obtener(str(10**15), dia="02/01/2023") is None
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from fb_marketplace.backfill import dividir_ventanas, Relleno, url_ventana
+
+URL = "https://www.facebook.com/marketplace/lima/ropa/?minPrice=10"
+CATEGORIAS = [
+    {"nombre": "Ropa", "url": URL},
+    {"nombre": "Zapatos", "url": "https://www.facebook.com/marketplace/lima/zapatos/"},
+]
+
+
+def fechas(ventanas):
+    return [
+        (datetime.fromtimestamp(inicio), datetime.fromtimestamp(fin))
+        for inicio, fin in ventanas
+    ]
+
+
+def ventana_terminada(parametros, terminada=True, fin_feed=True):
+    return SimpleNamespace(
+        nombre=parametros["nombre"],
+        inicio=parametros["inicio"],
+        fin=parametros["fin"],
+        terminada=terminada,
+        fin_feed=fin_feed,
+        num_error=0,
+        tiempo=SimpleNamespace(cantidad=10, fecha="01/01/2023"),
+    )
+
+
+def test_windows_split_at_midnight():
+    ventanas = fechas(dividir_ventanas("01/01/2023", "03/01/2023"))
+
+    assert ventanas == [
+        (datetime(2023, 1, dia), datetime(2023, 1, dia) + timedelta(days=1))
+        for dia in (1, 2, 3)
+    ]
+
+
+def test_windows_of_some_hours():
+    ventanas = fechas(dividir_ventanas("01/01/2023", "02/01/2023", horas=6))
+
+    assert len(ventanas) == 8
+    assert all(fin - inicio == timedelta(hours=6) for inicio, fin in ventanas)
+    assert ventanas[3][1] == ventanas[4][0] == datetime(2023, 1, 2)
+    # Las ventanas que no dividen el día en partes iguales se cortan a la medianoche
+    ventanas = fechas(dividir_ventanas("01/01/2023", "01/01/2023", horas=7))
+    assert [fin.hour for _, fin in ventanas] == [7, 14, 21, 0]
+    assert ventanas[-1][1] == datetime(2023, 1, 2)
+
+
+def test_hours_are_clamped():
+    assert len(dividir_ventanas("01/01/2023", "01/01/2023", horas=0)) == 24
+    assert len(dividir_ventanas("01/01/2023", "01/01/2023", horas=48)) == 1
+
+
+def test_windows_stop_at_now():
+    hoy = datetime.now().strftime("%d/%m/%Y")
+    manana = (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
+
+    ventanas = dividir_ventanas(hoy, manana)
+
+    assert len(ventanas) == 1
+    assert ventanas[0][0] <= datetime.now().timestamp()
+
+
+def test_url_ventana():
+    reciente = datetime.now() - timedelta(days=3)
+    parametros = parse_qs(urlparse(url_ventana(URL, reciente.timestamp())).query)
+
+    assert parametros == {
+        "minPrice": ["10"],
+        "sortBy": ["creation_time_descend"],
+        "daysSinceListed": ["7"],
+    }
+
+    antigua = datetime.now() - timedelta(days=60)
+    url = url_ventana(URL + "&daysSinceListed=1", antigua.timestamp())
+    assert "daysSinceListed" not in parse_qs(urlparse(url).query)
+
+
+def test_relleno_resumes_pending_windows(tmp_path):
+    filename = str(tmp_path / "relleno" / "avance.json")
+    relleno = Relleno(filename, "01/01/2023", "02/01/2023", horas=12)
+    ventanas = relleno.ventanas(CATEGORIAS)
+    assert len(ventanas) == 8
+    assert ventanas[1]["nombre"] == "Zapatos_0000"
+    assert ventanas[2]["nombre"] == "Ropa_1200"
+
+    archivo = tmp_path / "parcial.xlsx"
+    archivo.touch()
+    relleno.registrar(ventana_terminada(ventanas[0]), [str(archivo)])
+    relleno.registrar(ventana_terminada(ventanas[1], fin_feed=False), [str(archivo)])
+    # La ventana parcial se vuelve a extraer y su archivo anterior se reemplaza
+    relleno = Relleno(filename, "01/01/2023", "02/01/2023", horas=12)
+    pendientes = relleno.ventanas(CATEGORIAS)
+
+    assert [ventana["inicio"] for ventana in pendientes] == [
+        ventana["inicio"] for ventana in ventanas[1:]
+    ]
+    assert [ventana["nombre"] for ventana in pendientes] == [
+        ventana["nombre"] for ventana in ventanas[1:]
+    ]
+    assert relleno.archivos(ventana_terminada(ventanas[1])) == [str(archivo)]
+    relleno.registrar(ventana_terminada(ventanas[1]), [])
+    assert not archivo.exists()
+    assert (
+        len(Relleno(filename, "01/01/2023", "02/01/2023", 12).ventanas(CATEGORIAS)) == 6
+    )
@@ -0,0 +1,62 @@
+from pathlib import Path
+from subprocess import run
+from sys import executable
+
+# Dependencias que solo deben cargar los subcomandos que las usan
+HEAVY_MODULES = [
+    "numpy",
+    "openpyxl",
+    "pandas",
+    "pyarrow",
+    "selenium",
+    "seleniumwire",
+    "webdriver_manager",
+]
+
+
+def python(*args):
+    return run(
+        [executable, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[1],
+    )
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    result = python(
+        "-c",
+        "import sys, fb_marketplace.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_cli_import_time():
+    # -X importtime escribe en stderr el tiempo acumulado de cada import en microsegundos
+    result = python("-X", "importtime", "-c", "import fb_marketplace.cli")
+    line = next(
+        line
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| fb_marketplace.cli")
+    )
+    cumulative = int(line.split("|")[1])
+
+    assert cumulative < 200_000
+
+
+def test_help_does_not_load_heavy_modules():
+    result = python(
+        "-c",
+        "import sys\n"
+        "from fb_marketplace.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print('cargados:', *(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+    )
+
+    assert result.stdout.splitlines()[-1] == "cargados:"
@@ -0,0 +1,117 @@
+from pandas import DataFrame, to_datetime
+
+from fb_marketplace.duplicates import DetectorDuplicados
+
+ENLACE = "https://www.facebook.com/marketplace/item/{}/"
+
+
+def listings(rows):
+    return DataFrame(
+        [
+            {
+                "enlace": ENLACE.format(id_publicacion),
+                "id_vendedor": vendedor,
+                "precio": precio,
+                "tiempo_creacion": creacion,
+                "titulo_marketplace": titulo,
+                "descripcion": descripcion,
+            }
+            for id_publicacion, vendedor, precio, creacion, titulo, descripcion in rows
+        ]
+    )
+
+
+DESCRIPCION = "polo de algodon nuevo sin uso envio gratis a todo lima"
+
+
+def test_near_duplicate_titles_form_a_cluster(tmp_path):
+    detector = DetectorDuplicados(str(tmp_path))
+    ids = detector.agregar(
+        listings(
+            [
+                (3, "7", 50, 300, "Polo algodón azul talla M", DESCRIPCION),
+                (2, "7", 48, 200, "polo algodon azul talla m", DESCRIPCION + " ya"),
+                (1, "8", 50, 100, "Polo algodón azul talla M", DESCRIPCION),
+                (4, "7", 50, 400, "Zapatillas running negras", "talla 42 nuevas"),
+            ]
+        )
+    )
+
+    assert ids[0] == ids[1]
+    # Otro vendedor o un texto distinto no son repetidas
+    assert ids[2] != ids[0]
+    assert ids[3] != ids[0]
+
+
+def test_cluster_id_is_the_listing_created_first(tmp_path):
+    detector = DetectorDuplicados(str(tmp_path))
+    # El feed muestra primero las publicaciones más nuevas
+    rows = [
+        (id_publicacion, "7", 50, creacion, "Polo algodón azul talla M", DESCRIPCION)
+        for id_publicacion, creacion in ((30, 300), (20, 200), (10, 100))
+    ]
+
+    assert detector.agregar(listings(rows)) == [10, 10, 10]
+
+
+def test_clusters_survive_save_and_load(tmp_path):
+    detector = DetectorDuplicados(str(tmp_path))
+    detector.agregar(
+        listings([(5, "7", 50, 200, "Polo algodón azul talla M", DESCRIPCION)])
+    )
+    detector.guardar()
+
+    detector = DetectorDuplicados(str(tmp_path))
+    ids = detector.agregar(
+        listings(
+            [
+                (5, "7", 50, 200, "Polo algodón azul talla M", DESCRIPCION),
+                (6, "7", 50, 300, "Polo algodon azul talla M", DESCRIPCION),
+            ]
+        )
+    )
+
+    assert ids == [5, 5]
+    assert detector.clusters()["id_publicacion"].tolist() == [5, 6]
+    assert detector.es_repost("5", "")
+    assert detector.es_repost("99", "S/. 50\nPolo azul algodón talla M")
+    assert not detector.es_repost("99", "S/. 90\nPolo azul algodón talla M")
+
+
+def test_creation_time_read_as_dates(tmp_path):
+    detector = DetectorDuplicados(str(tmp_path))
+    data = listings(
+        [
+            (
+                id_publicacion,
+                "7",
+                50,
+                creacion,
+                "Polo algodón azul talla M",
+                DESCRIPCION,
+            )
+            for id_publicacion, creacion in ((30, 300), (10, 100))
+        ]
+    )
+    # read_dataset convierte tiempo_creacion a fecha con el esquema de facebook
+    data["tiempo_creacion"] = to_datetime(data["tiempo_creacion"], unit="s")
+
+    assert detector.agregar(data) == [10, 10]
+
+
+def test_large_ids_keep_every_digit(tmp_path):
+    detector = DetectorDuplicados(str(tmp_path))
+    data = listings(
+        [
+            (2**53 + 1, str(2**53 + 3), 50, 100, "Polo algodón azul", DESCRIPCION),
+            (2**53 + 2, str(2**53 + 3), 50, 200, "Polo algodon azul", DESCRIPCION),
+        ]
+    )
+    # Una publicación sin enlace no convierte los demás ids a float
+    data.loc[2] = data.loc[0].to_dict() | {"enlace": None, "id_vendedor": None}
+
+    ids = detector.agregar(data)
+
+    assert ids[:2] == [2**53 + 1, 2**53 + 1]
+    assert detector.es_repost(str(2**53 + 2), "")
+    assert not detector.es_repost(str(2**53), "")
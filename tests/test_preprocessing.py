@@ -0,0 +1,212 @@
+from openpyxl import Workbook
+from pandas import DataFrame, read_csv
+
+from fb_marketplace.preprocessing import (
+    Pipeline,
+    process_incremental,
+    read_timing_history,
+    report_runs,
+    to_numeric_columns,
+)
+
+# Encabezado del archivo de tiempos antes de agregar los reintentos
+LEGACY_HEADER = [
+    "Fecha",
+    "Hora Inicio",
+    "Hora Fin",
+    "Cantidad",
+    "Cantidad Real",
+    "Tiempo Ejecucion (min)",
+    "Categorias / Minuto",
+    "Categorias / Minuto real",
+    "Errores",
+]
+
+
+def write_legacy_timings(filename, extra_values=False):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Ropa"
+    worksheet.append(LEGACY_HEADER)
+    for day in range(1, 11):
+        row = [
+            f"{day:02d}/01/2023",
+            "10:00:00",
+            "10:30:00",
+            100,
+            90 + day,
+            "0:30:00",
+            3.33,
+            3.0 + day / 10,
+            day % 3,
+        ]
+        if extra_values:
+            # Filas guardadas con el formato actual debajo del encabezado antiguo
+            row += [12.5, 2, 1]
+        worksheet.append(row)
+    workbook.save(filename)
+
+
+def test_read_timing_history_legacy_header(tmp_path):
+    filename = tmp_path / "Tiempos.xlsx"
+    write_legacy_timings(filename)
+
+    timings = read_timing_history(str(filename))
+
+    assert len(timings) == 10
+    assert timings["Reintentos"].isna().all()
+    assert timings["Recuperados"].isna().all()
+    assert timings["Tiempo Inicio (seg)"].isna().all()
+    assert timings["Duracion (min)"].eq(30).all()
+    assert not any(str(column).startswith("Unnamed") for column in timings)
+
+
+def test_read_timing_history_values_under_legacy_header(tmp_path):
+    filename = tmp_path / "Tiempos.xlsx"
+    write_legacy_timings(filename, extra_values=True)
+
+    timings = read_timing_history(str(filename))
+
+    assert timings["Tiempo Inicio (seg)"].eq(12.5).all()
+    assert timings["Reintentos"].eq(2).all()
+    assert timings["Recuperados"].eq(1).all()
+
+
+def test_report_runs_legacy_header(tmp_path):
+    filename = tmp_path / "Tiempos.xlsx"
+    write_legacy_timings(filename)
+    (tmp_path / "Error").mkdir()
+
+    report = report_runs(
+        str(tmp_path / "Error"),
+        "fb_error",
+        str(filename),
+        str(tmp_path / "Reporte.xlsx"),
+        cache_folder=None,
+    )
+
+    summary = report["Resumen"]
+    assert summary.loc[0, "Hoja"] == "Ropa"
+    assert summary.loc[0, "Ejecuciones"] == 10
+    assert report["Errores"].empty
+    assert (tmp_path / "Reporte.xlsx").is_file()
+
+
+def count_rows(filename):
+    return len(read_csv(filename, sep=";"))
+
+
+def test_process_incremental_last_row_without_newline(tmp_path):
+    source = tmp_path / "despegar.csv"
+    output = str(tmp_path / "limpio.csv")
+    source.write_text("x;y\n1;2\n3;4")
+    assert process_incremental([str(source)], output, []) == 2
+
+    with open(source, "a") as file:
+        file.write("\n5;6\n")
+
+    assert process_incremental([str(source)], output, []) == 1
+    assert count_rows(output) == 3
+
+
+def test_process_incremental_rewritten_without_key(tmp_path):
+    source = tmp_path / "despegar.csv"
+    output = str(tmp_path / "limpio.csv")
+    source.write_text("x;y\n1;2\n3;4\n")
+    process_incremental([str(source)], output, [])
+
+    source.write_text("x;y\n0;0\n1;2\n3;4\n")
+
+    assert process_incremental([str(source)], output, []) == 3
+    assert count_rows(output) == 3
+
+
+def test_to_numeric_columns_currency_prefix():
+    prices = DataFrame(
+        {"precio": ["S/. 35", "S/.35", "US$ 1,250.50", "35 soles", ".5"]}
+    )
+
+    result = to_numeric_columns(prices, ["precio"])["precio"]
+
+    assert result.tolist() == [35.0, 35.0, 1250.5, 35.0, 0.5]
+
+
+def pipeline_listings():
+    return DataFrame(
+        {
+            "titulo": ["Polo", "Camisa", None, "Short", "Polera"],
+            "precio": ["1.200", "35", "40", "sin precio", "2.500"],
+            "impuesto": ["0", "0", "0", "0", "0"],
+            "estado": ["nuevo", "usado", "nuevo", "usado", "como nuevo"],
+        }
+    )
+
+
+def pipeline():
+    return (
+        Pipeline()
+        .replace_values(["estado"], "como nuevo", "usado")
+        .drop_rows(["titulo"], lambda df: df["titulo"].isna())
+        .replace_values(["estado"], "usado", "segunda")
+        .remove_punctuation(["precio"])
+        .drop_rows(["precio"], lambda df: df["precio"].eq("sin precio"))
+        .change_datatype(["precio"])
+        .change_datatype(["impuesto"])
+    )
+
+
+def test_pipeline_optimize_hoists_and_merges_steps():
+    plan = pipeline().optimize()
+
+    assert [step["operation"] for step in plan] == [
+        "drop_rows",
+        "replace_values",
+        "remove_punctuation",
+        "drop_rows",
+        "change_datatype",
+    ]
+    # La eliminación por titulo se adelanta y la de precio se detiene en remove_punctuation
+    assert plan[0]["reads"] == ["titulo"]
+    assert plan[3]["reads"] == ["precio"]
+    assert plan[1]["args"]["mapping"] == {
+        "estado": {"como nuevo": "segunda", "usado": "segunda"}
+    }
+    assert plan[4]["args"]["datatypes"] == {"precio": "int64", "impuesto": "int64"}
+
+
+def test_pipeline_optimize_keeps_registered_steps():
+    steps = pipeline()
+
+    steps.optimize()
+
+    assert len(steps.steps) == 7
+    assert steps.steps[1]["operation"] == "drop_rows"
+    assert len(steps.steps[1]["args"]["conditions"]) == 1
+
+
+def test_pipeline_explain():
+    lines = pipeline().explain().splitlines()
+
+    assert lines[0] == "Plan optimizado:"
+    assert len(lines) == 6
+    assert lines[1] == "1. drop_rows columnas=['titulo'] {'conditions': 1}"
+    assert lines[5].startswith("5. change_datatype columnas=['precio', 'impuesto']")
+
+
+def test_pipeline_run_matches_steps_in_order():
+    df_data = pipeline_listings()
+    original = df_data.copy()
+
+    # Mismo resultado que aplicar cada paso en el orden en que fue registrado
+    expected = df_data.copy()
+    expected["estado"] = expected["estado"].replace("como nuevo", "usado")
+    expected = expected[expected["titulo"].notna()]
+    expected["estado"] = expected["estado"].replace("usado", "segunda")
+    expected["precio"] = expected["precio"].str.replace(".", "", regex=False)
+    expected = expected[expected["precio"].ne("sin precio")].reset_index(drop=True)
+    expected[["precio", "impuesto"]] = expected[["precio", "impuesto"]].astype("int64")
+
+    result = pipeline().run(df_data)
+
+    assert result.equals(expected)
+    assert df_data.equals(original)
@@ -0,0 +1,143 @@
+from pytest import approx, importorskip
+
+# El scraper necesita selenium-wire para importarse
+importorskip("seleniumwire")
+
+from fb_marketplace.scraper import (  # noqa: E402
+    Categoria,
+    ControladorRitmo,
+    Planificador,
+)
+
+
+class ScraperFalso:
+    """Simula un navegador en el que cada turno ocupa un segundo por publicación"""
+
+    def __init__(self, turnos):
+        self.turnos = turnos
+        self.abiertas = []
+        self.avances = []
+        self.cerrado = False
+
+    def abrir_categoria(self, categoria):
+        self.abiertas.append(categoria.nombre)
+
+    def avanzar_categoria(self, categoria, quantum):
+        self.avances.append(categoria.nombre)
+        categoria.servicio += quantum
+        categoria.indice += 1
+        categoria.terminada = categoria.indice >= self.turnos[categoria.nombre]
+
+    def cerrar_categoria(self, categoria):
+        pass
+
+    def cerrar(self):
+        self.cerrado = True
+
+
+def run(categorias, turnos, max_pestanas=2):
+    scraper = ScraperFalso(turnos)
+    guardadas = []
+    Planificador(categorias, max_pestanas=max_pestanas).trabajar(
+        lambda: scraper, lambda _, categoria: guardadas.append(categoria.nombre)
+    )
+    return scraper, guardadas
+
+
+def test_planificador_opens_by_priority():
+    categorias = [
+        {"nombre": "Ropa", "url": "ropa"},
+        {"nombre": "Zapatos", "url": "zapatos", "prioridad": 3},
+        {"nombre": "Bolsos", "url": "bolsos"},
+    ]
+
+    scraper, guardadas = run(
+        categorias, dict.fromkeys(["Ropa", "Zapatos", "Bolsos"], 2)
+    )
+
+    assert scraper.abiertas == ["Zapatos", "Ropa", "Bolsos"]
+    assert sorted(guardadas) == ["Bolsos", "Ropa", "Zapatos"]
+    assert scraper.cerrado
+
+
+def test_planificador_shares_turns_by_priority():
+    categorias = [
+        {"nombre": "Ropa", "url": "ropa", "prioridad": 2},
+        {"nombre": "Zapatos", "url": "zapatos"},
+    ]
+
+    scraper, _ = run(categorias, {"Ropa": 20, "Zapatos": 20})
+
+    # Mientras ambas están abiertas, Ropa recibe dos turnos por cada turno de Zapatos
+    primeros = scraper.avances[:30]
+    assert primeros.count("Ropa") == 20
+    assert primeros.count("Zapatos") == 10
+    # La categoría de menor prioridad no espera a que termine la otra
+    assert "Zapatos" in scraper.avances[:2]
+
+
+def test_ritmo_decreases_additively():
+    ritmo = ControladorRitmo(pausa=2, pausa_min=1, paso=0.25)
+
+    for _ in range(3):
+        ritmo.registrar(0.5)
+    assert ritmo.pausa == 1.25
+    for _ in range(3):
+        ritmo.registrar(0.5)
+    assert ritmo.pausa == 1
+
+
+def test_ritmo_increases_multiplicatively_when_saturated():
+    ritmo = ControladorRitmo(pausa=2, pausa_max=10, factor=2)
+
+    ritmo.registrar(0.5, error=True, saturado=True)
+    assert ritmo.pausa == 4
+    ritmo.registrar(0.5, error=True, saturado=True)
+    ritmo.registrar(0.5, error=True, saturado=True)
+    assert ritmo.pausa == 10
+
+
+def test_ritmo_error_rate():
+    ritmo = ControladorRitmo(pausa=4, paso=1, tasa_error_max=0.2, ventana=10)
+    for _ in range(9):
+        ritmo.registrar(0.5)
+    assert ritmo.pausa == 1
+
+    # Un error aislado mantiene la pausa y errores frecuentes la duplican
+    ritmo.registrar(0.5, error=True)
+    assert ritmo.pausa == 1
+    ritmo.registrar(0.5, error=True)
+    assert ritmo.pausa == 1
+    ritmo.registrar(0.5, error=True)
+    assert ritmo.tasa_error() == approx(0.3)
+    assert ritmo.pausa == 2
+
+
+def test_ritmo_latency():
+    ritmo = ControladorRitmo(pausa=2, latencia_max=5)
+
+    ritmo.registrar(4)
+    assert ritmo.pausa == approx(1.9)
+    # El promedio móvil sube a 4 * 0.8 + 10 * 0.2 = 5.2 segundos
+    ritmo.registrar(10)
+    assert ritmo.latencia == approx(5.2)
+    assert ritmo.pausa == approx(3.8)
+
+
+def test_categoria_queues_new_feed_listings_once():
+    categoria = Categoria("Ropa", "ropa")
+    enlace = "https://www.facebook.com/marketplace/item/{}/"
+
+    categoria.agregar_publicaciones(
+        [("1", enlace.format(1), "Polo"), ("2", enlace.format(2))]
+    )
+    # El observador del feed puede volver a reportar publicaciones ya vistas
+    categoria.agregar_publicaciones([("2", enlace.format(2)), ("3", enlace.format(3))])
+    categoria.publicaciones.popleft()
+    categoria.agregar_publicaciones([("1", enlace.format(1))])
+
+    assert list(categoria.publicaciones) == [
+        ("2", enlace.format(2)),
+        ("3", enlace.format(3)),
+    ]
+    assert categoria.vistos == {"1", "2", "3"}
@@ -0,0 +1,109 @@
+from pandas import DataFrame, to_datetime
+
+from fb_marketplace.search import (
+    comprimir_postings,
+    descomprimir_postings,
+    IndiceTexto,
+    interpretar_consulta,
+    tokenizar,
+)
+
+ENLACE = "https://www.facebook.com/marketplace/item/{}/"
+
+TITULOS = [
+    ("Polo de algodón azul", "talla M para niño", 20, "PEN", "01/01/2023"),
+    ("Polera algodón negra", "talla L", 45, "PEN", "02/01/2023"),
+    ("Camisa de vestir", "algodón, manga larga", 60, "PEN", "03/01/2023"),
+    ("Polo deportivo", "dry fit para niño", 25, "USD", "04/01/2023"),
+    ("Zapatillas running", "nuevas", 150, "PEN", "05/01/2023"),
+]
+
+
+def listings(rows, start=0):
+    return DataFrame(
+        {
+            "titulo_marketplace": [row[0] for row in rows],
+            "descripcion": [row[1] for row in rows],
+            "precio": [row[2] for row in rows],
+            "tipo_moneda": [row[3] for row in rows],
+            "tiempo_creacion": to_datetime([row[4] for row in rows], format="%d/%m/%Y"),
+            "enlace": [ENLACE.format(start + numero) for numero in range(len(rows))],
+        }
+    )
+
+
+def build_index(tmp_path):
+    indice = IndiceTexto(str(tmp_path / "texto"))
+    for numero, rows in enumerate((TITULOS[:3], TITULOS[3:])):
+        filename = tmp_path / f"fb_ropa_{numero}.xlsx"
+        filename.touch()
+        indice.indexar_archivo(str(filename), listings(rows, start=numero * 3))
+    return indice
+
+
+def titles(resultado):
+    return sorted(resultado["titulo_marketplace"])
+
+
+def test_tokenizar_ignores_accents_case_and_stopwords():
+    assert tokenizar("Polo de ALGODÓN para Niño") == ["polo", "algodon", "nino"]
+
+
+def test_interpretar_consulta():
+    assert interpretar_consulta("Polo* algodón -niño OR camisa") == [
+        [("polo", True, False), ("algodon", False, False), ("nino", False, True)],
+        [("camisa", False, False)],
+    ]
+
+
+def test_postings_round_trip():
+    documentos = [0, 3, 4, 1000, 70000]
+
+    assert descomprimir_postings(comprimir_postings(documentos)).tolist() == documentos
+
+
+def test_and_or_exclusion_and_prefix(tmp_path):
+    indice = build_index(tmp_path)
+
+    assert titles(indice.buscar("polo algodon")) == ["Polo de algodón azul"]
+    assert titles(indice.buscar("pol* algodon")) == [
+        "Polera algodón negra",
+        "Polo de algodón azul",
+    ]
+    assert titles(indice.buscar("polo -nino")) == []
+    assert titles(indice.buscar("polo OR zapatillas")) == [
+        "Polo de algodón azul",
+        "Polo deportivo",
+        "Zapatillas running",
+    ]
+    assert titles(indice.buscar("-algodon")) == [
+        "Polo deportivo",
+        "Zapatillas running",
+    ]
+
+
+def test_filters_and_reload(tmp_path):
+    build_index(tmp_path)
+    indice = IndiceTexto(str(tmp_path / "texto"))
+
+    assert titles(indice.buscar("pol*", moneda="pen")) == [
+        "Polera algodón negra",
+        "Polo de algodón azul",
+    ]
+    assert titles(indice.buscar("pol*", precio_min=22, precio_max=50)) == [
+        "Polera algodón negra",
+        "Polo deportivo",
+    ]
+    assert titles(indice.buscar("algodon", desde="02/01/2023", hasta="02/01/2023")) == [
+        "Polera algodón negra"
+    ]
+
+
+def test_actualizar_drops_deleted_files(tmp_path):
+    indice = build_index(tmp_path)
+    (tmp_path / "fb_ropa_1.xlsx").unlink()
+
+    indice.actualizar([str(tmp_path / "fb_ropa_0.xlsx")])
+
+    assert titles(indice.buscar("zapatillas OR deportivo")) == []
+    assert len(indice.archivos) == 1
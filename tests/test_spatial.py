@@ -0,0 +1,141 @@
+from numpy import arange, arcsin, cos, radians, sin, sqrt
+from numpy.random import default_rng
+from pandas import DataFrame, Series
+
+from fb_marketplace.spatial import ids_publicaciones, IndiceEspacial, RADIO_TIERRA
+
+ENLACE = "https://www.facebook.com/marketplace/item/{}/"
+
+
+def random_index(cantidad=3000, archivos=3):
+    generador = default_rng(7)
+    latitud = generador.uniform(-12.3, -11.8, cantidad)
+    longitud = generador.uniform(-77.2, -76.8, cantidad)
+    indice = IndiceEspacial()
+    for archivo in range(archivos):
+        parte = slice(archivo, None, archivos)
+        indice.agregar(
+            DataFrame(
+                {
+                    "latitud": latitud[parte],
+                    "longitud": longitud[parte],
+                    "precio": generador.uniform(1, 100, len(latitud[parte])),
+                    "tipo_moneda": "PEN",
+                    "enlace": [ENLACE.format(numero) for numero in range(cantidad)][
+                        parte
+                    ],
+                }
+            ),
+            archivo,
+        )
+    return indice
+
+
+def positions(indice, filas):
+    # Las posiciones de un índice se comparan por sus enlaces
+    return sorted(indice.publicaciones(filas)["enlace"])
+
+
+def coordinates(indice):
+    todas = indice.publicaciones(arange(len(indice)))
+    return todas["latitud"].to_numpy(), todas["longitud"].to_numpy()
+
+
+def test_buscar_rectangulo_matches_brute_force():
+    indice = random_index()
+    lat_min, lon_min, lat_max, lon_max = -12.1, -77.05, -11.95, -76.9
+
+    filas = indice.buscar_rectangulo(lat_min, lon_min, lat_max, lon_max)
+
+    latitud, longitud = coordinates(indice)
+    esperadas = (
+        (latitud >= lat_min)
+        & (latitud <= lat_max)
+        & (longitud >= lon_min)
+        & (longitud <= lon_max)
+    ).nonzero()[0]
+    assert len(filas) > 0
+    assert positions(indice, filas) == positions(indice, esperadas)
+
+
+def test_buscar_radio_matches_brute_force():
+    indice = random_index()
+    centro_lat, centro_lon, radio = -12.05, -77.0, 4.5
+
+    filas, distancias = indice.buscar_radio(centro_lat, centro_lon, radio)
+
+    lat_1, lon_1 = radians(centro_lat), radians(centro_lon)
+    latitud, longitud = coordinates(indice)
+    lat_2, lon_2 = radians(latitud), radians(longitud)
+    a = (
+        sin((lat_2 - lat_1) / 2) ** 2
+        + cos(lat_1) * cos(lat_2) * sin((lon_2 - lon_1) / 2) ** 2
+    )
+    esperadas = (2 * RADIO_TIERRA * arcsin(sqrt(a)) <= radio).nonzero()[0]
+    assert len(filas) > 0
+    assert positions(indice, filas) == positions(indice, esperadas)
+    assert (distancias <= radio).all()
+
+
+def test_eliminar_archivo_and_cells_count():
+    indice = random_index(cantidad=300, archivos=3)
+
+    indice.eliminar_archivo(1)
+
+    assert len(indice) == 200
+    assert indice.agregados_celdas()["cantidad"].sum() == 200
+    filas = indice.buscar_rectangulo(-90, -180, 90, 180)
+    assert len(filas) == 200
+
+
+def test_ids_publicaciones_keep_every_digit():
+    enlaces = Series([ENLACE.format(2**53 + 1), None, "sin id"])
+
+    assert ids_publicaciones(enlaces).tolist() == [2**53 + 1, -1, -1]
+
+
+def test_agregar_keeps_large_ids():
+    indice = IndiceEspacial()
+    indice.agregar(
+        DataFrame(
+            {
+                "latitud": [-12.05, -12.06],
+                "longitud": [-77.04, -77.05],
+                "precio": [10.0, 20.0],
+                "tipo_moneda": ["PEN", None],
+                "enlace": [ENLACE.format(9007199254740993), None],
+            }
+        )
+    )
+
+    filas = indice.buscar_rectangulo(-13, -78, -11, -76)
+
+    assert set(indice.publicaciones(filas)["enlace"]) == {
+        None,
+        ENLACE.format(9007199254740993),
+    }
+
+
+def test_cells_group_prices_by_currency(tmp_path):
+    indice = IndiceEspacial()
+    indice.agregar(
+        DataFrame(
+            {
+                "latitud": [-12.051, -12.052, -12.053],
+                "longitud": [-77.041, -77.042, -77.043],
+                "precio": [10.0, 30.0, 1000.0],
+                "tipo_moneda": ["PEN", "PEN", "USD"],
+                "enlace": [ENLACE.format(numero) for numero in (1, 2, 3)],
+            }
+        )
+    )
+    indice.guardar(str(tmp_path / "espacial"))
+    indice = IndiceEspacial()
+    indice.cargar(str(tmp_path / "espacial"))
+
+    celdas = indice.agregados_celdas().set_index("tipo_moneda")
+
+    assert len(celdas) == 2
+    assert celdas.loc["PEN", "cantidad"] == 2
+    assert celdas.loc["PEN", "precio_promedio"] == 20.0
+    assert celdas.loc["USD", "precio_max"] == 1000.0